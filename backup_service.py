@@ -28,10 +28,11 @@ from datetime import datetime, timezone
 from auth import get_current_user
 from storage import (
     atomic_write,
-    load_decks,
-    load_cards,
-    load_srs_states,
-    load_reviews,
+    read_lock,
+    iter_decks,
+    iter_cards,
+    iter_srs_states,
+    iter_reviews,
 )
 
 # =====================================================
@@ -66,14 +67,17 @@ def export_backup_for_current_user() -> Path:
     # USER'A AİT VERİLERİ TOPLA
     # ---------------------------------------------
 
-    user_decks = [d for d in load_decks() if d["user_id"] == user["id"]]
-    deck_ids = {d["id"] for d in user_decks}
+    # Tablolar stream edilir; sadece kullanıcının kayıtları memory'ye alınır.
+    # Shared lock: okuma sürerken başka process'in yazımı araya girmez.
+    with read_lock():
+        user_decks = list(iter_decks(user["id"]))
+        deck_ids = {d["id"] for d in user_decks}
 
-    user_cards = [c for c in load_cards() if c["deck_id"] in deck_ids]
-    card_ids = {c["id"] for c in user_cards}
+        user_cards = list(iter_cards(deck_ids))
+        card_ids = {c["id"] for c in user_cards}
 
-    user_srs_states = [s for s in load_srs_states() if s["card_id"] in card_ids]
-    user_reviews = [r for r in load_reviews() if r["user_id"] == user["id"]]
+        user_srs_states = list(iter_srs_states(card_ids))
+        user_reviews = list(iter_reviews(user["id"]))
 
     # ---------------------------------------------
     # BACKUP PAYLOAD
@@ -96,7 +100,8 @@ def export_backup_for_current_user() -> Path:
     # JSON DOSYASINA ATOMIC YAZ
     # ---------------------------------------------
     # storage.atomic_write JSON dump + fsync + os.replace yapıyor.
-    atomic_write(backup_file, backup_data)
+    # Backup insan tarafından okunacağı için pretty (indent=2) yazılır.
+    atomic_write(backup_file, backup_data, pretty=True)
 
     return backup_file
 
@@ -0,0 +1,7 @@
+"""
+StudyBuddy - Benchmark paketi
+
+- generate_data.py : DATA_DIR'i sentetik veriyle doldurur
+- run_benchmarks.py: sıcak yolları (login, create_card, review, due, rapor,
+  backup) ölçer ve sonuçları baseline ile karşılaştırır
+"""
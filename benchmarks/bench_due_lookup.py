@@ -0,0 +1,137 @@
+"""
+StudyBuddy - Due Kart Sorgusu Benchmark'ı
+
+Bu script:
+- srs_service'in set tabanlı due sorgusunu (deck / kart / state setleri bir
+  kez okunur, hash join) N+1 desenle karşılaştırır:
+  deck başına get_cards_by_deck + kart başına get_srs_state_by_card
+- n_plus_1_indexed: N+1 çağrı deseni, ama bugünkü cache'li / index'li
+  storage üzerinde (sadece çağrı sayısının maliyeti)
+- --original ile ayrıca seri öncesi kodun yolu ölçülür: her çağrı tabloyu
+  diskten json.load ile baştan okur ve lineer tarar (kart başına tüm
+  srs_state.json). O(kart x tablo) olduğu için varsayılan olarak kapalıdır;
+  küçük bir veri setiyle kullanın
+- Yolların aynı kartları döndürdüğünü doğrular
+- Varsayılan veri seti: kullanıcı başına 10k kart (2 kullanıcı x 20 deck x 500)
+
+Kullanım:
+    python benchmarks/bench_due_lookup.py
+    python benchmarks/bench_due_lookup.py --cards-per-deck 2500 --repeat 5
+    python benchmarks/bench_due_lookup.py --cards-per-deck 50 --original
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from benchmarks.generate_data import (
+    add_dataset_arguments,
+    dataset_options,
+    generate_dataset,
+    prepare_data_dir,
+)
+from benchmarks.run_benchmarks import measure
+
+
+def _indexed_n_plus_1_due_cards(user_id: int, today: date) -> list:
+    """N+1 desen bugünkü storage ile: deck → kartlar → kart başına state (index lookup)."""
+    from storage import get_decks_by_user, get_cards_by_deck, get_srs_state_by_card
+
+    due_cards = []
+    for deck in get_decks_by_user(user_id):
+        for card in get_cards_by_deck(deck["id"]):
+            state = get_srs_state_by_card(card["id"])
+            if state is None or date.fromisoformat(state["due_date"][:10]) <= today:
+                due_cards.append(card)
+    return due_cards
+
+
+def _read_table(path: Path) -> list:
+    """Seri öncesi storage.read_json: cache yok, her çağrıda dosya baştan parse edilir."""
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _original_due_cards(user_id: int, today: date) -> list:
+    """
+    Seri öncesi get_due_cards_for_current_user: deck başına tüm cards.json,
+    kart başına tüm srs_state.json okunur ve lineer taranır.
+    """
+    from config import DECKS_FILE, CARDS_FILE, SRS_STATE_FILE
+
+    today_iso = today.isoformat()
+    due_cards = []
+    for deck in [d for d in _read_table(DECKS_FILE) if d["user_id"] == user_id]:
+        for card in [c for c in _read_table(CARDS_FILE) if c["deck_id"] == deck["id"]]:
+            state = next((s for s in _read_table(SRS_STATE_FILE) if s["card_id"] == card["id"]), None)
+            if not state or state["due_date"] <= today_iso:
+                due_cards.append(card)
+    return due_cards
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare set-based and N+1 due-card lookups")
+    add_dataset_arguments(parser)
+    parser.set_defaults(users=2, decks_per_user=20, cards_per_deck=500, review_years=0.1)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--original", action="store_true",
+                        help="Seri öncesi (kart başına tüm tabloyu okuyan) yolu da ölç")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="studybuddy_bench_"))
+    prepare_data_dir(args.data_dir.resolve() if args.data_dir else work_dir / "data", force=args.force)
+    try:
+        import storage
+        from srs_service import _get_due_cards_for_user_id
+
+        counts = generate_dataset(**dataset_options(args))
+        print(f"Dataset: {counts['cards']:,} cards, {counts['srs_states']:,} SRS states, "
+              f"{counts['cards'] // counts['users']:,} cards per user\n")
+
+        today = date.today()
+        joined = _get_due_cards_for_user_id(1, today)
+        expected = sorted(c["id"] for c in joined)
+        assert sorted(c["id"] for c in _indexed_n_plus_1_due_cards(1, today)) == expected
+
+        results = {}
+        paths = (("n_plus_1_indexed", _indexed_n_plus_1_due_cards), ("hash_join", _get_due_cards_for_user_id))
+        for name, fn in paths:
+            # Warm: tablolar cache'te; cold: her ölçümde cache boşaltılır
+            results[f"{name}_warm"] = measure(lambda _: fn(1, today), args.repeat)
+            results[f"{name}_cold"] = measure(
+                lambda _: (storage._reset_storage_cache(), fn(1, today)), args.repeat
+            )
+
+        if args.original:
+            # Dosyalar tam olmalı (journal'da bekleyen değişiklik kalmasın)
+            storage.compact_journal()
+            assert sorted(c["id"] for c in _original_due_cards(1, today)) == expected
+            results["original"] = measure(lambda _: _original_due_cards(1, today), max(1, args.repeat // 5))
+
+        print(f"{'path':<24} {'median ms':>10}  ({len(joined):,} due cards)")
+        for name, r in results.items():
+            print(f"{name:<24} {r['median_ms']:>10.3f}")
+        for mode in ("warm", "cold"):
+            ratio = results[f"n_plus_1_indexed_{mode}"]["median_ms"] / results[f"hash_join_{mode}"]["median_ms"]
+            print(f"speedup vs n_plus_1_indexed ({mode}): {ratio:.1f}x")
+        if "original" in results:
+            for mode in ("warm", "cold"):
+                ratio = results["original"]["median_ms"] / results[f"hash_join_{mode}"]["median_ms"]
+                print(f"speedup vs original ({mode}): {ratio:.1f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+StudyBuddy - Sentetik Veri Üretici (Benchmark)
+
+Bu script:
+- DATA_DIR'i verilen boyutlarda kullanıcı / deck / kart / SRS state ve
+  yıllara yayılmış review kayıtlarıyla doldurur
+- Kayıtları storage.save_* ile TOPLU yazar (kayıt başına create_* yok);
+  böylece 1M review'lık bir veri seti de saniyeler içinde hazırlanır
+- Aynı seed ile her çalıştırmada aynı veriyi üretir
+
+Kullanım:
+    STUDYBUDDY_DATA_DIR=/tmp/sb python benchmarks/generate_data.py --preset medium
+
+❗ NOT:
+Hedef DATA_DIR'deki mevcut veri SİLİNİR. Silme sadece klasör boşsa veya
+daha önce bu script tarafından oluşturulmuşsa (MARKER_FILE) yapılır;
+başka bir dolu klasör için --force gerekir. Klasör verilmezse yeni bir
+geçici klasör (tempfile.mkdtemp) kullanılır.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+
+# =====================================================
+# PRESETS
+# =====================================================
+
+# users x decks_per_user x cards_per_deck kart; review sayısı
+# users x review_years x 365 x reviews_per_day
+PRESETS = {
+    "tiny": dict(users=2, decks_per_user=2, cards_per_deck=10,
+                 review_years=0.1, reviews_per_day=2),
+    "small": dict(users=10, decks_per_user=10, cards_per_deck=100,
+                  review_years=1, reviews_per_day=5),        # 10k kart, ~18k review
+    "medium": dict(users=50, decks_per_user=20, cards_per_deck=100,
+                   review_years=1, reviews_per_day=20),      # 100k kart, ~365k review
+    "large": dict(users=100, decks_per_user=20, cards_per_deck=250,
+                  review_years=2, reviews_per_day=15),       # 500k kart, ~1.1M review
+}
+
+DEFAULT_PASSWORD = "benchmark"
+MARKER_FILE = ".studybuddy_benchmark"   # Üretilen veri klasörlerini işaretler
+STUDIED_RATIO = 0.8   # SRS state'i olan (en az bir kez çalışılmış) kart oranı
+
+
+def user_email(user_id: int) -> str:
+    """Üretilen kullanıcıların email formatı (benchmark login'i için)."""
+    return f"bench_user_{user_id}@mail.com"
+
+
+# =====================================================
+# GENERATOR
+# =====================================================
+
+def generate_dataset(
+    users: int,
+    decks_per_user: int,
+    cards_per_deck: int,
+    review_years: float = 1,
+    reviews_per_day: int = 5,
+    studied_ratio: float = STUDIED_RATIO,
+    seed: int = 42,
+    password: str = DEFAULT_PASSWORD,
+) -> dict:
+    """
+    Aktif DATA_DIR'i sentetik veriyle doldurur, tablo başına kayıt sayılarını döndürür.
+
+    - Her kullanıcının parolası `password` (tek hash, tüm kullanıcılara)
+    - Due tarihleri bugünün 30 gün öncesi / 60 gün sonrası arasına dağılır
+    - Review'lar son `review_years` yıla kronolojik sırada yayılır
+    """
+    # storage DATA_DIR'i import anında okur; CLI env'i ayarladıktan sonra
+    # import edilmesi için burada import edilir.
+    from storage import (
+        _reset_storage_cache,
+        initialize_storage,
+        save_users,
+        save_decks,
+        save_cards,
+        save_srs_states,
+        save_reviews,
+    )
+    from utils import hash_password
+
+    rng = random.Random(seed)
+    today = date.today()
+    created_at = f"{(today - timedelta(days=int(review_years * 365) + 1)).isoformat()}T00:00:00+00:00"
+
+    password_data = hash_password(password)
+    user_rows, deck_rows, card_rows, state_rows = [], [], [], []
+    studied_by_user: dict = {}
+
+    deck_id = card_id = 0
+    for user_id in range(1, users + 1):
+        user_rows.append({
+            "id": user_id,
+            "email": user_email(user_id),
+            "password_hash": password_data["hash"],
+            "password_salt": password_data["salt"],
+            "name": f"Bench User {user_id}",
+            "created_at": created_at,
+        })
+        studied = studied_by_user[user_id] = []
+
+        for d in range(decks_per_user):
+            deck_id += 1
+            deck_rows.append({
+                "id": deck_id,
+                "name": f"Deck {d + 1}",
+                "user_id": user_id,
+                "version": 1,
+            })
+
+            for c in range(cards_per_deck):
+                card_id += 1
+                card_rows.append({
+                    "id": card_id,
+                    "deck_id": deck_id,
+                    "front": f"Question {deck_id}-{c + 1}",
+                    "back": f"Answer {deck_id}-{c + 1}",
+                    "created_at": created_at,
+                    "version": 1,
+                })
+                if rng.random() >= studied_ratio:
+                    continue
+
+                studied.append(card_id)
+                repetition = rng.randint(1, 8)
+                interval = 1 if repetition == 1 else rng.randint(2, 120)
+                state_rows.append({
+                    "id": len(state_rows) + 1,
+                    "user_id": user_id,
+                    "card_id": card_id,
+                    "repetition": repetition,
+                    "interval_days": interval,
+                    "easiness_factor": round(rng.uniform(1.3, 2.8), 2),
+                    "due_date": (today + timedelta(days=rng.randint(-30, 60))).isoformat(),
+                    "created_at": created_at,
+                    "version": repetition,
+                })
+
+    review_rows = []
+    days = int(review_years * 365)
+    for offset in range(days, 0, -1):
+        day = (today - timedelta(days=offset)).isoformat()
+        for user_id, studied in studied_by_user.items():
+            if not studied:
+                continue
+            for _ in range(reviews_per_day):
+                review_rows.append({
+                    "id": len(review_rows) + 1,
+                    "user_id": user_id,
+                    "card_id": rng.choice(studied),
+                    "quality": rng.randint(0, 5),
+                    "reviewed_at": f"{day}T{rng.randint(6, 23):02d}:{rng.randint(0, 59):02d}:00+00:00",
+                })
+
+    _reset_storage_cache()
+    initialize_storage()
+    save_users(user_rows)
+    save_decks(deck_rows)
+    save_cards(card_rows)
+    save_srs_states(state_rows)
+    save_reviews(review_rows)
+    _reset_storage_cache()
+
+    return {
+        "users": len(user_rows),
+        "decks": len(deck_rows),
+        "cards": len(card_rows),
+        "srs_states": len(state_rows),
+        "reviews": len(review_rows),
+    }
+
+
+# =====================================================
+# CLI
+# =====================================================
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    """generate_data.py ve run_benchmarks.py'nin ortak veri seti argümanları."""
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--decks-per-user", type=int)
+    parser.add_argument("--cards-per-deck", type=int)
+    parser.add_argument("--review-years", type=float)
+    parser.add_argument("--reviews-per-day", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", type=Path,
+                        help="Hedef DATA_DIR (varsayılan: STUDYBUDDY_DATA_DIR)")
+    parser.add_argument("--force", action="store_true",
+                        help="Benchmark işareti olmayan dolu bir --data-dir'i de sil")
+
+
+def dataset_options(args: argparse.Namespace) -> dict:
+    """Preset'i komut satırında verilen değerlerle ezip generate_dataset argümanlarını döndürür."""
+    options = dict(PRESETS[args.preset])
+    for key in options:
+        value = getattr(args, key)
+        if value is not None:
+            options[key] = value
+    options["seed"] = args.seed
+    return options
+
+
+def prepare_data_dir(data_dir: Path, force: bool = False) -> None:
+    """
+    Hedef klasörü boşaltır, işaretler ve STUDYBUDDY_DATA_DIR olarak ayarlar.
+    config / storage import edilmeden ÖNCE çağrılmalıdır.
+
+    Dolu bir klasör sadece MARKER_FILE içeriyorsa (bu script oluşturmuşsa)
+    veya force=True ise silinir; uygulamanın data/ klasörü hiçbir zaman.
+    """
+    data_dir = data_dir.resolve()
+    if data_dir == (ROOT_DIR / "data").resolve():
+        raise SystemExit("Refusing to overwrite the application data/ directory")
+
+    if data_dir.exists() and any(data_dir.iterdir()):
+        if not (data_dir / MARKER_FILE).exists() and not force:
+            raise SystemExit(
+                f"Refusing to delete {data_dir}: it is not empty and was not created "
+                f"by the benchmark generator (pass --force to delete it anyway)"
+            )
+        shutil.rmtree(data_dir)
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    (data_dir / MARKER_FILE).write_text("StudyBuddy benchmark data\n", encoding="utf-8")
+    os.environ["STUDYBUDDY_DATA_DIR"] = str(data_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Populate DATA_DIR with a synthetic StudyBuddy dataset")
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or os.environ.get("STUDYBUDDY_DATA_DIR")
+    if not data_dir:
+        data_dir = tempfile.mkdtemp(prefix="studybuddy_data_")
+    prepare_data_dir(Path(data_dir), force=args.force)
+
+    started = time.perf_counter()
+    counts = generate_dataset(**dataset_options(args))
+    elapsed = time.perf_counter() - started
+
+    print(f"Dataset written to {os.environ['STUDYBUDDY_DATA_DIR']} in {elapsed:.2f}s")
+    for table, count in counts.items():
+        print(f"  {table:<11} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
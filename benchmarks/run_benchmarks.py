@@ -0,0 +1,216 @@
+"""
+StudyBuddy - Benchmark Suite
+
+Bu script:
+- Geçici bir DATA_DIR'i generate_data ile sentetik veriyle doldurur
+- Sıcak yolları ölçer: register / login, create_card, review_card,
+  due kart sorgusu, raporlar, backup ve cold start (tüm tabloları yükleme)
+- Her ölçüm için min / median / p95 (ms) raporlar
+- --json ile sonuçları kaydeder; --baseline ile önceki bir sonuca göre
+  yavaşlayan ölçüm varsa exit code 1 ile çıkar (CI'da regresyon yakalamak için)
+
+Kullanım:
+    python benchmarks/run_benchmarks.py --preset medium --json bench.json
+    python benchmarks/run_benchmarks.py --preset medium --baseline bench.json
+
+❗ NOT:
+Ölçümler config'deki ayarlarla (DURABILITY, snapshot'lar ...) yapılır;
+sadece DATA_DIR geçici klasöre yönlendirilir.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from benchmarks.generate_data import (
+    DEFAULT_PASSWORD,
+    add_dataset_arguments,
+    dataset_options,
+    generate_dataset,
+    prepare_data_dir,
+    user_email,
+)
+
+
+# =====================================================
+# MEASUREMENT
+# =====================================================
+
+def measure(fn, repeat: int) -> dict:
+    """fn'i repeat kez çalıştırır, süreleri ms cinsinden özetler."""
+    timings = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(timings[0], 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+    }
+
+
+def run_suite(repeat: int) -> dict:
+    """
+    Aktif DATA_DIR üzerinde tüm benchmark'ları çalıştırır.
+    Veri seti generate_dataset ile üretilmiş olmalıdır (user 1 ölçülür).
+    """
+    import storage
+    from auth import register, login, logout
+    from card_service import create_card_for_current_user
+    from deck_service import get_my_decks
+    from review_service import review_card
+    from srs_service import get_due_cards_for_current_user
+    from report_service import (
+        get_due_cards_for_current_user as report_due_cards,
+        get_last_7_days_activity_for_current_user,
+        get_user_stats_for_current_user,
+    )
+    from backup_service import export_backup_for_current_user
+
+    results: dict = {}
+
+    def cold_start(_):
+        storage._reset_storage_cache()
+        for load in (storage.load_users, storage.load_decks, storage.load_cards,
+                     storage.load_srs_states, storage.load_reviews):
+            load()
+
+    results["cold_start"] = measure(cold_start, max(1, repeat // 5))
+
+    results["register"] = measure(
+        lambda i: register(f"bench_new_{i}@mail.com", DEFAULT_PASSWORD, "New User"),
+        max(1, repeat // 5),
+    )
+    results["login"] = measure(
+        lambda _: login(user_email(1), DEFAULT_PASSWORD), max(1, repeat // 5)
+    )
+
+    deck_id = get_my_decks()[0]["id"]
+    created = []
+    results["create_card"] = measure(
+        lambda i: created.append(create_card_for_current_user(deck_id, f"Bench Q{i}", f"Bench A{i}")),
+        repeat,
+    )
+    results["review_card"] = measure(
+        lambda i: review_card(created[i % len(created)]["id"], i % 6), repeat
+    )
+
+    results["due_cards"] = measure(lambda _: get_due_cards_for_current_user(), repeat)
+    results["report_due_cards"] = measure(lambda _: report_due_cards(), repeat)
+    results["report_last_7_days"] = measure(
+        lambda _: get_last_7_days_activity_for_current_user(), repeat
+    )
+    results["report_user_stats"] = measure(lambda _: get_user_stats_for_current_user(), repeat)
+
+    # Backup dosyaları çalışma klasörüne (cwd/backups) yazılır
+    results["backup"] = measure(lambda _: export_backup_for_current_user(), max(1, repeat // 5))
+
+    logout()
+    storage.flush()
+    return results
+
+
+# =====================================================
+# REPORTING
+# =====================================================
+
+def print_results(results: dict, baseline: dict | None = None) -> None:
+    header = f"{'benchmark':<20} {'runs':>5} {'min ms':>10} {'median ms':>10} {'p95 ms':>10}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for name, r in results.items():
+        line = f"{name:<20} {r['runs']:>5} {r['min_ms']:>10.3f} {r['median_ms']:>10.3f} {r['p95_ms']:>10.3f}"
+        base = (baseline or {}).get(name)
+        if base and base["median_ms"]:
+            line += f" {r['median_ms'] / base['median_ms']:>7.2f}x"
+        print(line)
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """Median'ı baseline'ın tolerance katını aşan ölçümlerin isimlerini döndürür."""
+    return [
+        name for name, r in results.items()
+        if name in baseline and r["median_ms"] > baseline[name]["median_ms"] * tolerance
+    ]
+
+
+# =====================================================
+# CLI
+# =====================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark StudyBuddy hot paths on a synthetic dataset")
+    add_dataset_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", type=Path, help="Sonuçları bu dosyaya yaz")
+    parser.add_argument("--baseline", type=Path, help="Karşılaştırılacak önceki --json çıktısı")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Baseline median'ının kaç katı regresyon sayılır")
+    args = parser.parse_args()
+
+    json_path = args.json.resolve() if args.json else None
+    baseline_path = args.baseline.resolve() if args.baseline else None
+
+    # Backup'lar cwd/backups altına yazıldığı için geçici klasörde çalışılır
+    work_dir = Path(tempfile.mkdtemp(prefix="studybuddy_bench_"))
+    prepare_data_dir(args.data_dir.resolve() if args.data_dir else work_dir / "data", force=args.force)
+    os.chdir(work_dir)
+    try:
+        return _run(args, json_path, baseline_path)
+    finally:
+        os.chdir(ROOT_DIR)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _run(args: argparse.Namespace, json_path: Path | None, baseline_path: Path | None) -> int:
+    """PRIVATE: Veri setini üretir, suite'i çalıştırır ve sonuçları raporlar."""
+    options = dataset_options(args)
+    started = time.perf_counter()
+    counts = generate_dataset(**options)
+    print(f"Dataset ({args.preset}): " + ", ".join(f"{k}={v:,}" for k, v in counts.items()))
+    print(f"Generated in {time.perf_counter() - started:.2f}s ({os.environ['STUDYBUDDY_DATA_DIR']})\n")
+
+    results = run_suite(args.repeat)
+
+    baseline = None
+    if baseline_path:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    print_results(results, baseline)
+
+    if json_path:
+        json_path.write_text(json.dumps({
+            "date": date.today().isoformat(),
+            "preset": args.preset,
+            "dataset": counts,
+            "options": options,
+            "results": results,
+        }, indent=2), encoding="utf-8")
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nREGRESSION (> {args.tolerance}x baseline median): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
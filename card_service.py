@@ -12,6 +12,8 @@ from storage import (
     create_card,
     get_card_by_id,
     get_cards_by_deck,
+    get_cards_by_deck_page,
+    iter_cards,
     delete_card,
     get_deck_by_id,
 )
@@ -55,6 +57,41 @@ def get_cards_for_current_user_by_deck(deck_id: int) -> list:
     kendisine ait bir deck içindeki kartları listeler.
     """
 
+    _check_deck_owner(deck_id)
+    return get_cards_by_deck(deck_id)
+
+
+def get_cards_page_for_current_user_by_deck(
+    deck_id: int,
+    limit: int,
+    offset: int = 0,
+    after_id: int | None = None
+) -> list:
+    """
+    Deck'in kartlarından tek bir sayfa döndürür (tüm liste kurulmaz).
+
+    Sayfalama:
+    - limit / offset: klasik sayfa
+    - after_id: önceki sayfanın son kart id'si (cursor); büyük deck'lerde
+      ve sayfalar arasında kart eklenip silinirken tercih edilir
+    """
+    _check_deck_owner(deck_id)
+    return get_cards_by_deck_page(deck_id, limit, offset, after_id)
+
+
+def iter_cards_for_current_user_by_deck(deck_id: int):
+    """
+    Deck'in kartlarını tek tek veren generator döndürür.
+    Login / ownership kontrolü çağrı anında yapılır (ilk next()'te değil).
+    """
+    _check_deck_owner(deck_id)
+    return iter_cards([deck_id])
+
+
+def _check_deck_owner(deck_id: int) -> None:
+    """
+    PRIVATE: Login olan kullanıcının deck'in sahibi olduğunu doğrular.
+    """
     user = get_current_user()
     if not user:
         raise RuntimeError("User not logged in")
@@ -66,8 +103,6 @@ def get_cards_for_current_user_by_deck(deck_id: int) -> list:
     if deck["user_id"] != user["id"]:
         raise PermissionError("You do not own this deck")
 
-    return get_cards_by_deck(deck_id)
-
 
 # ============================================
 # DELETE CARD
@@ -134,10 +169,14 @@ def get_card_for_current_user(card_id: int) -> dict:
 def update_card_for_current_user(
     card_id: int,
     front: str | None = None,
-    back: str | None = None
+    back: str | None = None,
+    expected_version: int | None = None
 ) -> dict:
     """
     Login olan kullanıcının SADECE kendi kartını güncellemesini sağlar.
+
+    expected_version verilirse kart o version'dan beri değiştiyse
+    RuntimeError("Version conflict") fırlatılır.
     """
 
     # Login kontrolü
@@ -169,7 +208,7 @@ def update_card_for_current_user(
     if not updates:
         raise ValueError("Nothing to update")
 
-    updated = update_card(card_id, updates)
+    updated = update_card(card_id, updates, expected_version=expected_version)
     if not updated:
         raise RuntimeError("Update failed")
 
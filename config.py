@@ -10,6 +10,7 @@ Bu dosya:
 Path objeleri kullanılır, string path TANIMLANMAZ.
 """
 
+import os
 from pathlib import Path
 
 # =====================================================
@@ -23,7 +24,9 @@ BASE_DIR = Path(__file__).resolve().parent
 # DIRECTORY STRUCTURE
 # =====================================================
 
-DATA_DIR = BASE_DIR / "data"
+# STUDYBUDDY_DATA_DIR verilirse veri o klasörde tutulur (benchmark'lar,
+# geçici kopyalar); tüm veri dosyası path'leri DATA_DIR'den türetilir.
+DATA_DIR = Path(os.environ.get("STUDYBUDDY_DATA_DIR") or BASE_DIR / "data")
 LOGS_DIR = BASE_DIR / "logs"
 BACKUPS_DIR = BASE_DIR / "backups"
 
@@ -43,6 +46,119 @@ SRS_STATE_FILE = DATA_DIR / "srs_state.json"
 REVIEWS_FILE = DATA_DIR / "reviews.json"
 COUNTERS_FILE = DATA_DIR / "counters.json"
 
+# Review'lar append-only log olarak tutulur (satır başına bir JSON obje).
+# REVIEWS_FILE sadece eski kurulumlardan tek seferlik migration için okunur.
+REVIEWS_LOG_FILE = DATA_DIR / "reviews.jsonl"
+
+# =====================================================
+# STORAGE BACKEND
+# =====================================================
+
+# "json"   : data/ altındaki JSON dosyaları (varsayılan)
+# "sqlite" : stdlib sqlite3 (WAL modu) - büyük veri setleri için
+#            (JSON verisi `python main.py migrate-sqlite` ile taşınır)
+STORAGE_BACKEND = "json"
+SQLITE_FILE = DATA_DIR / "studybuddy.db"
+
+# =====================================================
+# STORAGE (PER-USER SHARDS)
+# =====================================================
+
+# True ise deck / card / SRS state / review kayıtları kullanıcı başına
+# ayrı dosyalarda tutulur: data/users/<user_id>/cards.json ...
+# (users.json global kalır; id -> sahip route'ları data/routes/ altında)
+# Mevcut veri `python main.py migrate-shards` ile taşınır.
+SHARDED_STORAGE = False
+SHARDS_DIR = DATA_DIR / "users"
+ROUTES_DIR = DATA_DIR / "routes"
+
+# =====================================================
+# STORAGE (WRITE-AHEAD JOURNAL)
+# =====================================================
+
+# Tablo değişiklikleri (create/update/delete) önce bu journal'a küçük
+# satırlar olarak eklenir; JSON snapshot'lar periyodik olarak compaction
+# ile güncellenir.
+JOURNAL_FILE = DATA_DIR / "journal.wal"
+JOURNAL_ENABLED = True
+JOURNAL_MAX_BYTES = 1_048_576   # Bu boyutu aşınca journal snapshot'lara katlanır
+
+# =====================================================
+# STORAGE (ID SEQUENCES)
+# =====================================================
+
+# create_* fonksiyonlarının id'leri COUNTERS_FILE'daki tablo sayaçlarından
+# alınır. Her disk yazımında bu kadar id rezerve edilir; process kapanınca
+# kullanılmayan id'ler boşluk olarak kalır (tekrar kullanılmaz).
+ID_BLOCK_SIZE = 64
+
+# =====================================================
+# STORAGE (DURABILITY / FSYNC POLICY)
+# =====================================================
+
+# "strict"  : her yazım fsync ile diske indirilir (varsayılan)
+# "batched" : append'lerin (journal, review log) fsync'i gruplanır
+#             (group commit): DURABILITY_BATCH_WRITES yazımda veya
+#             DURABILITY_BATCH_MS içinde bir kez; process çıkışında mutlaka
+# "none"    : fsync yapılmaz (testler, toplu import gibi geçici çalışmalar)
+# storage.transaction(durability=...) ile transaction bazında ezilebilir.
+DURABILITY = "strict"
+DURABILITY_BATCH_MS = 50
+DURABILITY_BATCH_WRITES = 32
+
+# =====================================================
+# STORAGE (JSON CODEC)
+# =====================================================
+
+# Veri dosyaları kompakt JSON olarak yazılır (indent yok).
+# "auto"   : orjson kuruluysa onu, değilse stdlib json'u kullanır
+# "json"   : her zaman stdlib json
+# "orjson" : orjson zorunlu (kurulu değilse import hatası)
+# Okunabilir kopya için: python main.py pretty-export
+JSON_CODEC = "auto"
+
+# =====================================================
+# STORAGE (BINARY SNAPSHOTS)
+# =====================================================
+
+# Büyük tablo dosyalarının yanında ikili (marshal) bir kopyası tutulur:
+# data/cards.json.snap, data/reviews.jsonl.snap ...
+# Açılışta kopya kaynak dosyayla eşleşiyorsa (imza + CRC32) JSON parse
+# edilmez. Kopyalar sadece hız içindir; silinmeleri veri kaybı değildir.
+BINARY_SNAPSHOTS = True
+SNAPSHOT_MIN_BYTES = 256 * 1024   # Bundan küçük dosyalar için kopya tutulmaz
+
+# =====================================================
+# STORAGE (WRITE-BACK MODE)
+# =====================================================
+
+# True ise create/update/delete'ler sadece memory'deki tabloları değiştirir;
+# değişen her tablo storage.flush() çağrılınca (ve process çıkışında) TEK
+# seferde yazılır. Toplu import script'leri içindir: flush'a kadar exclusive
+# lock tutulur ve flush edilmemiş değişiklikler crash'te kaybolur.
+# Tek bir blok için: with storage.write_back(): ...
+WRITE_BACK = False
+
+# =====================================================
+# STORAGE (MULTI-PROCESS LOCKING)
+# =====================================================
+
+# Aynı DATA_DIR'i kullanan process'ler (CLI, cron backup ...) bu dosya
+# üzerinde fcntl.flock alır: okuyucular SHARED (birlikte), yazarlar
+# EXCLUSIVE (sırayla). fcntl olmayan platformlarda lock uygulanmaz.
+LOCK_FILE = DATA_DIR / "storage.lock"
+LOCKING_ENABLED = True
+
+# =====================================================
+# STORAGE (METRICS)
+# =====================================================
+
+# storage.py okuma / yazım / fsync metriklerini process içinde toplar
+# (python main.py metrics ile görülebilir). Bir path verilirse process
+# çıkışında metrikler bu dosyaya yazılır: .prom uzantısı Prometheus text
+# formatı (node_exporter textfile collector), diğerleri JSON.
+METRICS_FILE = None
+
 # =====================================================
 # LOGGING
 # =====================================================
@@ -58,6 +174,10 @@ MIN_EF = 1.3            # Minimum easiness factor
 FIRST_INTERVAL = 1      # İlk tekrar (gün)
 SECOND_INTERVAL = 6     # İkinci tekrar (gün)
 
+# srs_service ve review_service'in kullandığı scheduling algoritması
+# (srs_engine'de kayıtlı bir isim; bkz. srs_engine.register_algorithm)
+SRS_ALGORITHM = "sm2"
+
 QUALITY_DESCRIPTIONS = {
     0: "Hiç hatırlamadım",
     1: "Çok zor hatırladım",
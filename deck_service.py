@@ -19,6 +19,8 @@ from auth import get_current_user
 from storage import (
     create_deck,
     get_decks_by_user,
+    get_decks_by_user_page,
+    iter_decks,
     get_deck_by_id,
     delete_deck,
 )
@@ -74,6 +76,37 @@ def get_my_decks() -> list:
     return get_decks_by_user(user["id"])
 
 
+def get_my_decks_page(limit: int, offset: int = 0, after_id: int | None = None) -> list:
+    """
+    Login olan kullanıcının decklerinden tek bir sayfa döndürür.
+
+    Args:
+        limit: sayfadaki en fazla deck
+        offset: atlanacak deck sayısı
+        after_id: önceki sayfanın son deck id'si (cursor)
+
+    Returns:
+        list[dict]: sayfadaki deckler
+    """
+    user = get_current_user()
+    if not user:
+        raise RuntimeError(ERR_LOGIN_REQUIRED)
+
+    return get_decks_by_user_page(user["id"], limit, offset, after_id)
+
+
+def iter_my_decks():
+    """
+    Login olan kullanıcının decklerini tek tek veren generator döndürür.
+    Login kontrolü çağrı anında yapılır.
+    """
+    user = get_current_user()
+    if not user:
+        raise RuntimeError(ERR_LOGIN_REQUIRED)
+
+    return iter_decks(user["id"])
+
+
 # ============================================
 # DECK SERVICE – DELETE
 # ============================================
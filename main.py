@@ -13,13 +13,35 @@ Amaç:
 
 Çalıştırma:
     python main.py
+
+Yönetim komutları:
+    python main.py migrate-sqlite   # JSON verisini SQLite'a taşır
+    python main.py pretty-export [klasör]   # tabloların okunabilir kopyası
+    python main.py migrate-shards   # global JSON'ları kullanıcı shard'larına böler
+    python main.py metrics [prometheus|json] [dosya]   # storage metrikleri
 """
 
 # =====================================================
 # IMPORTS
 # =====================================================
 
-from storage import initialize_storage
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from config import BACKUPS_DIR
+from storage import (
+    initialize_storage,
+    export_pretty,
+    migrate_to_shards,
+    load_users,
+    load_decks,
+    load_cards,
+    load_srs_states,
+    load_reviews,
+    render_metrics,
+    export_metrics,
+)
 from auth import register, login, logout, get_current_user
 
 from deck_service import (
@@ -30,7 +52,7 @@ from deck_service import (
 
 from card_service import (
     create_card_for_current_user,
-    get_cards_for_current_user_by_deck,
+    get_cards_page_for_current_user_by_deck,
     update_card_for_current_user,
     delete_card_for_current_user,
 )
@@ -53,6 +75,7 @@ from backup_service import backup_flow
 SELECT_PROMPT = "Select: "
 BACK_OPTION = "0) Back"
 ENTER_TO_CONTINUE = "\nDevam etmek için Enter..."
+PAGE_SIZE = 20
 
 
 # =====================================================
@@ -104,6 +127,25 @@ def login_flow():
 # CARD MENU
 # =====================================================
 
+def list_cards_paged(deck_id: int):
+    """Deck'in kartlarını PAGE_SIZE'lık sayfalar halinde listeler"""
+    after_id = None
+    while True:
+        cards = get_cards_page_for_current_user_by_deck(deck_id, PAGE_SIZE, after_id=after_id)
+        if not cards and after_id is None:
+            print("Kart bulunamadı")
+            return
+
+        for c in cards:
+            print(f"[{c['id']}] {c['front']}")
+
+        if len(cards) < PAGE_SIZE:
+            return
+        if prompt("Sonraki sayfa için Enter, çıkmak için 0: ") == "0":
+            return
+        after_id = cards[-1]["id"]
+
+
 def card_menu(deck_id: int):
     """Seçilen deck içindeki kart işlemleri"""
     while True:
@@ -125,12 +167,7 @@ def card_menu(deck_id: int):
             print("✅ Card oluşturuldu")
 
         elif choice == "2":
-            cards = get_cards_for_current_user_by_deck(deck_id)
-            if not cards:
-                print("Kart bulunamadı")
-            else:
-                for c in cards:
-                    print(f"[{c['id']}] {c['front']}")
+            list_cards_paged(deck_id)
 
         elif choice == "3":
             cid = int(prompt("Card ID: "))
@@ -283,6 +320,79 @@ def main_menu():
             print("👋 Çıkış yapıldı")
 
 
+# =====================================================
+# ADMIN COMMANDS (python main.py <komut>)
+# =====================================================
+
+def migrate_sqlite_command(args: list) -> None:
+    """JSON tablolarını SQLite veritabanına kopyalar."""
+    from sqlite_storage import migrate_json_to_sqlite
+
+    for table, count in migrate_json_to_sqlite().items():
+        print(f"{table}: {count} kayıt")
+    print("✅ Migration tamamlandı (config.STORAGE_BACKEND = \"sqlite\" yapın)")
+
+
+def pretty_export_command(args: list) -> None:
+    """Tabloların indent'li (okunabilir) kopyasını yazar (debug için)."""
+    if args:
+        target = Path(args[0])
+    else:
+        target = BACKUPS_DIR / f"pretty_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+
+    for path in export_pretty(target):
+        print("📝", path)
+
+
+def migrate_shards_command(args: list) -> None:
+    """Global JSON tablolarını data/users/<id>/ shard'larına taşır."""
+    counts = migrate_to_shards()
+    if not counts:
+        print("ℹ️ Taşınacak global veri yok")
+        return
+
+    for table, count in counts.items():
+        print(f"{table}: {count} kayıt")
+    print("✅ Migration tamamlandı (config.SHARDED_STORAGE = True yapın)")
+
+
+def metrics_command(args: list) -> None:
+    """
+    Tüm tabloları bir kez yükler (cold start ölçümü) ve storage metriklerini
+    yazdırır; dosya verilirse oraya export eder.
+    """
+    fmt = args[0] if args else "prometheus"
+
+    initialize_storage()
+    for loader in (load_users, load_decks, load_cards, load_srs_states, load_reviews):
+        loader()
+
+    if len(args) > 1:
+        print("📝", export_metrics(Path(args[1]), fmt))
+    else:
+        print(render_metrics(fmt), end="")
+
+
+ADMIN_COMMANDS = {
+    "migrate-sqlite": migrate_sqlite_command,
+    "pretty-export": pretty_export_command,
+    "migrate-shards": migrate_shards_command,
+    "metrics": metrics_command,
+}
+
+
+def run_admin_command(argv: list) -> int:
+    """Komut satırı argümanlarını ilgili yönetim komutuna yönlendirir."""
+    command = ADMIN_COMMANDS.get(argv[0])
+    if command is None:
+        print("❌ Bilinmeyen komut:", argv[0])
+        print("Komutlar:", ", ".join(sorted(ADMIN_COMMANDS)))
+        return 2
+
+    command(argv[1:])
+    return 0
+
+
 # =====================================================
 # ENTRY POINT
 # =====================================================
@@ -310,4 +420,6 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_admin_command(sys.argv[1:]))
     main()
@@ -6,6 +6,7 @@ Bu servis:
 - Son 7 gün aktivitesini çıkarır
 - Genel kullanıcı istatistiklerini üretir
 - SADECE OKUMA yapar (storage write YOK)
+- Kayıtları storage.iter_* ile stream eder (tablolar liste olarak yüklenmez)
 
 Not:
 - report_service read-only olmalı; create/update/delete çağırmaz.
@@ -15,10 +16,11 @@ from datetime import date, timedelta
 
 from auth import get_current_user
 from storage import (
-    get_all_cards,
-    get_all_decks,
-    get_reviews,
-    get_srs_state_by_card,
+    iter_decks,
+    iter_cards,
+    iter_reviews,
+    get_card_by_id,
+    get_due_card_ids,
 )
 
 # ============================================
@@ -36,31 +38,19 @@ def _get_user_deck_ids(user_id: int) -> set[int]:
     """
     Verilen kullanıcıya ait deck id setini döndürür.
     """
-    return {d["id"] for d in get_all_decks() if d["user_id"] == user_id}
+    return {d["id"] for d in iter_decks(user_id)}
 
 
 def _get_due_cards_for_user_id(user_id: int) -> list:
     """
     İç kullanım: Parametre olarak verilen kullanıcı için due kartları döndürür.
     """
-    today = date.today().isoformat()
-    due_cards: list = []
+    # Due id'leri due index'inden; sadece due kartlar id ile okunur
+    # (kullanıcının tüm kartları taranmaz)
+    due_ids = get_due_card_ids(user_id, date.today())
 
-    user_deck_ids = _get_user_deck_ids(user_id)
-
-    for card in get_all_cards():
-        if card["deck_id"] not in user_deck_ids:
-            continue
-
-        state = get_srs_state_by_card(card["id"])
-
-        if not state:
-            continue
-
-        if state["due_date"] <= today:
-            due_cards.append(card)
-
-    return due_cards
+    due_cards = (get_card_by_id(card_id) for card_id in sorted(due_ids))
+    return [card for card in due_cards if card is not None]
 
 
 # ============================================
@@ -105,10 +95,7 @@ def get_last_7_days_activity_for_current_user() -> dict:
 
     activity: dict = {}
 
-    for r in get_reviews():
-        if r["user_id"] != user["id"]:
-            continue
-
+    for r in iter_reviews(user["id"]):
         review_date = date.fromisoformat(r["reviewed_at"][:10])
         if start_date <= review_date <= today:
             key = review_date.isoformat()
@@ -129,17 +116,20 @@ def get_user_stats_for_current_user() -> dict:
     if not user:
         raise RuntimeError(ERR_USER_NOT_LOGGED_IN)
 
-    decks = [d for d in get_all_decks() if d["user_id"] == user["id"]]
-    deck_ids = {d["id"] for d in decks}
+    deck_ids = _get_user_deck_ids(user["id"])
+    total_cards = sum(1 for _ in iter_cards(deck_ids))
 
-    cards = [c for c in get_all_cards() if c["deck_id"] in deck_ids]
-    reviews = [r for r in get_reviews() if r["user_id"] == user["id"]]
+    total_reviews = 0
+    quality_sum = 0
+    for r in iter_reviews(user["id"]):
+        total_reviews += 1
+        quality_sum += r["quality"]
 
-    avg_quality = (sum(r["quality"] for r in reviews) / len(reviews)) if reviews else 0
+    avg_quality = (quality_sum / total_reviews) if total_reviews else 0
 
     return {
-        "total_decks": len(decks),
-        "total_cards": len(cards),
-        "total_reviews": len(reviews),
+        "total_decks": len(deck_ids),
+        "total_cards": total_cards,
+        "total_reviews": total_reviews,
         "average_quality": round(avg_quality, 2),
     }
@@ -0,0 +1,721 @@
+"""
+============================================
+StudyBuddy - SQLite Storage Backend
+============================================
+
+Bu dosya:
+- storage.py ile AYNI fonksiyon yüzeyini stdlib sqlite3 üzerinde uygular
+- config.STORAGE_BACKEND = "sqlite" iken storage.py bu fonksiyonları export eder
+  (servis katmanı hiçbir değişiklik yapmadan SQLite ile çalışır)
+- JSON dosyalarından tek seferlik migration sağlar (migrate_json_to_sqlite)
+- transaction() ile birden fazla yazımı tek SQLite transaction'ında commit eder
+
+Tasarım:
+- WAL modu: okuyucular yazıcıyı beklemez, commit başına tek fsync
+  (config.DURABILITY -> PRAGMA synchronous: FULL / NORMAL / OFF)
+- Index'ler: users.email (unique), decks.user_id, cards.deck_id,
+  srs_state.card_id, srs_state(user_id, due_date), reviews.card_id, reviews.user_id
+- Foreign key constraint YOK: JSON backend'i gibi state/review kayıtları
+  kart olmadan da yazılabilir; cascade silme burada açıkça yapılır.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from config import SQLITE_FILE, DURABILITY
+
+# =====================================================
+# SCHEMA
+# =====================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id            INTEGER PRIMARY KEY,
+    email         TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    password_salt TEXT NOT NULL,
+    name          TEXT NOT NULL,
+    created_at    TEXT
+);
+
+CREATE TABLE IF NOT EXISTS decks (
+    id      INTEGER PRIMARY KEY,
+    name    TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    version INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_decks_user_id ON decks (user_id);
+
+CREATE TABLE IF NOT EXISTS cards (
+    id         INTEGER PRIMARY KEY,
+    deck_id    INTEGER NOT NULL,
+    front      TEXT NOT NULL,
+    back       TEXT NOT NULL,
+    created_at TEXT,
+    version    INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_cards_deck_id ON cards (deck_id);
+
+CREATE TABLE IF NOT EXISTS srs_state (
+    id              INTEGER PRIMARY KEY,
+    user_id         INTEGER NOT NULL,
+    card_id         INTEGER NOT NULL,
+    repetition      INTEGER NOT NULL,
+    interval_days   INTEGER NOT NULL,
+    easiness_factor REAL NOT NULL,
+    due_date        TEXT NOT NULL,
+    created_at      TEXT,
+    updated_at      TEXT,
+    version         INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_srs_state_card_id ON srs_state (card_id);
+CREATE INDEX IF NOT EXISTS idx_srs_state_user_due ON srs_state (user_id, due_date);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    id          INTEGER PRIMARY KEY,
+    user_id     INTEGER NOT NULL,
+    card_id     INTEGER NOT NULL,
+    quality     INTEGER NOT NULL,
+    reviewed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_card_id ON reviews (card_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_user_id ON reviews (user_id);
+"""
+
+# Tablo -> kolonlar (JSON kayıtlarıyla aynı alan adları ve sırası)
+_COLUMNS = {
+    "users": ("id", "email", "password_hash", "password_salt", "name", "created_at"),
+    "decks": ("id", "name", "user_id", "version"),
+    "cards": ("id", "deck_id", "front", "back", "created_at", "version"),
+    "srs_state": (
+        "id", "user_id", "card_id", "repetition", "interval_days",
+        "easiness_factor", "due_date", "created_at", "updated_at", "version",
+    ),
+    "reviews": ("id", "user_id", "card_id", "quality", "reviewed_at"),
+}
+
+# JSON'da sadece varsa bulunan alanlar (NULL ise dict'e konmaz)
+# (version: eski JSON kayıtlarında yoktur, NULL = version 0)
+_OPTIONAL_COLUMNS = {"updated_at", "version"}
+
+# Sonradan eklenen kolonlar: eski veritabanlarına ALTER TABLE ile eklenir
+_ADDED_COLUMNS = {
+    "decks": ("version INTEGER",),
+    "cards": ("version INTEGER",),
+    "srs_state": ("version INTEGER",),
+}
+
+# IN (...) sorgularında tek seferde gönderilen en fazla id
+# (eski SQLite sürümlerinde parametre limiti 999)
+_ID_CHUNK = 500
+
+# config.DURABILITY -> PRAGMA synchronous
+# (WAL + NORMAL: commit'ler fsync'siz, checkpoint'te toplu fsync = group commit)
+_SYNCHRONOUS = {"strict": "FULL", "batched": "NORMAL", "none": "OFF"}
+
+# =====================================================
+# CONNECTION
+# =====================================================
+
+_connection: Optional[sqlite3.Connection] = None
+
+
+def _conn() -> sqlite3.Connection:
+    """
+    PRIVATE: Process başına tek bağlantı (lazy).
+    """
+    global _connection
+    if _connection is None:
+        Path(SQLITE_FILE).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(SQLITE_FILE))
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={_synchronous(DURABILITY)}")
+        conn.executescript(_SCHEMA)
+        _add_missing_columns(conn)
+        _connection = conn
+    return _connection
+
+
+def _add_missing_columns(conn: sqlite3.Connection) -> None:
+    """
+    PRIVATE: Şemadan önce oluşturulmuş tablolara eksik kolonları ekler.
+    """
+    for table, definitions in _ADDED_COLUMNS.items():
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for definition in definitions:
+            if definition.split()[0] not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {definition}")
+
+
+def _synchronous(durability: str) -> str:
+    """
+    PRIVATE: Durability modunu PRAGMA synchronous değerine çevirir.
+    """
+    if durability not in _SYNCHRONOUS:
+        raise ValueError(f"Unknown durability mode: {durability}")
+    return _SYNCHRONOUS[durability]
+
+
+def _reset_storage_cache() -> None:
+    """
+    SADECE TESTLER İÇİN!
+    Açık bağlantıyı kapatır (veri dosyası testler arasında silinebilir).
+    """
+    global _connection
+    if _connection is not None:
+        _connection.close()
+        _connection = None
+
+
+# Açık transaction var mı? (iç içe transaction'lar dıştakine katılır)
+_in_transaction = False
+
+
+@contextmanager
+def transaction(durability: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Birden fazla yazımı tek SQLite transaction'ında toplar.
+
+    - Blok başarıyla biterse COMMIT (tek fsync), exception'da ROLLBACK
+    - Blok içindeki okumalar aynı bağlantıdan yapıldığı için
+      commit edilmemiş değişiklikleri görür
+    - İç içe transaction'lar dıştakine katılır
+    - durability verilirse bu commit için PRAGMA synchronous ezilir
+    """
+    global _in_transaction
+    synchronous = _synchronous(durability) if durability is not None else None
+    conn = _conn()
+    if _in_transaction:
+        yield conn
+        return
+
+    if synchronous is not None:
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+    _in_transaction = True
+    try:
+        with conn:
+            yield conn
+    finally:
+        _in_transaction = False
+        if synchronous is not None:
+            conn.execute(f"PRAGMA synchronous={_synchronous(DURABILITY)}")
+
+
+@contextmanager
+def write_back() -> Iterator[None]:
+    """
+    Blok içindeki yazımlar tek transaction'da, blok sonunda bir kez commit edilir.
+    (SQLite sayfa cache'i zaten write-back çalışır; ayrı bir buffer gerekmez.)
+    """
+    with transaction():
+        yield
+
+
+def flush() -> int:
+    """
+    JSON backend'indeki flush() karşılığı: commit'ler zaten yazılmıştır.
+    """
+    return 0
+
+
+def sync_pending_writes() -> None:
+    """
+    "batched" (synchronous=NORMAL) modda WAL'daki commit'leri diske indirir.
+    """
+    if _connection is not None:
+        _connection.execute("PRAGMA wal_checkpoint(FULL)")
+
+
+def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+    """
+    PRIVATE: sqlite3.Row -> JSON backend'iyle aynı şekilde dict.
+    """
+    if row is None:
+        return None
+    return {
+        key: row[key]
+        for key in row.keys()
+        if not (key in _OPTIONAL_COLUMNS and row[key] is None)
+    }
+
+
+def _fetch_all(sql: str, params: tuple = ()) -> List[Dict]:
+    return [_to_dict(row) for row in _conn().execute(sql, params)]
+
+
+def _fetch_one(sql: str, params: tuple = ()) -> Optional[Dict]:
+    return _to_dict(_conn().execute(sql, params).fetchone())
+
+
+def _fetch_page(
+    table: str,
+    column: str,
+    value: int,
+    limit: int,
+    offset: int,
+    after_id: Optional[int],
+) -> List[Dict]:
+    """
+    PRIVATE: column = value kayıtlarından tek sayfa (id sırasıyla).
+    after_id cursor'ı verilirse index üzerinden doğrudan o id'den sonrası okunur.
+    """
+    if limit < 0 or offset < 0:
+        raise ValueError("limit and offset must be non-negative")
+    return _fetch_all(
+        f"SELECT * FROM {table} WHERE {column} = ? AND id > ? ORDER BY id LIMIT ? OFFSET ?",
+        (value, after_id if after_id is not None else -1, limit, offset),
+    )
+
+
+def _insert(table: str, record: Dict) -> Dict:
+    """
+    PRIVATE: Kaydı ekler; id verilmemişse SQLite max(id)+1 atar
+    (JSON backend'indeki get_next_id ile aynı davranış).
+    """
+    columns = [c for c in _COLUMNS[table] if c in record]
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    with transaction() as conn:
+        cursor = conn.execute(sql, tuple(record[c] for c in columns))
+    return {"id": cursor.lastrowid, **record}
+
+
+def _replace_all(table: str, records: list) -> None:
+    """
+    PRIVATE: Tablonun içeriğini tek transaction'da verilen liste ile değiştirir.
+    """
+    columns = _COLUMNS[table]
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    with transaction() as conn:
+        conn.execute(f"DELETE FROM {table}")
+        conn.executemany(sql, [tuple(r.get(c) for c in columns) for r in records])
+
+
+def _update(
+    table: str,
+    record_id: int,
+    updates: Dict,
+    expected_version: Optional[int] = None,
+) -> None:
+    """
+    PRIVATE: Verilen alanları günceller. Şemada olmayan alan ValueError'dır.
+
+    version kolonu olan tablolarda version her update'te artırılır;
+    expected_version verilmiş ve kayıt başka version'daysa RuntimeError.
+    """
+    versioned = "version" in _COLUMNS[table]
+    updates = {c: v for c, v in updates.items() if not (versioned and c == "version")}
+    unknown = set(updates) - set(_COLUMNS[table])
+    if unknown:
+        raise ValueError(f"Unknown {table} fields: {', '.join(sorted(unknown))}")
+
+    assignments = [f"{c} = ?" for c in updates]
+    params: list = list(updates.values())
+    if versioned:
+        assignments.append("version = COALESCE(version, 0) + 1")
+    if not assignments:
+        return
+
+    sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE id = ?"
+    params.append(record_id)
+    if expected_version is not None:
+        sql += " AND COALESCE(version, 0) = ?"
+        params.append(expected_version)
+
+    with transaction() as conn:
+        if not conn.execute(sql, params).rowcount and expected_version is not None:
+            raise RuntimeError("Version conflict")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def initialize_storage() -> None:
+    """
+    Veritabanı dosyasını ve şemayı oluşturur.
+    """
+    _conn()
+
+# =====================================================
+# USERS
+# =====================================================
+
+def load_users() -> List[Dict]:
+    return _fetch_all("SELECT * FROM users ORDER BY id")
+
+
+def save_users(users: list) -> None:
+    _replace_all("users", users)
+
+
+def get_user_by_email(email: str) -> Optional[Dict]:
+    return _fetch_one("SELECT * FROM users WHERE email = ?", (email,))
+
+
+def get_user_by_id(user_id: int) -> Optional[Dict]:
+    return _fetch_one("SELECT * FROM users WHERE id = ?", (user_id,))
+
+
+def create_user(data: Dict) -> Dict:
+    """
+    Yeni user kaydı oluşturur (email unique).
+    """
+    if get_user_by_email(data["email"]):
+        raise ValueError("Email already registered")
+
+    return _insert("users", {
+        "email": data["email"],
+        "password_hash": data["password_hash"],
+        "password_salt": data["password_salt"],
+        "name": data["name"],
+        "created_at": _now(),
+    })
+
+# =====================================================
+# DECKS
+# =====================================================
+
+def load_decks() -> List[Dict]:
+    return _fetch_all("SELECT * FROM decks ORDER BY id")
+
+
+def save_decks(decks: list) -> None:
+    _replace_all("decks", decks)
+
+
+def create_deck(data: Dict) -> Dict:
+    return _insert("decks", {"name": data["name"], "user_id": data["user_id"], "version": 1})
+
+
+def get_decks_by_user(user_id: int) -> List[Dict]:
+    return _fetch_all("SELECT * FROM decks WHERE user_id = ? ORDER BY id", (user_id,))
+
+
+def get_decks_by_user_page(
+    user_id: int,
+    limit: int,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Dict]:
+    return _fetch_page("decks", "user_id", user_id, limit, offset, after_id)
+
+
+def get_deck_by_id(deck_id: int) -> Optional[Dict]:
+    return _fetch_one("SELECT * FROM decks WHERE id = ?", (deck_id,))
+
+
+def delete_deck(deck_id: int) -> bool:
+    """
+    Deck siler.
+    Cascade: kartlar + kartlara bağlı SRS state ve review'lar (tek transaction).
+    """
+    with transaction() as conn:
+        deleted = conn.execute("DELETE FROM decks WHERE id = ?", (deck_id,)).rowcount
+        if not deleted:
+            return False
+        card_ids = "SELECT id FROM cards WHERE deck_id = ?"
+        conn.execute(f"DELETE FROM srs_state WHERE card_id IN ({card_ids})", (deck_id,))
+        conn.execute(f"DELETE FROM reviews WHERE card_id IN ({card_ids})", (deck_id,))
+        conn.execute("DELETE FROM cards WHERE deck_id = ?", (deck_id,))
+    return True
+
+# =====================================================
+# CARDS
+# =====================================================
+
+def load_cards() -> List[Dict]:
+    return _fetch_all("SELECT * FROM cards ORDER BY id")
+
+
+def save_cards(cards: list) -> None:
+    _replace_all("cards", cards)
+
+
+def get_card_by_id(card_id: int) -> Optional[Dict]:
+    return _fetch_one("SELECT * FROM cards WHERE id = ?", (card_id,))
+
+
+def get_cards_by_deck(deck_id: int) -> List[Dict]:
+    return _fetch_all("SELECT * FROM cards WHERE deck_id = ? ORDER BY id", (deck_id,))
+
+
+def get_cards_by_decks(deck_ids) -> List[Dict]:
+    """
+    Birden fazla deck'in kartlarını tek sorguda döndürür (deck id'leri parça parça).
+    """
+    ids = list(dict.fromkeys(deck_ids))
+    cards: List[Dict] = []
+    for start in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[start:start + _ID_CHUNK]
+        marks = ", ".join("?" for _ in chunk)
+        cards += _fetch_all(f"SELECT * FROM cards WHERE deck_id IN ({marks}) ORDER BY id", tuple(chunk))
+    return cards
+
+
+def get_cards_by_deck_page(
+    deck_id: int,
+    limit: int,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Dict]:
+    return _fetch_page("cards", "deck_id", deck_id, limit, offset, after_id)
+
+
+def create_card(data: Dict) -> Dict:
+    return _insert("cards", {
+        "deck_id": data["deck_id"],
+        "front": data["front"],
+        "back": data["back"],
+        "created_at": _now(),
+        "version": 1,
+    })
+
+
+def update_card(
+    card_id: int,
+    updates: Dict,
+    expected_version: Optional[int] = None,
+) -> Optional[Dict]:
+    """
+    Kartı günceller, güncellenen kartı döndürür. Bulunamazsa None.
+    expected_version tutmazsa RuntimeError("Version conflict").
+    """
+    if get_card_by_id(card_id) is None:
+        return None
+    _update("cards", card_id, updates, expected_version)
+    return get_card_by_id(card_id)
+
+
+def delete_card(card_id: int) -> bool:
+    """
+    Kartı siler.
+    Cascade: SRS state + review kayıtları (tek transaction).
+    """
+    return delete_cards([card_id]) == 1
+
+
+def delete_cards(card_ids) -> int:
+    """
+    Birden fazla kartı set tabanlı cascade ile siler (tek transaction).
+    id'ler SQLite parametre limitine takılmamak için parçalar halinde silinir.
+
+    Returns:
+        int: Silinen kart sayısı
+    """
+    ids = list(dict.fromkeys(card_ids))
+    deleted = 0
+    with transaction() as conn:
+        for start in range(0, len(ids), _ID_CHUNK):
+            chunk = ids[start:start + _ID_CHUNK]
+            marks = ", ".join("?" for _ in chunk)
+            deleted += conn.execute(f"DELETE FROM cards WHERE id IN ({marks})", chunk).rowcount
+            conn.execute(f"DELETE FROM srs_state WHERE card_id IN ({marks})", chunk)
+            conn.execute(f"DELETE FROM reviews WHERE card_id IN ({marks})", chunk)
+    return deleted
+
+# =====================================================
+# SRS STATE
+# =====================================================
+
+def load_srs_states() -> List[Dict]:
+    return _fetch_all("SELECT * FROM srs_state ORDER BY id")
+
+
+def save_srs_states(states: list) -> None:
+    _replace_all("srs_state", states)
+
+
+def get_srs_state_by_card(card_id: int) -> Optional[Dict]:
+    return _fetch_one(
+        "SELECT * FROM srs_state WHERE card_id = ? ORDER BY id LIMIT 1", (card_id,)
+    )
+
+
+def create_srs_state(data: Dict) -> Dict:
+    return _insert("srs_state", {
+        "user_id": data["user_id"],
+        "card_id": data["card_id"],
+        "repetition": data["repetition"],
+        "interval_days": data["interval_days"],
+        "easiness_factor": data["easiness_factor"],
+        "due_date": data["due_date"],
+        "created_at": _now(),
+        "version": 1,
+    })
+
+
+def update_srs_state(
+    state_id: int,
+    new_data: Dict,
+    expected_version: Optional[int] = None,
+) -> None:
+    """
+    Mevcut SRS state'i günceller. Bulunamazsa ValueError.
+    expected_version tutmazsa RuntimeError("Version conflict").
+    """
+    if _fetch_one("SELECT id FROM srs_state WHERE id = ?", (state_id,)) is None:
+        raise ValueError("SRS state not found")
+    _update("srs_state", state_id, {**new_data, "updated_at": _now()}, expected_version)
+
+
+def get_due_card_ids(user_id: int, today) -> set:
+    """
+    Kullanıcının due kart id'leri (idx_srs_state_user_due index'i ile).
+    """
+    rows = _conn().execute(
+        "SELECT card_id FROM srs_state WHERE user_id = ? AND due_date <= ?",
+        (user_id, today.isoformat()),
+    )
+    return {row["card_id"] for row in rows}
+
+
+def get_scheduled_card_ids(user_id: int) -> set:
+    rows = _conn().execute("SELECT card_id FROM srs_state WHERE user_id = ?", (user_id,))
+    return {row["card_id"] for row in rows}
+
+# =====================================================
+# REVIEWS
+# =====================================================
+
+def load_reviews() -> List[Dict]:
+    return _fetch_all("SELECT * FROM reviews ORDER BY id")
+
+
+def save_reviews(reviews: list) -> None:
+    _replace_all("reviews", reviews)
+
+
+def create_review(data: Dict) -> Dict:
+    return _insert("reviews", {
+        "user_id": data["user_id"],
+        "card_id": data["card_id"],
+        "quality": data["quality"],
+        "reviewed_at": data["reviewed_at"],
+    })
+
+# =====================================================
+# STREAMING READERS
+# =====================================================
+
+def _iter_rows(sql: str, params: tuple = ()) -> Iterator[Dict]:
+    """
+    PRIVATE: Sorgu sonucunu cursor üzerinden satır satır üretir.
+    """
+    for row in _conn().execute(sql, params):
+        yield _to_dict(row)
+
+
+def _iter_where_in(table: str, column: str, values) -> Iterator[Dict]:
+    """
+    PRIVATE: column IN (values) filtresiyle stream eder (parçalar halinde).
+    """
+    values = sorted(set(values))
+    for start in range(0, len(values), _ID_CHUNK):
+        chunk = values[start:start + _ID_CHUNK]
+        marks = ", ".join("?" for _ in chunk)
+        yield from _iter_rows(
+            f"SELECT * FROM {table} WHERE {column} IN ({marks}) ORDER BY id", tuple(chunk)
+        )
+
+
+def iter_decks(user_id: Optional[int] = None) -> Iterator[Dict]:
+    if user_id is None:
+        return _iter_rows("SELECT * FROM decks ORDER BY id")
+    return _iter_rows("SELECT * FROM decks WHERE user_id = ? ORDER BY id", (user_id,))
+
+
+def iter_cards(deck_ids=None) -> Iterator[Dict]:
+    if deck_ids is None:
+        return _iter_rows("SELECT * FROM cards ORDER BY id")
+    return _iter_where_in("cards", "deck_id", deck_ids)
+
+
+def iter_srs_states(card_ids=None) -> Iterator[Dict]:
+    if card_ids is None:
+        return _iter_rows("SELECT * FROM srs_state ORDER BY id")
+    return _iter_where_in("srs_state", "card_id", card_ids)
+
+
+def iter_reviews(user_id: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Review'ları cursor üzerinden stream eder.
+    """
+    if user_id is None:
+        return _iter_rows("SELECT * FROM reviews ORDER BY id")
+    return _iter_rows("SELECT * FROM reviews WHERE user_id = ? ORDER BY id", (user_id,))
+
+# =====================================================
+# READ-ONLY HELPERS (SERVICE LAYER)
+# =====================================================
+
+def get_all_cards() -> list:
+    return load_cards()
+
+
+def get_all_decks() -> list:
+    return load_decks()
+
+
+def get_reviews() -> list:
+    return load_reviews()
+
+# =====================================================
+# MIGRATION (JSON -> SQLITE)
+# =====================================================
+
+def migrate_json_to_sqlite() -> Dict[str, int]:
+    """
+    data/ altındaki JSON tablolarını SQLite veritabanına kopyalar.
+
+    - JSON tarafı storage.load_* ile okunur (journal dahil güncel hal;
+      shard düzeninde tüm kullanıcı shard'ları, users.json global)
+    - id'ler korunur; tek transaction, tekrar çalıştırılabilir (INSERT OR REPLACE)
+    - JSON dosyalarına dokunulmaz
+    - STORAGE_BACKEND hâlâ "json" iken çalıştırılmalıdır (load_* aksi halde
+      SQLite'ı okur)
+
+    Returns:
+        dict: tablo adı -> kopyalanan kayıt sayısı
+
+    Raises:
+        RuntimeError: STORAGE_BACKEND zaten "sqlite" ise
+    """
+    # storage bu modülü import ettiği için burada (lazy) import edilir
+    import storage
+
+    if storage.STORAGE_BACKEND == "sqlite":
+        raise RuntimeError('Set STORAGE_BACKEND = "json" before migrating JSON data to SQLite')
+
+    storage.migrate_reviews_to_log()
+    loaders = {
+        "users": storage.load_users,
+        "decks": storage.load_decks,
+        "cards": storage.load_cards,
+        "srs_state": storage.load_srs_states,
+        "reviews": storage.load_reviews,
+    }
+
+    counts: Dict[str, int] = {}
+    with transaction() as conn:
+        for table, load in loaders.items():
+            records = load()
+            columns = _COLUMNS[table]
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [tuple(r.get(c) for c in columns) for r in records],
+            )
+            counts[table] = len(records)
+    return counts
@@ -0,0 +1,315 @@
+"""
+StudyBuddy - SRS Scheduling Engine
+
+Bu dosya:
+- SM-2 (sadeleştirilmiş) adımının TEK tanımını içerir (sm2_step)
+- Aynı adımı state / quality dizilerine toplu uygular (sm2_batch):
+  toplu yeniden planlama, replay ve simülasyonlar için
+- NumPy kuruluysa vektörel çalışır, değilse sm2_step'i döngüde çağırır
+- Algoritmalar isimle kaydedilir (register_algorithm); aktif olan
+  config.SRS_ALGORITHM'dir
+- Review'ların TEK persistence yolunu içerir (apply_reviews): srs_service
+  ve review_service state / review yazımını buraya devreder
+
+❗ NOT:
+Vektörel sonuçlar skaler yolla BİT BİT aynıdır: EF formülü aynı işlem
+sırasıyla float64'te hesaplanır, MIN_EF clamp'i np.maximum ile,
+int(interval * ef) kesmesi np.trunc ile yapılır.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+from config import INITIAL_EF, MIN_EF, FIRST_INTERVAL, SECOND_INTERVAL, SRS_ALGORITHM
+from storage import (
+    get_srs_state_by_card,
+    create_srs_state,
+    update_srs_state,
+    create_review,
+    transaction,
+)
+
+# Opsiyonel: dizi üzerinde vektörel SM-2
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - ortama bağlı
+    np = None
+
+
+# ============================================
+# SCALAR
+# ============================================
+
+def sm2_step(
+    repetition: int,
+    interval_days: int,
+    easiness_factor: float,
+    quality: int,
+    is_new: bool = False,
+) -> tuple[int, int, float]:
+    """
+    Tek kart için SM-2 adımı.
+
+    Args:
+        repetition / interval_days / easiness_factor: Mevcut state
+            (is_new ise yok sayılır)
+        quality: 0-5 arası kalite puanı (doğrulanmış olmalı)
+        is_new: Kart hiç çalışılmamışsa True
+
+    Returns:
+        tuple: (repetition, interval_days, easiness_factor)
+    """
+    if is_new:
+        # İlk kez çalışılıyorsa
+        return 1, FIRST_INTERVAL, INITIAL_EF
+
+    # Easiness factor güncelle (SM-2 sadeleştirilmiş)
+    ef = max(
+        MIN_EF,
+        easiness_factor
+        + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    )
+
+    if quality < 3:
+        # Başarısız → sıfırdan
+        return 1, FIRST_INTERVAL, ef
+
+    # Başarılı → aralığı büyüt
+    repetition += 1
+    if repetition == 2:
+        return repetition, SECOND_INTERVAL, ef
+    return repetition, int(interval_days * ef), ef
+
+
+# ============================================
+# BATCH
+# ============================================
+
+def sm2_batch(
+    repetition,
+    interval_days,
+    easiness_factor,
+    quality,
+    is_new=None,
+    use_numpy: bool | None = None,
+) -> tuple[list, list, list]:
+    """
+    sm2_step'i eşit uzunluktaki dizilerin her elemanına uygular.
+
+    Args:
+        repetition / interval_days / easiness_factor / quality: Diziler
+        is_new: Hiç çalışılmamış kartlar için True (verilmezse hepsi False);
+            bu kartların state değerleri yok sayılır (0 / INITIAL_EF verilebilir)
+        use_numpy: None ise NumPy varsa kullanılır; False skaler yolu zorlar
+
+    Returns:
+        tuple: (repetitions, intervals, easiness_factors) - düz Python
+        listeleri (int / float), sm2_step'in döndürdükleriyle aynı değerler
+
+    Raises:
+        ValueError: Dizi uzunlukları farklıysa
+        RuntimeError: use_numpy=True verilip NumPy kurulu değilse
+    """
+    columns = [list(repetition), list(interval_days), list(easiness_factor), list(quality)]
+    columns.append(list(is_new) if is_new is not None else [False] * len(columns[0]))
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("All input sequences must have the same length")
+
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed")
+
+    if not use_numpy:
+        steps = [sm2_step(*row) for row in zip(*columns)]
+        if not steps:
+            return [], [], []
+        reps, intervals, efs = zip(*steps)
+        return list(reps), list(intervals), list(efs)
+
+    return _sm2_numpy(*columns)
+
+
+def _sm2_numpy(repetition, interval_days, easiness_factor, quality, is_new) -> tuple[list, list, list]:
+    """
+    PRIVATE: sm2_step'in NumPy karşılığı (işlem sırası skaler formülle aynı).
+    """
+    rep = np.asarray(repetition, dtype=np.int64)
+    interval = np.asarray(interval_days, dtype=np.int64)
+    quality = np.asarray(quality, dtype=np.int64)
+    new = np.asarray(is_new, dtype=bool)
+    # Yeni kartların EF'i hesaba girmesin (None / NaN olabilir)
+    ef = np.where(new, INITIAL_EF, np.asarray(easiness_factor, dtype=np.float64))
+
+    miss = 5 - quality
+    ef = np.maximum(MIN_EF, ef + (0.1 - miss * (0.08 + miss * 0.02)))
+
+    passed = quality >= 3
+    rep = np.where(passed, rep + 1, 1)
+    grown = np.trunc(interval * ef).astype(np.int64)
+    interval = np.where(passed, np.where(rep == 2, SECOND_INTERVAL, grown), FIRST_INTERVAL)
+
+    rep = np.where(new, 1, rep)
+    interval = np.where(new, FIRST_INTERVAL, interval)
+    ef = np.where(new, INITIAL_EF, ef)
+    return rep.tolist(), interval.tolist(), ef.tolist()
+
+
+# ============================================
+# ALGORITHMS (pluggable)
+# ============================================
+
+# isim -> (step, batch)
+# - step(repetition, interval_days, easiness_factor, quality, is_new)
+#   -> (repetition, interval_days, easiness_factor)
+# - batch aynı argümanları dizi olarak alır ve üç liste döndürür
+#   (None ise step döngüde çağrılır)
+_ALGORITHMS: dict = {}
+
+
+def register_algorithm(name: str, step, batch=None) -> None:
+    """
+    Scheduling algoritması kaydeder (aynı isim varsa ezilir).
+    config.SRS_ALGORITHM = name ile aktif edilir.
+    """
+    _ALGORITHMS[name] = (step, batch)
+
+
+def get_algorithm(name: str | None = None) -> tuple:
+    """
+    Kayıtlı algoritmanın (step, batch) ikilisini döndürür.
+    name verilmezse config.SRS_ALGORITHM kullanılır.
+
+    Raises:
+        ValueError: Algoritma kayıtlı değilse
+    """
+    name = name or SRS_ALGORITHM
+    if name not in _ALGORITHMS:
+        raise ValueError(f"Unknown SRS algorithm: {name}")
+    return _ALGORITHMS[name]
+
+
+register_algorithm("sm2", sm2_step, sm2_batch)
+
+
+def schedule_states(states: list, qualities: list, algorithm: str | None = None) -> tuple[list, list, list]:
+    """
+    SRS state dict'leri (hiç çalışılmamış kart için None) için bir sonraki
+    (repetitions, intervals, easiness_factors) listelerini hesaplar.
+    """
+    step, batch = get_algorithm(algorithm)
+
+    new = [state is None for state in states]
+    reps = [0 if state is None else state["repetition"] for state in states]
+    intervals = [0 if state is None else state["interval_days"] for state in states]
+    efs = [INITIAL_EF if state is None else state["easiness_factor"] for state in states]
+
+    if batch is not None:
+        return batch(reps, intervals, efs, qualities, new)
+
+    steps = [step(*row) for row in zip(reps, intervals, efs, qualities, new)]
+    if not steps:
+        return [], [], []
+    reps, intervals, efs = zip(*steps)
+    return list(reps), list(intervals), list(efs)
+
+
+# ============================================
+# PERSISTENCE (tek yol)
+# ============================================
+
+def _reviewed_at(value) -> tuple[str, date]:
+    """
+    PRIVATE: reviewed_at değerini (ISO str / datetime / date / None)
+    saklanacak ISO str ve due_date'in hesaplanacağı güne çevirir.
+
+    None: zaman damgası UTC "şimdi", gün ise repo'nun geri kalanı gibi
+    yerel date.today() (gece yarısı civarında UTC günü farklı olabilir).
+    """
+    if value is None:
+        return datetime.now(timezone.utc).isoformat(), date.today()
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+
+    day = value.date() if isinstance(value, datetime) else value
+    return value.isoformat(), day
+
+
+def apply_reviews(user_id: int, reviews, algorithm: str | None = None) -> tuple[list, list]:
+    """
+    Review'ları planlar ve TEK commit'te kalıcı hale getirir.
+    Kart varlığı / sahipliği çağıran servis tarafından doğrulanmış olmalıdır.
+
+    Args:
+        user_id: Review'ları yapan kullanıcı
+        reviews: [(card_id, quality, reviewed_at), ...]
+            reviewed_at ISO str / datetime / date / None (şimdi; gün
+            date.today()) olabilir; due_date bu günden hesaplanır. Aynı kart birden fazla kez
+            verilebilir (sırayla uygulanır).
+        algorithm: Kayıtlı algoritma adı (None: config.SRS_ALGORITHM)
+
+    Akış:
+    1) Quality'ler yazımdan ÖNCE doğrulanır
+    2) Tur n = her kartın n. review'u; aynı kartın review'ları turlar boyunca
+       zincirlenir, bir turdaki kartlar algoritmanın batch'iyle tek seferde hesaplanır
+    3) Kart başına bir state yazımı (version kontrollü) + tüm review'lar tek transaction
+
+    Returns:
+        tuple: (güncel state'ler - kartların ilk geçiş sırasıyla,
+                oluşturulan review kayıtları - verilen sırayla)
+
+    Raises:
+        ValueError: quality aralık dışıysa / algoritma kayıtlı değilse
+    """
+    entries = []
+    for card_id, quality, reviewed_at in reviews:
+        if quality < 0 or quality > 5:
+            raise ValueError("Quality must be between 0 and 5")
+        entries.append((card_id, quality, *_reviewed_at(reviewed_at)))
+
+    card_ids = list(dict.fromkeys(entry[0] for entry in entries))
+    stored = {card_id: get_srs_state_by_card(card_id) for card_id in card_ids}
+    current = dict(stored)
+
+    rounds: list = []
+    seen: dict = {}
+    for entry in entries:
+        n = seen[entry[0]] = seen.get(entry[0], -1) + 1
+        if n == len(rounds):
+            rounds.append([])
+        rounds[n].append(entry)
+
+    for round_entries in rounds:
+        reps, intervals, efs = schedule_states(
+            [current[entry[0]] for entry in round_entries],
+            [entry[1] for entry in round_entries],
+            algorithm,
+        )
+        for (card_id, _, _, day), repetition, interval_days, ef in zip(round_entries, reps, intervals, efs):
+            current[card_id] = {
+                "user_id": user_id,
+                "card_id": card_id,
+                "repetition": repetition,
+                "interval_days": interval_days,
+                "easiness_factor": ef,
+                "due_date": (day + timedelta(days=interval_days)).isoformat(),
+            }
+
+    created = []
+    with transaction():
+        for card_id in card_ids:
+            state = stored[card_id]
+            if state:
+                # Okunduktan sonra başka oturum güncellediyse hata (lost update yok)
+                update_srs_state(state["id"], current[card_id], expected_version=state.get("version", 0))
+            else:
+                create_srs_state(current[card_id])
+
+        for card_id, quality, reviewed_at, _ in entries:
+            created.append(create_review({
+                "user_id": user_id,
+                "card_id": card_id,
+                "quality": quality,
+                "reviewed_at": reviewed_at,
+            }))
+
+    return [get_srs_state_by_card(card_id) for card_id in card_ids], created
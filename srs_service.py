@@ -3,25 +3,23 @@ StudyBuddy - SRS (Spaced Repetition) Service
 
 Bu dosya:
 - Login olan kullanıcının due kartlarını getirir
-- SM-2 algoritmasının sadeleştirilmiş bir versiyonunu uygular
-- Review ve SRS state kayıtlarını oluşturur
+- Review'ları srs_engine'e (scheduling + tek persistence yolu) devreder
 - CLI üzerinden Study Today akışını yönetir
 """
 
-from datetime import date, timedelta
+from datetime import date
 
 from auth import get_current_user
 from storage import (
-    get_cards_by_deck,
+    get_card_by_id,
+    get_cards_by_decks,
     get_decks_by_user,
-    get_srs_state_by_card,
-    create_srs_state,
-    update_srs_state,
-    create_review,
     get_user_by_id,
+    get_due_card_ids,
+    get_scheduled_card_ids,
 )
 
-from config import INITIAL_EF, MIN_EF, FIRST_INTERVAL, SECOND_INTERVAL
+from srs_engine import apply_reviews
 
 
 # ============================================
@@ -54,74 +52,37 @@ def _process_review(user_id: int, card_id: int, quality: int) -> dict:
     if not user:
         raise ValueError(f"User with id {user_id} not found")
 
-    today = date.today()
-    state = get_srs_state_by_card(card_id)
-
-    # ----------------------------
-    # SRS hesaplama
-    # ----------------------------
-    if not state:
-        # İlk kez çalışılıyorsa
-        repetition = 1
-        interval_days = FIRST_INTERVAL
-        ef = INITIAL_EF
-    else:
-        # Easiness factor güncelle (SM-2 sadeleştirilmiş)
-        ef = max(
-            MIN_EF,
-            state["easiness_factor"]
-            + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
-        )
-
-        if quality < 3:
-            # Başarısız → sıfırdan
-            repetition = 1
-            interval_days = FIRST_INTERVAL
-        else:
-            # Başarılı → aralığı büyüt
-            repetition = state["repetition"] + 1
-            if repetition == 2:
-                interval_days = SECOND_INTERVAL
-            else:
-                interval_days = int(state["interval_days"] * ef)
-
-    due_date = today + timedelta(days=interval_days)
-
-    state_data = {
-        "user_id": user_id,
-        "card_id": card_id,
-        "repetition": repetition,
-        "interval_days": interval_days,
-        "easiness_factor": ef,
-        "due_date": due_date.isoformat(),
-    }
-
-    # ----------------------------
-    # State yaz
-    # ----------------------------
-    if state:
-        update_srs_state(state["id"], state_data)
-    else:
-        create_srs_state(state_data)
-
-    # ----------------------------
-    # Review kaydı yaz
-    # ----------------------------
-    create_review({
-        "user_id": user_id,
-        "card_id": card_id,
-        "quality": quality,
-        "reviewed_at": today.isoformat(),
-    })
-
-    # Güncel state'i geri döndür
-    return get_srs_state_by_card(card_id)
+    # Scheduling + state / review yazımı tek yoldan (srs_engine)
+    states, _ = apply_reviews(user_id, [(card_id, quality, date.today())])
+    return states[0]
 
 
 # ============================================
 # DUE CARDS
 # ============================================
 
+def _get_due_cards_for_user_id(user_id: int, today: date) -> list:
+    """
+    İç kullanım: Kullanıcının due kartlarını set tabanlı tek geçişte bulur.
+
+    - Deck'ler, kartlar ve state id setleri BİRER kez okunur
+      (deck / kart başına storage çağrısı yok)
+    - Kartlar state setleriyle hash join'lenir: O(deck + kart)
+    """
+    deck_ids = [deck["id"] for deck in get_decks_by_user(user_id)]
+    if not deck_ids:
+        return []
+
+    scheduled = get_scheduled_card_ids(user_id)
+    due = get_due_card_ids(user_id, today)
+
+    # Daha önce hiç çalışılmamış → due / Due date gelmiş → due
+    return [
+        card for card in get_cards_by_decks(deck_ids)
+        if card["id"] not in scheduled or card["id"] in due
+    ]
+
+
 def get_due_cards_for_current_user() -> list:
     """
     Login olan kullanıcının bugün çalışması gereken kartları döndürür.
@@ -134,24 +95,7 @@ def get_due_cards_for_current_user() -> list:
     if not user:
         raise RuntimeError("Login required")
 
-    today = date.today().isoformat()
-    due_cards: list = []
-
-    decks = get_decks_by_user(user["id"])
-    for deck in decks:
-        cards = get_cards_by_deck(deck["id"])
-        for card in cards:
-            state = get_srs_state_by_card(card["id"])
-
-            # Daha önce hiç çalışılmamış → due
-            if not state:
-                due_cards.append(card)
-
-            # Due date gelmiş → due
-            elif state["due_date"] <= today:
-                due_cards.append(card)
-
-    return due_cards
+    return _get_due_cards_for_user_id(user["id"], date.today())
 
 
 # ============================================
@@ -180,6 +124,55 @@ def process_review_for_card(card_id: int, quality: int) -> dict:
     return _process_review(user_id=user["id"], card_id=card_id, quality=quality)
 
 
+# ============================================
+# BATCH REVIEW (LOGIN USER)
+# ============================================
+
+def review_cards_batch(reviews) -> list:
+    """
+    Login olan kullanıcının bir oturumdaki tüm cevaplarını tek seferde işler.
+
+    Args:
+        reviews: [(card_id, quality, reviewed_at), ...]
+            reviewed_at ISO str / datetime / date / None (şimdi; gün
+            date.today()) olabilir; due_date bu günden hesaplanır. Aynı kart birden fazla kez
+            verilebilir (sırayla uygulanır).
+
+    Akış:
+    1) Tüm quality'ler ve kart sahipliği yazımdan ÖNCE doğrulanır
+       (kullanıcının deck'leri bir kez okunur)
+    2) srs_engine.apply_reviews: SM-2 memory'de (toplu) hesaplanır, state'ler
+       (kart başına bir yazım) + review'lar tek commit'te yazılır
+
+    Returns:
+        list: Review edilen kartların güncel SRS state'leri (ilk geçiş sırasıyla)
+
+    Raises:
+        RuntimeError: Kullanıcı login değilse
+        ValueError: quality aralık dışıysa / kart bulunamazsa
+        PermissionError: Kart kullanıcıya ait değilse
+    """
+    user = get_current_user()
+    if not user:
+        raise RuntimeError("User not logged in")
+
+    reviews = list(reviews)
+    for _, quality, _ in reviews:
+        if quality < 0 or quality > 5:
+            raise ValueError("Quality must be between 0 and 5")
+
+    owned_decks = {deck["id"] for deck in get_decks_by_user(user["id"])}
+    for card_id in dict.fromkeys(review[0] for review in reviews):
+        card = get_card_by_id(card_id)
+        if not card:
+            raise ValueError("Card not found")
+        if card["deck_id"] not in owned_decks:
+            raise PermissionError("You do not own this card")
+
+    states, _ = apply_reviews(user["id"], reviews)
+    return states
+
+
 # ============================================
 # BACKWARD COMPATIBILITY (TESTLER İÇİN)
 # ============================================
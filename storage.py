@@ -8,6 +8,24 @@ Bu dosya:
 - Atomic write kullanır (yarım yazılma riskini önler)
 - User / Deck / Card / SRS / Review CRUD işlemlerini içerir
 - config.py üzerinden path yönetir (pathlib uyumlu)
+- Okunan tabloları process içinde cache'ler (mtime/size/inode ile doğrulanır)
+- Cache üzerinde hash index'ler tutar (id, email, deck_id, user_id, card_id)
+- Review'ları append-only JSONL log'da tutar (review başına tek satır append)
+- Tablo değişikliklerini write-ahead journal'a ekler, periyodik compaction
+  ile JSON snapshot'lara katlar (yazım maliyeti değişiklik kadar)
+- transaction() ile birden fazla tablodaki değişiklikleri (review log dahil)
+  tek commit'te yazar
+- Yeni id'leri counters.json'daki sayaçlardan blok rezervasyonuyla verir
+- fsync politikası config.DURABILITY ile seçilir (strict / batched / none)
+- Dosyaları kompakt JSON olarak yazar (orjson kuruluysa onunla)
+- Büyük tabloların yanında ikili snapshot tutar (hızlı cold start)
+- Process'ler arası fcntl lock: okumalar shared, load-modify-save dizileri exclusive
+- Deck / card / SRS state kayıtlarında version alanı (optimistic concurrency)
+- Opsiyonel write-back modu: değişiklikler memory'de, flush() ile tablo başına tek yazım
+- Tablo bazında okuma / yazım / parse / fsync metrikleri (JSON / Prometheus export)
+- Opsiyonel per-user shard düzeni (data/users/<id>/) ve id -> shard router'ı
+- SRS state'ler için kullanıcı başına due_date heap'i ile hızlı due sorgusu
+- config.STORAGE_BACKEND = "sqlite" ise aynı API'yi sqlite_storage.py'ye yönlendirir
 
 ÖNEMLİ (Cascade):
 - Bir deck silinince, deck'e bağlı kartlar da silinir.
@@ -18,11 +36,22 @@ Bu dosya:
 from __future__ import annotations
 
 from pathlib import Path
+import atexit
+import bisect
+import functools
+import heapq
+import itertools
 import json
+import marshal
 import os
+import struct
 import tempfile
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+import threading
+import time
+import zlib
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
 
 from config import (
     DATA_DIR,
@@ -31,43 +60,1647 @@ from config import (
     CARDS_FILE,
     SRS_STATE_FILE,
     REVIEWS_FILE,
+    REVIEWS_LOG_FILE,
+    COUNTERS_FILE,
+    ID_BLOCK_SIZE,
+    DURABILITY,
+    DURABILITY_BATCH_MS,
+    DURABILITY_BATCH_WRITES,
+    JSON_CODEC,
+    BINARY_SNAPSHOTS,
+    SNAPSHOT_MIN_BYTES,
+    SHARDED_STORAGE,
+    SHARDS_DIR,
+    ROUTES_DIR,
+    JOURNAL_FILE,
+    JOURNAL_ENABLED,
+    JOURNAL_MAX_BYTES,
+    LOCK_FILE,
+    LOCKING_ENABLED,
+    WRITE_BACK,
+    METRICS_FILE,
+    STORAGE_BACKEND,
 )
 
+# Opsiyonel: process'ler arası dosya lock'u (Windows'ta yok)
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - platforma bağlı
+    fcntl = None
+
+# Opsiyonel hızlı JSON codec (yoksa stdlib json kullanılır)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - ortama bağlı
+    orjson = None
+
+# (eski kayıt, yeni kayıt) çifti:
+# - create: (None, yeni) / update: (eski, yeni) / delete: (eski, None)
+Change = Tuple[Optional[Dict], Optional[Dict]]
+
+# =====================================================
+# IN-PROCESS CACHE
+# =====================================================
+
+class _CacheEntry:
+    """
+    PRIVATE: Bir tablonun memory'deki hali.
+
+    rows:
+    - id -> kayıt (dict sırası = dosya sırası; update pozisyonu korur)
+
+    indexes:
+    - (tür, alan) -> index dict
+    - Entry ile aynı ömre sahiptir; dosya dışarıdan değişirse entry
+      (ve index'leri) çöpe gider, ilk ihtiyaçta yeniden kurulur.
+
+    signature / offset:
+    - Snapshot (veya log) dosyasının imzası
+    - JSONL log'larda parse edilmiş byte sayısı (sonraki okuma buradan devam eder)
+
+    journal / journal_pos:
+    - Görülen journal imzası (inode, size) ve replay edilmiş byte sayısı
+    """
+    __slots__ = ("signature", "rows", "indexes", "offset", "journal", "journal_pos")
+
+    def __init__(self, signature: Optional[tuple], rows: Optional[Dict[int, Dict]] = None):
+        self.signature = signature
+        self.rows: Dict[int, Dict] = rows if rows is not None else {}
+        self.indexes: Dict[Tuple[str, str], dict] = {}
+        self.offset = 0
+        self.journal: Optional[tuple] = None
+        self.journal_pos = 0
+
+
+# path -> _CacheEntry
+_CACHE: Dict[Path, _CacheEntry] = {}
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    """
+    PRIVATE: Dosyanın değişip değişmediğini anlamak için (inode, size, mtime_ns).
+    Dosya yoksa None döndürür.
+
+    Not:
+    - atomic_write her yazımda yeni bir dosya oluşturup os.replace yaptığı için
+      inode da değişir; aynı mtime tick'i içindeki yazımlar da yakalanır.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _reset_storage_cache() -> None:
+    """
+    SADECE TESTLER İÇİN!
+    Process içi cache'i tamamen temizler.
+    """
+    global _lock_fd, _lock_pid
+    _discard_write_back()
+    _CACHE.clear()
+    _SEQUENCES.clear()
+
+    # Lock dosyası testlerde silinebilir; bir sonraki lock yeniden açar
+    if _lock_fd is not None and _lock_pid == os.getpid():
+        os.close(_lock_fd)
+    _lock_fd = _lock_pid = None
+
+# =====================================================
+# METRICS
+# =====================================================
+#
+# Process içi ölçümler; etiket = tablo dosyasının adı (shard'lar aynı
+# tabloda toplanır, journal / counters kendi adıyla görünür).
+#
+# Sayaçlar:
+# - loads         : tablo erişimi (_load_entry; cache hit dahil)
+# - disk_reads    : diskten okuma (JSON / snapshot / log / journal)
+# - bytes_read    : diskten okunan byte
+# - writes        : atomic write (tmp + os.replace) sayısı
+# - appends       : log / journal append sayısı
+# - bytes_written : yazılan byte
+# Histogramlar (saniye):
+# - parse_seconds     : JSON / JSONL / snapshot parse süresi
+# - serialize_seconds : kayıtların byte'a çevrilmesi
+# - fsync_seconds     : fsync süresi
+# - replace_seconds   : os.replace süresi
+#
+# Lock bekleme metrikleri _LOCK_STATS'ta tutulur ve export'a eklenir.
+
+_METRIC_PREFIX = "studybuddy_storage_"
+
+# Histogram üst sınırları (saniye); son kova +Inf
+_HISTOGRAM_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class _Histogram:
+    """
+    PRIVATE: Sabit kovalı süre histogramı (kovalar kümülatif değil).
+    """
+    __slots__ = ("count", "total", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(_HISTOGRAM_BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.buckets[bisect.bisect_left(_HISTOGRAM_BUCKETS, seconds)] += 1
+
+
+# (metrik, tablo) -> değer
+_COUNTERS: Dict[Tuple[str, str], int] = {}
+_HISTOGRAMS: Dict[Tuple[str, str], _Histogram] = {}
+
+
+def _count(name: str, path: Path, amount: int = 1) -> None:
+    """
+    PRIVATE: Tablo sayacını artırır.
+    """
+    key = (name, path.name)
+    _COUNTERS[key] = _COUNTERS.get(key, 0) + amount
+
+
+def _observe(name: str, path: Path, seconds: float) -> None:
+    """
+    PRIVATE: Tablo histogramına süre ekler.
+    """
+    key = (name, path.name)
+    histogram = _HISTOGRAMS.get(key)
+    if histogram is None:
+        histogram = _HISTOGRAMS[key] = _Histogram()
+    histogram.observe(seconds)
+
+
+def get_metrics() -> Dict[str, Any]:
+    """
+    Storage metriklerinin anlık kopyasını döndürür.
+
+    Returns:
+        {
+          "counters":   {metrik: {tablo: değer}},
+          "histograms": {metrik: {tablo: {"count", "sum", "buckets": {üst sınır: kümülatif}}}},
+          "locks":      get_lock_stats()
+        }
+    """
+    counters: Dict[str, Dict[str, int]] = {}
+    for (name, table), value in sorted(_COUNTERS.items()):
+        counters.setdefault(name, {})[table] = value
+
+    histograms: Dict[str, Dict[str, Dict]] = {}
+    for (name, table), histogram in sorted(_HISTOGRAMS.items()):
+        cumulative = list(itertools.accumulate(histogram.buckets))
+        bounds = [str(bound) for bound in _HISTOGRAM_BUCKETS] + ["+Inf"]
+        histograms.setdefault(name, {})[table] = {
+            "count": histogram.count,
+            "sum": histogram.total,
+            "buckets": dict(zip(bounds, cumulative)),
+        }
+
+    return {"counters": counters, "histograms": histograms, "locks": get_lock_stats()}
+
+
+def reset_metrics() -> None:
+    """
+    Tüm metrikleri (lock metrikleri dahil) sıfırlar.
+    """
+    _COUNTERS.clear()
+    _HISTOGRAMS.clear()
+    for stats in _LOCK_STATS.values():
+        for key in stats:
+            stats[key] = 0
+
+
+def render_metrics(fmt: str = "prometheus") -> str:
+    """
+    Metrikleri metin olarak döndürür.
+
+    Args:
+        fmt: "prometheus" (text exposition formatı) veya "json"
+    """
+    metrics = get_metrics()
+    if fmt == "json":
+        return json.dumps(metrics, indent=2, ensure_ascii=False)
+    if fmt != "prometheus":
+        raise ValueError(f"Unknown metrics format: {fmt}")
+
+    lines: List[str] = []
+    for name, tables in metrics["counters"].items():
+        metric = f"{_METRIC_PREFIX}{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines += [f'{metric}{{table="{table}"}} {value}' for table, value in tables.items()]
+
+    for name, tables in metrics["histograms"].items():
+        metric = f"{_METRIC_PREFIX}{name}"
+        lines.append(f"# TYPE {metric} histogram")
+        for table, histogram in tables.items():
+            for bound, value in histogram["buckets"].items():
+                lines.append(f'{metric}_bucket{{table="{table}",le="{bound}"}} {value}')
+            lines.append(f'{metric}_sum{{table="{table}"}} {histogram["sum"]}')
+            lines.append(f'{metric}_count{{table="{table}"}} {histogram["count"]}')
+
+    for key, kind in (
+        ("acquired", "counter"),
+        ("contended", "counter"),
+        ("wait_seconds", "counter"),
+        ("max_wait_seconds", "gauge"),
+    ):
+        metric = f"{_METRIC_PREFIX}lock_{key}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines += [
+            f'{metric}{{mode="{mode}"}} {stats[key]}'
+            for mode, stats in metrics["locks"].items()
+        ]
+
+    return "\n".join(lines) + "\n"
+
+
+def export_metrics(path: Path, fmt: Optional[str] = None) -> Path:
+    """
+    Metrikleri dosyaya atomik olarak yazar (dashboard / textfile collector için).
+
+    Args:
+        fmt: "prometheus" veya "json"; verilmezse uzantıdan seçilir
+             (.prom -> prometheus, diğerleri json)
+    """
+    path = Path(path)
+    if fmt is None:
+        fmt = "prometheus" if path.suffix == ".prom" else "json"
+    _atomic_write_bytes(path, render_metrics(fmt).encode("utf-8"))
+    return path
+
+# =====================================================
+# FILE LOCKS (MULTI-PROCESS)
+# =====================================================
+#
+# - Load-modify-save dizileri (create_* / update_* / delete_* / transaction)
+#   baştan sona EXCLUSIVE lock altında çalışır: başka bir process'in yazımı
+#   araya giremez, okunan tablo yazılana kadar değişmez (lost update yok)
+# - Cache'i diskten tazeleyen okumalar SHARED lock alır: okuyucular birbirini
+#   beklemez, sadece devam eden bir yazımın bitmesini bekler
+# - Cache'ten dönen okumalar lock almaz
+# - Lock process içinde reentrant'tır; sadece en dıştaki alır / bırakır
+
+_LOCK_MODES = ("shared", "exclusive")
+
+# Açık lock dosyası ve onu açan process (fork sonrası yeniden açılır)
+_lock_fd: Optional[int] = None
+_lock_pid: Optional[int] = None
+
+# Bu process'in tuttuğu lock modu ve iç içe kullanım derinliği
+_lock_mode: Optional[str] = None
+_lock_depth = 0
+
+# mod -> {acquired, contended, wait_seconds, max_wait_seconds}
+_LOCK_STATS: Dict[str, Dict[str, float]] = {
+    mode: {"acquired": 0, "contended": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+    for mode in _LOCK_MODES
+}
+
+
+def _open_lock_fd() -> int:
+    """
+    PRIVATE: Lock dosyasını (process başına bir kez) açar.
+    """
+    global _lock_fd, _lock_pid
+    if _lock_fd is not None and _lock_pid != os.getpid():
+        # fork ile gelen fd parent'ın lock'unu paylaşır; kullanılmaz
+        os.close(_lock_fd)
+        _lock_fd = None
+    if _lock_fd is None:
+        LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _lock_fd = os.open(LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        _lock_pid = os.getpid()
+    return _lock_fd
+
+
+@contextmanager
+def _file_lock(exclusive: bool) -> Iterator[None]:
+    """
+    PRIVATE: Blok boyunca LOCK_FILE üzerinde shared / exclusive flock tutar.
+
+    - Lock hemen alınamazsa beklenir; bekleme süresi _LOCK_STATS'a yazılır
+    - Exclusive lock içinde shared istenirse mevcut lock yeterlidir
+    - Shared lock içinde exclusive istenirse RuntimeError (upgrade deadlock'a
+      yol açabileceği için desteklenmez)
+    - Lock, son kullanıcı bırakınca bırakılır (kullanımların iç içe sırayla
+      bitmesi gerekmez; write-back buffer'ı lock'u yazım fonksiyonundan
+      daha uzun tutar)
+    """
+    global _lock_mode, _lock_depth
+    if fcntl is None or not LOCKING_ENABLED:
+        yield
+        return
+
+    if _lock_depth:
+        if exclusive and _lock_mode != "exclusive":
+            raise RuntimeError("Cannot write while holding a shared storage lock")
+    else:
+        mode = "exclusive" if exclusive else "shared"
+        operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        stats = _LOCK_STATS[mode]
+        fd = _open_lock_fd()
+
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+        except BlockingIOError:
+            started = time.perf_counter()
+            fcntl.flock(fd, operation)
+            waited = time.perf_counter() - started
+            stats["contended"] += 1
+            stats["wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+        stats["acquired"] += 1
+        _lock_mode = mode
+
+    _lock_depth += 1
+    try:
+        yield
+    finally:
+        _lock_depth -= 1
+        if not _lock_depth:
+            _lock_mode = None
+            fcntl.flock(_lock_fd, fcntl.LOCK_UN)
+
+
+def _write_op(func):
+    """
+    PRIVATE: Fonksiyonun tamamını (okuma + yazım) exclusive lock altında çalıştırır.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _file_lock(exclusive=True):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def read_lock() -> Iterator[None]:
+    """
+    Blok boyunca shared lock tutar: birden fazla tabloyu okuyan işlemler
+    (ör. backup) tutarlı bir görüntü görür, başka process'lerin yazımları
+    blok bitene kadar bekler. Blok içinde yazım yapılamaz.
+    """
+    with _file_lock(exclusive=False):
+        yield
+
+
+def get_lock_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Lock metriklerinin kopyasını döndürür (mod başına):
+    - acquired: alınan lock sayısı
+    - contended: beklemek zorunda kalınan lock sayısı
+    - wait_seconds / max_wait_seconds: toplam ve en uzun bekleme süresi
+    """
+    return {mode: dict(stats) for mode, stats in _LOCK_STATS.items()}
+
+# =====================================================
+# TRANSACTION (UNIT OF WORK)
+# =====================================================
+
+class _Transaction:
+    """
+    PRIVATE: Açık transaction'da bekleyen (henüz diske yazılmamış) değişiklikler.
+
+    entries:
+    - Değişen tabloların cache entry'leri (değişiklikler memory'de uygulanmış)
+
+    journal:
+    - dizin -> (görülen journal imzası, replay byte'ı, op listesi)
+      Aynı dizindeki tüm tablolar (JSONL log'lar dahil) tek journal
+      satırında commit edilir.
+
+    appends / rewrites:
+    - JSONL log'a eklenecek kayıtlar / bütünüyle yeniden yazılacak dosyalar
+    - Dizinde journal satırı varsa log'a eklenecek kayıtlar o satıra da
+      yazılır; log append'i commit'ten sonra yapılır (bkz. _fold_log)
+
+    write_back:
+    - True ise write-back buffer'ıdır: JSON tabloları journal yerine
+      flush'ta bir kez bütünüyle yazılır
+    """
+    __slots__ = ("entries", "journal", "appends", "rewrites", "durability", "write_back")
+
+    def __init__(self, durability: Optional[str] = None, write_back: bool = False):
+        self.durability = durability
+        self.write_back = write_back
+        self.entries: Dict[Path, _CacheEntry] = {}
+        self.journal: Dict[Path, Tuple[Optional[tuple], int, List[Dict]]] = {}
+        self.appends: Dict[Path, List[Dict]] = {}
+        self.rewrites: Dict[Path, None] = {}
+
+    def stage(self, path: Path, entry: _CacheEntry, changes: List[Change]) -> None:
+        """
+        Değişiklikleri cache'e uygular ve commit için kaydeder.
+        """
+        if JOURNAL_ENABLED and not self.write_back and path not in self.rewrites:
+            directory = path.parent
+            if directory not in self.journal:
+                self.journal[directory] = (entry.journal, entry.journal_pos, [])
+            self.journal[directory][2].extend(
+                _journal_op(path.name, old, new) for old, new in changes
+            )
+        else:
+            self.rewrites[path] = None
+
+        for old, new in changes:
+            _apply_change(entry, old, new)
+        self.entries[path] = entry
+        _CACHE[path] = entry
+
+    def stage_append(self, path: Path, entry: _CacheEntry, records: List[Dict]) -> None:
+        """
+        JSONL log'a eklenecek kayıtları cache'e uygular ve commit için kaydeder.
+        """
+        for record in records:
+            _apply_change(entry, entry.rows.get(record["id"]), record)
+        self.appends.setdefault(path, []).extend(records)
+        self.entries[path] = entry
+        _CACHE[path] = entry
+
+    def flush(self) -> None:
+        """
+        Bekleyen değişiklikleri diske yazar:
+        - dizin başına tek journal satırı (commit noktası: aynı dizindeki
+          tablolar ve log kayıtları birlikte, atomik)
+        - yeniden yazılacak her dosya için tek atomic write
+        - log başına tek append
+        """
+        global _durability
+        _durability = self.durability
+        try:
+            self._write()
+        finally:
+            _durability = None
+
+    def _write(self) -> None:
+        # Log kayıtları aynı dizindeki journal satırına katılır: append
+        # yarıda kalsa da commit journal'dadır (okumalar ve compaction tamamlar)
+        for path, records in self.appends.items():
+            if path.parent in self.journal and path not in self.rewrites:
+                at = self.entries[path].offset
+                self.journal[path.parent][2].extend(
+                    {**_journal_op(path.name, None, record), "at": at} for record in records
+                )
+
+        for directory, (seen, pos, ops) in self.journal.items():
+            _journal_append(directory, ops, seen, pos)
+
+        for path in self.rewrites:
+            _rewrite(path, self.entries[path])
+
+        for path, records in self.appends.items():
+            if path not in self.rewrites:
+                _append_log(path, self.entries[path], records)
+
+        for directory in self.journal:
+            _maybe_compact(directory)
+
+
+# Açık transaction (yoksa None). Uygulama tek thread'lidir.
+_TX: Optional[_Transaction] = None
+
+
+@contextmanager
+def transaction(durability: Optional[str] = None) -> Iterator[None]:
+    """
+    Birden fazla yazımı tek bir commit'te toplar (unit of work).
+
+    Kullanım:
+        with transaction():
+            update_srs_state(...)
+            create_review(...)
+
+    Davranış:
+    - Blok içindeki değişiklikler hemen cache'e uygulanır; blok içindeki
+      okumalar (get_*, load_*) bu değişiklikleri görür
+    - Blok başarıyla biterse değişiklikler birlikte yazılır
+      (dizin başına tek journal satırı + log başına tek append)
+    - Blok exception ile biterse hiçbir şey yazılmaz; değişen tabloların
+      cache'i düşürülür ve bir sonraki okuma diskten yapılır
+    - İç içe transaction'lar dıştakine katılır
+    - Blok boyunca exclusive dosya lock'u tutulur (diğer process'ler bekler)
+    - Write-back modunda blok write-back buffer'ına katılır (yazım flush'ta)
+
+    Args:
+        durability: Bu commit için fsync politikası ("strict" / "batched" /
+                    "none"). Verilmezse config.DURABILITY kullanılır.
+                    İç içe transaction'larda dıştakinin ayarı geçerlidir.
+
+    Not:
+    - Commit noktası journal satırıdır. Aynı dizindeki tablolar değiştiyse
+      review log kayıtları da bu satıra yazılır; log append'i satırdan sonra
+      yapılır ve yarıda kalırsa kayıtlar journal'dan okunur / compaction'da
+      log'a eklenir (state + review ya birlikte kalıcıdır ya hiç).
+    - Sadece log'a ekleyen commit'ler journal'a yazılmaz (tek append zaten atomik).
+    """
+    global _TX
+    if durability is not None and durability not in _DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode: {durability}")
+
+    if _TX is None and _write_back_enabled():
+        _begin_write_back()
+
+    if _TX is not None:
+        yield
+        return
+
+    with _file_lock(exclusive=True):
+        tx = _TX = _Transaction(durability)
+        try:
+            yield
+            _TX = None
+            tx.flush()
+        except BaseException:
+            for path in tx.entries:
+                _CACHE.pop(path, None)
+            raise
+        finally:
+            _TX = None
+
+# =====================================================
+# WRITE-BACK MODE
+# =====================================================
+#
+# Write-back modunda yazımlar açık kalan bir transaction'a (buffer) katılır:
+# tablolar memory'de değişir ve dirty olarak işaretlenir (buffer.entries),
+# flush() her dirty tabloyu tek atomic write ile, review log'u tek append
+# ile yazar.
+#
+# - İlk buffered yazımdan flush()'a kadar exclusive lock tutulur; başka
+#   process'ler flush'ı bekler (flush edilen tablolar eskimiş olamaz)
+# - Buffer içindeki transaction() blokları ayrıca rollback yapmaz
+# - Flush edilmemiş değişiklikler crash'te kaybolur
+
+# İç içe write_back() blok sayısı
+_write_back_depth = 0
+
+# Buffer açıkken tutulan exclusive lock
+_write_back_lock = ExitStack()
+
+
+def _write_back_enabled() -> bool:
+    """
+    PRIVATE: Yazımlar buffer'a mı gidecek? (config.WRITE_BACK veya write_back() bloğu)
+    """
+    return WRITE_BACK or _write_back_depth > 0
+
+
+def _begin_write_back() -> None:
+    """
+    PRIVATE: Write-back buffer'ını açar (ilk buffered yazımda çağrılır).
+    """
+    global _TX
+    _write_back_lock.enter_context(_file_lock(exclusive=True))
+    _TX = _Transaction(write_back=True)
+
+
+def _discard_write_back() -> None:
+    """
+    PRIVATE: Flush edilmemiş değişiklikleri atar (cache'leri düşürülür).
+    """
+    global _TX
+    tx = _TX
+    if tx is None or not tx.write_back:
+        return
+    _TX = None
+    for path in tx.entries:
+        _CACHE.pop(path, None)
+    _write_back_lock.close()
+
+
+def flush() -> int:
+    """
+    Write-back buffer'ındaki dirty tabloları diske yazar.
+
+    - Her dirty JSON tablosu tek atomic write ile bütünüyle yazılır
+    - Review log'a biriken kayıtlar tek append ile eklenir
+    - Exclusive lock bırakılır; mod açıksa sonraki yazım yeni buffer açar
+    - Write-back modu kapalıysa / buffer boşsa hiçbir şey yapmaz
+
+    Returns:
+        int: Yazılan dosya sayısı
+    """
+    global _TX
+    tx = _TX
+    if tx is None or not tx.write_back:
+        return 0
+    _TX = None
+    try:
+        tx.flush()
+    finally:
+        _write_back_lock.close()
+    return len(tx.entries)
+
+
+@contextmanager
+def write_back() -> Iterator[None]:
+    """
+    Blok boyunca write-back modunu açar; blok sonunda flush() çağrılır.
+
+    Kullanım:
+        with write_back():
+            for row in rows:
+                create_card(row)      # disk yazımı yok
+        # burada cards.json bir kez yazıldı
+
+    Blok exception ile biterse flush edilmemiş değişiklikler atılır.
+    """
+    global _write_back_depth
+    _write_back_depth += 1
+    try:
+        yield
+    except BaseException:
+        if _write_back_depth == 1:
+            _discard_write_back()
+        raise
+    else:
+        if _write_back_depth == 1:
+            flush()
+    finally:
+        _write_back_depth -= 1
+
+# =====================================================
+# TABLE LOADING
+# =====================================================
+
+def _is_log(path: Path) -> bool:
+    """
+    PRIVATE: Append-only JSONL tablo mu?
+    """
+    return path.suffix == ".jsonl"
+
+
+def _load_entry(path: Path) -> _CacheEntry:
+    """
+    PRIVATE: Tablonun güncel cache entry'sini döndürür.
+
+    - İmza değişmediyse cache'teki entry döner (parse yok)
+    - Değiştiyse dosya yeniden parse edilir
+    - JSONL log / journal sadece büyüdüyse yalnızca yeni satırlar parse edilir
+    - Dosya yoksa cache'e konmayan boş bir entry döner
+    - Açık transaction'da değişmiş tablolar için bekleyen hali döner
+    - Diskten okuma gerekiyorsa shared lock altında yapılır
+    """
+    _count("loads", path)
+    entry = _fresh_entry(path)
+    if entry is not None:
+        return entry
+
+    with _file_lock(exclusive=False):
+        if _is_log(path):
+            return _load_log_entry(path)
+        return _load_table_entry(path)
+
+
+def _load_table_entry(path: Path) -> _CacheEntry:
+    """
+    PRIVATE: JSON snapshot + journal'daki bu tabloya ait değişiklikler.
+    """
+    signature = _file_signature(path)
+    journal_path = _journal_path(path.parent)
+    journal = _journal_signature(journal_path)
+
+    entry = _CACHE.get(path)
+    if entry is not None and entry.signature == signature and entry.journal == journal:
+        return entry
+
+    if signature is None and journal is None:
+        _CACHE.pop(path, None)
+        return _CacheEntry(None)
+
+    if entry is None or entry.signature != signature or not _journal_continues(entry, journal):
+        rows: Dict[int, Dict] = {}
+        if signature is not None:
+            snapshot = _load_snapshot(path, signature)
+            if snapshot is not None:
+                rows = _rows_from(snapshot[0])
+            else:
+                with open(path, "rb") as f:
+                    payload = f.read()
+                started = time.perf_counter()
+                data = _decode(payload)
+                _observe("parse_seconds", path, time.perf_counter() - started)
+                _count("disk_reads", path)
+                _count("bytes_read", path, len(payload))
+                rows = _rows_from(data)
+                _store_snapshot(path, signature, data)
+        entry = _CacheEntry(signature, rows)
+
+    if journal is not None:
+        _journal_replay(entry, path, journal_path)
+    entry.journal = journal
+
+    _CACHE[path] = entry
+    return entry
+
+
+def _load_log_entry(path: Path) -> _CacheEntry:
+    """
+    PRIVATE: JSONL log'u + journal'daki bu log'a ait op'ları okur.
+
+    - Aynı dosya (inode) sadece büyüdüyse: eski offset'ten devam edilir
+      (append-only olduğu için önceki satırlar değişmemiştir)
+    - Aksi halde (yeniden yazılmış / küçülmüş): geçerli ikili snapshot varsa
+      onun kapsadığı yerden, yoksa baştan parse edilir
+    - Çok sayıda yeni satır parse edildiyse snapshot tazelenir
+    - Journal'daki op'lar (commit edilmiş ama log'a henüz eklenmemiş
+      kayıtlar, silmeler) üzerine uygulanır; put'lar idempotent olduğu için
+      log'a da ulaşmış kayıtlar tekrar sayılmaz
+    """
+    signature = _file_signature(path)
+    journal_path = _journal_path(path.parent)
+    journal = _journal_signature(journal_path)
+    if signature is None and journal is None:
+        _CACHE.pop(path, None)
+        return _CacheEntry(None)
+
+    entry = _CACHE.get(path)
+    if entry is not None and entry.signature == signature and entry.journal == journal:
+        return entry
+
+    if signature is None:
+        entry = _CacheEntry(None)
+    elif entry is None or entry.signature is None or entry.signature[0] != signature[0] or signature[1] < entry.offset:
+        entry = _CacheEntry(signature)
+        snapshot = _load_snapshot(path, signature)
+        if snapshot is not None:
+            entry.rows = _rows_from(snapshot[0])
+            entry.offset = snapshot[1]
+
+    consumed = 0
+    if signature is not None and (signature != entry.signature or entry.offset < signature[1]):
+        records, consumed = _read_log_chunk(path, entry.offset)
+        for record in records:
+            _apply_change(entry, entry.rows.get(record["id"]), record)
+        entry.offset += consumed
+    entry.signature = signature
+
+    if journal != entry.journal:
+        # Compaction sonrası (yeni journal) eski op'lar log'a katlanmıştır
+        if not _journal_continues(entry, journal):
+            entry.journal_pos = 0
+        if journal is not None:
+            _journal_replay(entry, path, journal_path)
+        entry.journal = journal
+    _CACHE[path] = entry
+
+    if consumed and consumed >= SNAPSHOT_MIN_BYTES:
+        _store_snapshot(path, signature, list(entry.rows.values()), entry.offset)
+    return entry
+
+
+def _rows_from(data: Iterable[Dict]) -> Dict[int, Dict]:
+    """
+    PRIVATE: Kayıt listesini id -> kayıt dict'ine çevirir.
+    """
+    return {item["id"]: item for item in data}
+
+
+def _read_log_chunk(path: Path, offset: int) -> Tuple[list, int]:
+    """
+    PRIVATE: JSONL dosyasını offset'ten sonuna kadar okuyup parse eder.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        chunk = f.read()
+
+    started = time.perf_counter()
+    result = _parse_log_chunk(chunk)
+    _observe("parse_seconds", path, time.perf_counter() - started)
+    _count("disk_reads", path)
+    _count("bytes_read", path, len(chunk))
+    return result
+
+
+def _parse_log_chunk(chunk: bytes) -> Tuple[list, int]:
+    """
+    PRIVATE: JSONL byte parçasını parse eder.
+
+    Returns:
+        (kayıtlar, tüketilen byte sayısı)
+
+    Not:
+    - Newline ile bitmeyen son satır (crash sırasında yarım kalmış append)
+      tüketilmez ve yok sayılır.
+    """
+    end = chunk.rfind(b"\n") + 1
+    records = [_decode(line) for line in chunk[:end].splitlines() if line.strip()]
+    return records, end
+
+# =====================================================
+# INDEXES (PK / FK)
+# =====================================================
+
+# Index türleri:
+# - UNIQUE: değer -> kayıt             (email)
+# - GROUP : değer -> {id: kayıt}       (deck_id, user_id, card_id)
+#   Grup içi dict, dosya sırasını korur ve O(1) silmeye izin verir.
+# - SORTED: değer -> artan id listesi  (sayfalama: cursor'a bisect ile atlanır)
+# - DUE   : kullanıcı başına due_date min-heap'i (_DueHeap)
+# - Primary key (id) index'i entry.rows'un kendisidir.
+_UNIQUE = "unique"
+_GROUP = "group"
+_SORTED = "sorted"
+_DUE = "due"
+
+
+def _build_index(rows: Dict[int, Dict], kind: str, field: str) -> dict:
+    """
+    PRIVATE: Kayıtlardan index kurar (yükleme başına bir kez, O(n)).
+    UNIQUE index'te aynı değer birden fazlaysa ilk kayıt kazanır
+    (eski next(...) taramalarıyla aynı davranış).
+    """
+    index: dict = {}
+    if kind == _UNIQUE:
+        for item in rows.values():
+            index.setdefault(item[field], item)
+    elif kind == _SORTED:
+        for item in rows.values():
+            index.setdefault(item[field], []).append(item["id"])
+        for ids in index.values():
+            ids.sort()
+    else:
+        for item in rows.values():
+            index.setdefault(item[field], {})[item["id"]] = item
+    return index
+
+
+def _index(entry: _CacheEntry, kind: str, field: str) -> dict:
+    """
+    PRIVATE: Entry üzerindeki index'i döndürür, yoksa kurar.
+    """
+    if kind == _UNIQUE and field == "id":
+        return entry.rows
+
+    key = (kind, field)
+    index = entry.indexes.get(key)
+    if index is None:
+        if kind == _DUE:
+            index = _DueHeap(entry.rows.values())
+        else:
+            index = _build_index(entry.rows, kind, field)
+        entry.indexes[key] = index
+    return index
+
+
+def _first(group: Optional[Dict[int, Dict]]) -> Optional[Dict]:
+    """
+    PRIVATE: GROUP index grubundaki ilk kaydı döndürür (yoksa None).
+    """
+    if not group:
+        return None
+    return next(iter(group.values()))
+
+
+def _apply_change(entry: _CacheEntry, old: Optional[Dict], new: Optional[Dict]) -> None:
+    """
+    PRIVATE: Tek bir değişikliği rows + index'lere uygular (O(1)).
+
+    - Güncellemede kayıt dosyadaki / gruptaki pozisyonunu korur
+    - SORTED index'te id listesi bisect ile güncellenir (O(log n) arama)
+    """
+    if new is not None:
+        entry.rows[new["id"]] = new
+    elif old is not None:
+        entry.rows.pop(old["id"], None)
+
+    for (kind, field), index in entry.indexes.items():
+        if kind == _DUE:
+            index.apply(old, new)
+        elif kind == _UNIQUE:
+            if old is not None and index.get(old[field]) is old:
+                del index[old[field]]
+            if new is not None:
+                index.setdefault(new[field], new)
+        elif kind == _SORTED:
+            if old is not None and (new is None or new[field] != old[field]):
+                ids = index.get(old[field], [])
+                i = bisect.bisect_left(ids, old["id"])
+                if i < len(ids) and ids[i] == old["id"]:
+                    del ids[i]
+                    if not ids:
+                        del index[old[field]]
+            if new is not None:
+                ids = index.setdefault(new[field], [])
+                i = bisect.bisect_left(ids, new["id"])
+                if i == len(ids) or ids[i] != new["id"]:
+                    ids.insert(i, new["id"])
+        else:
+            # Önce ekle: güncellenen kayıt grup içindeki sırasını korur
+            if new is not None:
+                index.setdefault(new[field], {})[new["id"]] = new
+            if old is not None:
+                group = index.get(old[field])
+                if group is not None and group.get(old["id"]) is old:
+                    del group[old["id"]]
+                    if not group:
+                        del index[old[field]]
+
+
+class _DueHeap:
+    """
+    PRIVATE: SRS state'lerin kullanıcı başına due_date'e göre min-heap'i.
+
+    - Heap elemanı (due ordinal, state id, card id) tuple'ıdır; live[state id]
+      state'in GÜNCEL elemanını (aynı obje) tutar
+    - Lazy invalidation: update / delete eski elemanı heap'ten silmez, sadece
+      live'dan düşürür; bayat elemanlar sorguda atlanır, sayıları canlıları
+      geçince kullanıcının heap'i yeniden kurulur (amortize O(1))
+    - "Bugün due olanlar" heap ağacında due_by'ı aşan dallara inmeden
+      toplanır: O(k + bayat) eleman, kullanıcının tüm kartları taranmaz
+
+    ❗ NOT:
+    Due sorgusunun kompakt gösterimi budur (state başına gün ordinal'li tek
+    tuple). Ayrı bir kolon (array / NumPy) kopyası tutulmaz: vektörel filtre
+    de kullanıcının TÜM state'lerini tarardı, heap ise sadece due olanları
+    gezer; iki kopyanın her yazımda güncellenmesi de gereksiz maliyetti.
+    """
+    __slots__ = ("heaps", "live", "stale")
+
+    _MIN_REBUILD = 64   # Küçük heap'ler için yeniden kurma yapılmaz
+
+    def __init__(self, states: Iterable[Dict] = ()):
+        self.heaps: Dict[int, list] = {}   # user id -> heap
+        self.live: Dict[int, tuple] = {}   # state id -> güncel heap elemanı
+        self.stale: Dict[int, int] = {}    # user id -> bayat eleman sayısı
+        for state in states:
+            item = self.live[state["id"]] = self._item(state)
+            self.heaps.setdefault(state["user_id"], []).append(item)
+        for heap in self.heaps.values():
+            heapq.heapify(heap)
+
+    @staticmethod
+    def _item(state: Dict) -> tuple:
+        due = date.fromisoformat(state["due_date"][:10]).toordinal()
+        return (due, state["id"], state["card_id"])
+
+    def _is_live(self, item: tuple) -> bool:
+        # Kimlik karşılaştırması: aynı değerli eski bir eleman canlı sayılmaz
+        return self.live.get(item[1]) is item
+
+    def apply(self, old: Optional[Dict], new: Optional[Dict]) -> None:
+        if old is not None and self.live.pop(old["id"], None) is not None:
+            user_id = old["user_id"]
+            self.stale[user_id] = self.stale.get(user_id, 0) + 1
+            self._maybe_rebuild(user_id)
+        if new is not None:
+            item = self.live[new["id"]] = self._item(new)
+            heapq.heappush(self.heaps.setdefault(new["user_id"], []), item)
+
+    def _maybe_rebuild(self, user_id: int) -> None:
+        heap = self.heaps[user_id]
+        stale = self.stale[user_id]
+        if stale < self._MIN_REBUILD or stale * 2 < len(heap):
+            return
+        heap[:] = [item for item in heap if self._is_live(item)]
+        heapq.heapify(heap)
+        self.stale[user_id] = 0
+
+    def card_ids(self, user_id: int, due_by: int) -> set:
+        """
+        Kullanıcının due_date <= due_by (gün ordinal'i) olan kart id'leri.
+        """
+        heap = self.heaps.get(user_id)
+        if not heap:
+            return set()
+
+        # Tepedeki bayat elemanlar atılır (sonraki sorgular için de)
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+            self.stale[user_id] -= 1
+
+        result = set()
+        stack = [0]
+        size = len(heap)
+        while stack:
+            i = stack.pop()
+            if i >= size or heap[i][0] > due_by:
+                continue
+            if self._is_live(heap[i]):
+                result.add(heap[i][2])
+            stack.append(2 * i + 1)
+            stack.append(2 * i + 2)
+        return result
+
+# =====================================================
+# WRITE-AHEAD JOURNAL
+# =====================================================
+#
+# Format (journal.wal, satır başına bir commit):
+#   {"ops": [{"t": "cards.json", "op": "put", "r": {...}},
+#            {"t": "cards.json", "op": "del", "id": 5},
+#            {"t": "reviews.jsonl", "op": "put", "r": {...}, "at": 1024}]}
+#
+# - Okuma: snapshot (log'larda log dosyası) + journal'daki ilgili op'lar
+#   sırayla uygulanır
+# - put / del idempotent'tir: compaction yarıda kalırsa (yeni snapshot +
+#   eski journal) aynı op'ların tekrar uygulanması sonucu değiştirmez
+# - Log put'larındaki "at", kaydın log'da yazılacağı offset'tir; compaction
+#   log'a ulaşmamış kayıtları bu offset'ten sonrasına bakarak bulur
+# - Yarım kalmış son satır (crash) yok sayılır
+
+def _journal_path(directory: Path) -> Path:
+    """
+    PRIVATE: Bir dizindeki tabloların journal dosyası.
+    """
+    return directory / JOURNAL_FILE.name
+
+
+def _journal_signature(path: Path) -> Optional[tuple]:
+    """
+    PRIVATE: Journal imzası (inode, size). Journal append-only olduğu için yeterli.
+    """
+    signature = _file_signature(path)
+    return signature[:2] if signature else None
+
+
+def _journal_continues(entry: _CacheEntry, journal: Optional[tuple]) -> bool:
+    """
+    PRIVATE: Entry'nin gördüğü journal, mevcut journal'ın başı mı?
+    (Evetse sadece yeni satırlar replay edilir, snapshot yeniden parse edilmez.)
+    """
+    if entry.journal is None:
+        return entry.journal_pos == 0
+    return (
+        journal is not None
+        and journal[0] == entry.journal[0]
+        and journal[1] >= entry.journal_pos
+    )
+
+
+def _journal_replay(entry: _CacheEntry, path: Path, journal_path: Path) -> None:
+    """
+    PRIVATE: Journal'da entry'nin henüz görmediği satırları tabloya uygular.
+    """
+    commits, consumed = _read_log_chunk(journal_path, entry.journal_pos)
+
+    name = path.name
+    for commit in commits:
+        for op in commit["ops"]:
+            if op["t"] != name:
+                continue
+            if op["op"] == "put":
+                record = op["r"]
+                _apply_change(entry, entry.rows.get(record["id"]), record)
+            else:
+                old = entry.rows.get(op["id"])
+                if old is not None:
+                    _apply_change(entry, old, None)
+
+    entry.journal_pos += consumed
+
+
+def _journal_op(name: str, old: Optional[Dict], new: Optional[Dict]) -> Dict:
+    """
+    PRIVATE: Bir değişikliği journal op'una çevirir.
+    """
+    if new is not None:
+        return {"t": name, "op": "put", "r": new}
+    return {"t": name, "op": "del", "id": old["id"]}
+
+
+def _journal_append(directory: Path, ops: List[Dict], seen: Optional[tuple], pos: int) -> None:
+    """
+    PRIVATE: Journal'a tek satırlık bir commit ekler (tek write + tek fsync).
+
+    Args:
+        seen / pos: Çağıranın (güncel) entry'sinin gördüğü journal imzası ve
+                    replay ettiği byte sayısı. Aradaki fark crash'ten kalan
+                    yarım satırdır ve append'ten önce kesilir.
+
+    Not:
+    - Yeni satır sadece commit'teki tabloları ilgilendirir. Journal'ın önceki
+      sonunu görmüş diğer entry'ler de doğrudan yeni sona taşınır
+      (gereksiz replay / reload olmaz).
+    """
+    journal_path = _journal_path(directory)
+    line = _serialize(journal_path, [{"ops": ops}], log=True)
+
+    torn = seen is not None and seen[1] != pos
+    _append_bytes(journal_path, line, truncate_to=pos if torn else None)
+
+    current = _journal_signature(journal_path)
+    for path, entry in _CACHE.items():
+        if path.parent == directory and entry.journal == seen:
+            entry.journal = current
+            entry.journal_pos = current[1]
+
+
+@_write_op
+def compact_journal(directory: Path = DATA_DIR) -> bool:
+    """
+    Journal'daki değişiklikleri JSON snapshot'lara katlar ve journal'ı boşaltır.
+
+    Akış:
+    1) Journal'da adı geçen her tablo güncel haliyle atomic yazılır;
+       sadece eklenmiş kayıtları olan log'lara eksik kayıtlar append edilir
+       (bkz. _fold_log), silme olan log'lar bütünüyle yazılır
+    2) Journal boş bir dosya ile atomic olarak değiştirilir
+
+    1 ile 2 arasında crash olursa bir sonraki okuma eski journal'ı yeni
+    snapshot üzerine tekrar uygular; op'lar idempotent olduğu için sonuç aynıdır.
+
+    Returns:
+        bool: compaction yapıldıysa True
+    """
+    journal_path = _journal_path(directory)
+    journal = _journal_signature(journal_path)
+    if journal is None or journal[1] == 0:
+        return False
+
+    with open(journal_path, "rb") as f:
+        commits, _ = _parse_log_chunk(f.read())
+    ops_by_name: Dict[str, List[Dict]] = {}
+    for commit in commits:
+        for op in commit["ops"]:
+            ops_by_name.setdefault(op["t"], []).append(op)
+
+    for name in sorted(ops_by_name):
+        path = directory / name
+        ops = ops_by_name[name]
+        if _is_log(path) and all("at" in op for op in ops):
+            _fold_log(path, ops)
+            continue
+        entry = _load_entry(path)
+        _write_entry(path, entry)
+        _CACHE[path] = entry
+
+    seen = _journal_signature(journal_path)
+    _atomic_write_bytes(journal_path, b"")
+    current = _journal_signature(journal_path)
+
+    for path, entry in _CACHE.items():
+        if path.parent == directory and entry.journal == seen:
+            entry.journal = current
+            entry.journal_pos = 0
+    return True
+
+
+def _fold_log(path: Path, ops: List[Dict]) -> None:
+    """
+    PRIVATE: Journal'da commit edilmiş ama log dosyasına ulaşmamış
+    (append'i yarıda kalmış) kayıtları log'a ekler.
+
+    Log iki compaction arasında sadece büyüdüğü için bir kayıt, varsa,
+    journal'daki "at" offset'inden sonradır: sadece o kısım okunur.
+    """
+    signature = _file_signature(path)
+    size = signature[1] if signature else 0
+    start = min(min(op["at"] for op in ops), size)
+
+    present: set = set()
+    consumed = 0
+    if signature is not None:
+        records, consumed = _read_log_chunk(path, start)
+        present = {record["id"] for record in records}
+
+    missing = {op["r"]["id"]: op["r"] for op in ops if op["r"]["id"] not in present}
+    if not missing:
+        return
+    end = start + consumed
+    _append_bytes(
+        path,
+        _serialize(path, list(missing.values()), log=True),
+        truncate_to=end if end != size else None,
+    )
+
+
+def _maybe_compact(directory: Path) -> None:
+    """
+    PRIVATE: Journal JOURNAL_MAX_BYTES'ı aştıysa compaction yapar.
+    """
+    journal = _journal_signature(_journal_path(directory))
+    if journal is not None and journal[1] > JOURNAL_MAX_BYTES:
+        compact_journal(directory)
+
+# =====================================================
+# ID SEQUENCES (COUNTERS_FILE)
+# =====================================================
+#
+# counters.json: {"cards.json": 128, "users.json": 64, ...}
+# - Değer, o tablo için rezerve edilmiş en büyük id'dir
+# - Rezervasyon ID_BLOCK_SIZE'lık bloklarla yapılır: tek atomic write
+#   (tek fsync) ile bir blok id memory'den O(1) dağıtılır
+# - Sayaç id'yi vermeden ÖNCE diske yazıldığı için crash sonrası bile
+#   aynı id iki kez verilmez (en kötü ihtimalle boşluk kalır)
+
+# tablo adı -> [sıradaki id, bloğun son id'si]
+_SEQUENCES: Dict[str, List[int]] = {}
+
+# Son rezervasyonda görülen counters.json imzası
+_counters_signature: Optional[tuple] = None
+
+
+def _read_counters() -> Dict[str, int]:
+    """
+    PRIVATE: counters.json'u okur. Dosya yoksa boş dict döndürür.
+    """
+    try:
+        with open(COUNTERS_FILE, "rb") as f:
+            return _decode(f.read())
+    except FileNotFoundError:
+        return {}
+
+
+def _write_counters(counters: Dict[str, int]) -> None:
+    """
+    PRIVATE: counters.json'u atomic yazar ve imzasını hatırlar.
+    """
+    global _counters_signature
+    _atomic_write_bytes(COUNTERS_FILE, _serialize(COUNTERS_FILE, counters))
+    _counters_signature = _file_signature(COUNTERS_FILE)
+
+
+def _allocate_id(base: Path) -> int:
+    """
+    PRIVATE: Tablo için yeni id verir (O(1), blok bitince tek disk yazımı).
+
+    - counters.json dışarıdan değiştiyse / silindiyse memory'deki bloklar
+      bırakılır ve sayaç diskten yeniden okunur
+    - Tablonun sayacı yoksa (ilk kullanım / eski kurulum) tablodaki
+      (shard düzeninde tüm shard'lardaki) max id'den başlatılır
+    """
+    if _file_signature(COUNTERS_FILE) != _counters_signature:
+        _SEQUENCES.clear()
+
+    sequence = _SEQUENCES.get(base.name)
+    if sequence is None or sequence[0] > sequence[1]:
+        counters = _read_counters()
+        start = counters.get(base.name)
+        if start is None:
+            start = max(
+                (max(_load_entry(path).rows, default=0) for path in _table_files(base)),
+                default=0,
+            )
+        counters[base.name] = start + ID_BLOCK_SIZE
+        _write_counters(counters)
+        sequence = _SEQUENCES[base.name] = [start + 1, start + ID_BLOCK_SIZE]
+
+    new_id = sequence[0]
+    sequence[0] += 1
+    return new_id
+
+
+def _sync_counter(path: Path, records: List[Dict]) -> None:
+    """
+    PRIVATE: Tablo bütünüyle yazıldığında (save_*, restore) sayacı verideki
+    max id'nin altında kalmayacak şekilde ilerletir.
+    """
+    top = max((record["id"] for record in records), default=0)
+
+    sequence = _SEQUENCES.get(path.name)
+    if sequence is not None and sequence[0] <= top:
+        del _SEQUENCES[path.name]
+
+    counters = _read_counters()
+    if path.name in counters and counters[path.name] < top:
+        counters[path.name] = top
+        _write_counters(counters)
+
+# =====================================================
+# DURABILITY (FSYNC POLICY)
+# =====================================================
+#
+# - strict : her yazım fsync edilir
+# - batched: append'ler (journal / review log) fsync'siz yazılır, dosya
+#            bekleyenler listesine alınır; DURABILITY_BATCH_WRITES yazımda,
+#            DURABILITY_BATCH_MS dolunca (timer) veya process çıkışında
+#            hepsi birlikte fsync edilir (group commit).
+#            Atomic rewrite'lar (snapshot, compaction, counters) her zaman
+#            fsync edilir: replace'ten önce fsync edilmeyen dosya crash
+#            sonrası boş kalabilir ve bu tüm tabloyu kaybettirir.
+# - none   : fsync yapılmaz
+#
+# Crash'te kaybedilebilecek en fazla veri, fsync edilmemiş son append'lerdir;
+# append'ler satır bazlı olduğu için yarım kalan son satır zaten yok sayılır.
+
+_DURABILITY_MODES = ("strict", "batched", "none")
+
+# Açık commit'in (transaction) fsync politikası; yoksa config.DURABILITY
+_durability: Optional[str] = None
+
+# batched modda fsync bekleyen dosyalar
+_pending_sync: Dict[Path, None] = {}
+_pending_writes = 0
+_sync_timer: Optional[threading.Timer] = None
+_sync_lock = threading.Lock()
+
+
+def _current_durability() -> str:
+    """
+    PRIVATE: Geçerli fsync politikası (transaction ayarı > config).
+    """
+    mode = _durability or DURABILITY
+    if mode not in _DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode: {mode}")
+    return mode
+
+
+def _sync_fd(fd: int, path: Path, deferrable: bool) -> None:
+    """
+    PRIVATE: Yazılan dosyayı politikaya göre diske indirir.
+
+    Args:
+        deferrable: batched modda fsync ertelenebilir mi (sadece append'ler)
+    """
+    mode = _current_durability()
+    if mode == "none":
+        return
+    if mode == "strict" or not deferrable:
+        started = time.perf_counter()
+        os.fsync(fd)
+        _observe("fsync_seconds", path, time.perf_counter() - started)
+        return
+    _defer_sync(path)
+
+
+def _defer_sync(path: Path) -> None:
+    """
+    PRIVATE: Dosyayı group commit'e ekler; eşik dolduysa hemen flush eder.
+    """
+    global _pending_writes, _sync_timer
+    with _sync_lock:
+        _pending_sync[path] = None
+        _pending_writes += 1
+        flush_now = _pending_writes >= DURABILITY_BATCH_WRITES
+        if not flush_now and _sync_timer is None:
+            _sync_timer = threading.Timer(DURABILITY_BATCH_MS / 1000, sync_pending_writes)
+            _sync_timer.daemon = True
+            _sync_timer.start()
+
+    if flush_now:
+        sync_pending_writes()
+
+
+def sync_pending_writes() -> None:
+    """
+    batched modda bekleyen tüm fsync'leri hemen yapar.
+
+    - Timer, eşik ve process çıkışı (atexit) tarafından çağrılır
+    - Toplu işlemlerin sonunda elle de çağrılabilir
+    """
+    global _pending_writes, _sync_timer
+    with _sync_lock:
+        paths = list(_pending_sync)
+        _pending_sync.clear()
+        _pending_writes = 0
+        if _sync_timer is not None:
+            _sync_timer.cancel()
+            _sync_timer = None
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            # Bu arada atomic olarak değiştirildi (ve fsync edildi) / silindi
+            continue
+        try:
+            started = time.perf_counter()
+            os.fsync(fd)
+            _observe("fsync_seconds", path, time.perf_counter() - started)
+        finally:
+            os.close(fd)
+
+
+def _at_exit() -> None:
+    """
+    PRIVATE: Process çıkışında write-back buffer'ını ve ertelenmiş fsync'leri
+    yazar; METRICS_FILE ayarlıysa metrikleri export eder.
+    """
+    flush()
+    sync_pending_writes()
+    if METRICS_FILE:
+        export_metrics(METRICS_FILE)
+
+
+atexit.register(_at_exit)
+
+# =====================================================
+# CODEC (JSON ENCODE / DECODE)
+# =====================================================
+#
+# - Veri dosyaları kompakt yazılır (indent / boşluk yok): daha küçük
+#   dosya, daha hızlı dump
+# - config.JSON_CODEC: "auto" (orjson varsa), "json" veya "orjson"
+# - İki codec'in çıktısı da geçerli UTF-8 JSON'dur; biriyle yazılan dosya
+#   diğeriyle okunabilir
+
+_JSON_CODECS = ("auto", "json", "orjson")
+
+if JSON_CODEC not in _JSON_CODECS:
+    raise ValueError(f"Unknown JSON codec: {JSON_CODEC}")
+if JSON_CODEC == "orjson" and orjson is None:
+    raise ImportError('JSON_CODEC = "orjson" but orjson is not installed')
+
+_USE_ORJSON = orjson is not None and JSON_CODEC != "json"
+
+
+def _encode(data: Any) -> bytes:
+    """
+    PRIVATE: Veriyi kompakt JSON byte'larına çevirir.
+    """
+    if _USE_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(payload: bytes) -> Any:
+    """
+    PRIVATE: JSON byte'larını parse eder.
+    """
+    if _USE_ORJSON:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+# =====================================================
+# BINARY SNAPSHOTS
+# =====================================================
+
+# <tablo>.snap: JSON / JSONL dosyasının marshal ile yazılmış kopyası.
+#
+# Header (magic'ten sonra):
+# - inode, kapsanan byte, mtime_ns: kaynak dosyanın imzası
+#   (JSONL log'da kapsanan byte = snapshot anındaki parse offset'i)
+# - tail_crc: log'da kapsanan bölümün son _SNAPSHOT_TAIL byte'ının CRC32'si
+#   (log yerinde büyüdüğü için mtime / size yerine bu kontrol edilir)
+# - payload CRC32 ve uzunluğu (yarım / bozuk yazım yakalanır)
+#
+# Snapshot bir hızlandırıcıdır, kaynak değildir: fsync edilmez, doğrulanamazsa
+# yok sayılır ve JSON parse edilir. Journal op'ları her zaman üzerine replay edilir.
+_SNAPSHOT_MAGIC = b"SBSNAP" + bytes((1, marshal.version))
+_SNAPSHOT_HEADER = struct.Struct("<QQqIIQ")
+_SNAPSHOT_TAIL = 4096
+
+
+def _snapshot_path(path: Path) -> Path:
+    """
+    PRIVATE: Tablonun ikili snapshot dosyası (cards.json -> cards.json.snap).
+    """
+    return path.with_name(path.name + ".snap")
+
+
+def _tail_crc(path: Path, covered: int) -> int:
+    """
+    PRIVATE: Dosyanın ilk `covered` byte'ının son parçasının CRC32'si.
+    """
+    start = max(0, covered - _SNAPSHOT_TAIL)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return zlib.crc32(f.read(covered - start))
+
+
+def _store_snapshot(
+    path: Path,
+    signature: Optional[tuple],
+    records: List[Dict],
+    covered: Optional[int] = None,
+) -> None:
+    """
+    PRIVATE: Kayıtların ikili kopyasını tablonun yanına yazar.
+
+    Args:
+        signature: Kayıtların okunduğu / yazıldığı kaynak dosyanın imzası
+        covered: JSONL log'da kayıtların kapsadığı byte (varsayılan: dosya boyu)
+
+    Not:
+    - SNAPSHOT_MIN_BYTES'tan küçük dosyalar için yazılmaz
+    - Yazılamazsa (disk dolu vb.) sessizce geçilir; sadece hız kaybıdır
+    """
+    if not BINARY_SNAPSHOTS or signature is None:
+        return
+    inode, size, mtime_ns = signature
+    covered = size if covered is None else covered
+    if covered < SNAPSHOT_MIN_BYTES:
+        return
+
+    log = _is_log(path)
+    payload = marshal.dumps(records)
+    header = _SNAPSHOT_HEADER.pack(
+        inode,
+        covered,
+        0 if log else mtime_ns,
+        _tail_crc(path, covered) if log else 0,
+        zlib.crc32(payload),
+        len(payload),
+    )
+
+    target = _snapshot_path(path)
+    tmp_path: Optional[Path] = None
+    try:
+        with tempfile.NamedTemporaryFile(mode="wb", dir=path.parent, delete=False) as tmp:
+            tmp_path = Path(tmp.name)
+            tmp.write(_SNAPSHOT_MAGIC + header + payload)
+        os.replace(str(tmp_path), str(target))
+    except OSError:
+        pass
+    finally:
+        if tmp_path and tmp_path.exists():
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+
+def _load_snapshot(path: Path, signature: tuple) -> Optional[Tuple[list, int]]:
+    """
+    PRIVATE: Kaynak dosyayla eşleşen ikili snapshot'ı okur.
+
+    Returns:
+        (kayıtlar, kapsanan byte) ya da snapshot yok / eski / bozuksa None
+    """
+    if not BINARY_SNAPSHOTS:
+        return None
+    try:
+        with open(_snapshot_path(path), "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+
+    start = len(_SNAPSHOT_MAGIC) + _SNAPSHOT_HEADER.size
+    if len(blob) < start or not blob.startswith(_SNAPSHOT_MAGIC):
+        return None
+    inode, covered, mtime_ns, tail_crc, crc, length = _SNAPSHOT_HEADER.unpack_from(
+        blob, len(_SNAPSHOT_MAGIC)
+    )
+
+    if inode != signature[0]:
+        return None
+    if _is_log(path):
+        if covered > signature[1] or _tail_crc(path, covered) != tail_crc:
+            return None
+    elif (covered, mtime_ns) != signature[1:]:
+        return None
+
+    payload = memoryview(blob)[start:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        return None
+    try:
+        started = time.perf_counter()
+        records = marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        return None
+    _observe("parse_seconds", path, time.perf_counter() - started)
+    _count("disk_reads", path)
+    _count("bytes_read", path, len(blob))
+    return records, covered
+
 # =====================================================
 # CORE FILE HELPERS
 # =====================================================
 
-def atomic_write(path: Path, data: Any) -> None:
+def _dumps(data: Any, log: bool = False, pretty: bool = False) -> bytes:
     """
-    Dosyayı atomik olarak yazar (yarım yazılma riskini önler).
+    PRIVATE: Veriyi dosyaya yazılacak byte'lara çevirir.
+    - log=True ise liste, satır başına bir kayıt (JSONL) olarak yazılır
+    - pretty=True ise insan okuyabilir (indent=2) JSON üretilir
+    """
+    if log:
+        return b"".join(_encode(record) + b"\n" for record in data)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return _encode(data)
 
-    Yaklaşım:
-    1) Aynı dizinde geçici dosyaya yaz
-    2) flush + fsync (disk'e güvenli yazım)
-    3) os.replace ile tek hamlede hedef dosya ile değiştir (atomic)
 
-    Not:
-    - tmp dosya aynı dizinde olduğu için aynı filesystem üzerinde kalır
-      ve os.replace atomic davranır.
+def _serialize(path: Path, data: Any, log: bool = False, pretty: bool = False) -> bytes:
+    """
+    PRIVATE: _dumps + tablo bazında serialize süresi metriği.
+    """
+    started = time.perf_counter()
+    payload = _dumps(data, log=log, pretty=pretty)
+    _observe("serialize_seconds", path, time.perf_counter() - started)
+    return payload
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """
+    PRIVATE: Byte içeriği atomik olarak yazar (tmp + fsync + os.replace).
+    ("none" politikasında fsync atlanır.)
     """
     path.parent.mkdir(parents=True, exist_ok=True)
 
     tmp_path: Optional[Path] = None
     try:
         with tempfile.NamedTemporaryFile(
-            mode="w",
+            mode="wb",
             dir=path.parent,
             delete=False,
-            encoding="utf-8",
-            newline="\n",
         ) as tmp:
-            json.dump(data, tmp, indent=2, ensure_ascii=False)
-            tmp.flush()
-            os.fsync(tmp.fileno())
             tmp_path = Path(tmp.name)
+            tmp.write(payload)
+            tmp.flush()
+            _sync_fd(tmp.fileno(), path, deferrable=False)
 
         # Windows dahil güvenli replace (atomic)
+        started = time.perf_counter()
         os.replace(str(tmp_path), str(path))
+        _observe("replace_seconds", path, time.perf_counter() - started)
+        _count("writes", path)
+        _count("bytes_written", path, len(payload))
 
     finally:
         # Replace başarısız olursa tmp dosya kalabilir, temizle
@@ -79,43 +1712,476 @@ def atomic_write(path: Path, data: Any) -> None:
                 pass
 
 
+def _append_bytes(path: Path, payload: bytes, truncate_to: Optional[int] = None) -> None:
+    """
+    PRIVATE: Dosyanın sonuna ekler (tek write + tek fsync).
+    truncate_to verilirse önce o boyuta kesilir (yarım kalmış son satır).
+    fsync, durability politikasına göre yapılır / ertelenir / atlanır.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        if truncate_to is not None:
+            os.ftruncate(fd, truncate_to)
+        os.write(fd, payload)
+        _count("appends", path)
+        _count("bytes_written", path, len(payload))
+        _sync_fd(fd, path, deferrable=True)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: Path, data: Any, pretty: bool = False) -> None:
+    """
+    Dosyayı atomik olarak yazar (yarım yazılma riskini önler).
+
+    Yaklaşım:
+    1) Aynı dizinde geçici dosyaya yaz
+    2) flush + fsync (disk'e güvenli yazım)
+    3) os.replace ile tek hamlede hedef dosya ile değiştir (atomic)
+
+    Not:
+    - tmp dosya aynı dizinde olduğu için aynı filesystem üzerinde kalır
+      ve os.replace atomic davranır.
+    - .jsonl hedeflerde liste, satır başına bir kayıt olarak yazılır.
+    - Varsayılan çıktı kompakt JSON'dur; pretty=True okunabilir (indent=2)
+      çıktı üretir (backup / debug export'ları için).
+    """
+    _atomic_write_bytes(path, _serialize(path, data, log=_is_log(path), pretty=pretty))
+    # Cache'teki eski hali geçersiz (write_json write-through ile tazeler)
+    _CACHE.pop(path, None)
+
+
 def read_json(path: Path) -> list:
     """
     JSON dosyasını okur. Dosya yoksa boş liste döndürür.
+
+    Cache:
+    - Parse edilen tablo path bazında memory'de tutulur
+    - Dosyanın (inode, size, mtime) imzası değişmediyse tekrar parse edilmez
+    - Başka bir process dosyayı değiştirirse imza değişir ve yeniden okunur
+
+    Not:
+    - Dönen liste kopyadır (append/filter güvenli), kayıt dict'leri ise
+      cache ile paylaşılır. Kayıtları yerinde değiştirmeyin; update_*
+      fonksiyonları copy-on-write ile yeni dict üretir.
     """
-    if not path.exists():
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return list(_load_entry(path).rows.values())
 
 
+@_write_op
 def write_json(path: Path, data: list) -> None:
     """
-    JSON dosyasını atomik şekilde yazar.
+    Tabloyu bütünüyle atomik şekilde yazar.
+    Yazım başarılıysa cache de güncellenir (write-through).
+
+    Not:
+    - Journal'da bekleyen değişiklikler önce snapshot'lara katlanır;
+      aksi halde eski op'lar yeni içeriğin üzerine replay edilirdi.
+    - Write-back buffer'ı varsa önce o yazılır.
     """
+    flush()
+    compact_journal(path.parent)
+
+    data = list(data)
     atomic_write(path, data)
+    _sync_counter(path, data)
+    _load_entry(path)
+
+
+def _commit(path: Path, entry: _CacheEntry, changes: List[Change]) -> None:
+    """
+    PRIVATE: Tablodaki değişiklikleri kalıcı hale getirir ve cache'i günceller.
+
+    - JSON tablolar: değişiklikler journal'a tek satır olarak eklenir
+      (JOURNAL_ENABLED kapalıysa tablo bütünüyle yeniden yazılır)
+    - JSONL log'lar: log atomic olarak yeniden yazılır (silme gibi nadir işlemler)
+    - index'ler baştan kurulmaz; sadece değişen kayıtlar işlenir
+    - Açık transaction varsa yazım transaction sonuna ertelenir
+    """
+    if not changes:
+        return
+
+    with transaction():
+        _TX.stage(path, entry, changes)
+
+
+def _rewrite(path: Path, entry: _CacheEntry) -> None:
+    """
+    PRIVATE: Tabloyu cache'teki güncel haliyle bütünüyle atomic yazar.
+    Journal'da bekleyen op'lar önce katlanır (yeni içeriğe replay edilmesinler).
+    """
+    compact_journal(path.parent)
+    _write_entry(path, entry)
+
+
+def _write_entry(path: Path, entry: _CacheEntry) -> None:
+    """
+    PRIVATE: Entry'nin kayıtlarını dosyaya atomic yazar, imza / offset /
+    ikili snapshot'ı günceller.
+    """
+    records = list(entry.rows.values())
+    _atomic_write_bytes(path, _serialize(path, records, log=_is_log(path)))
+    entry.signature = _file_signature(path)
+    entry.offset = entry.signature[1]
+    _store_snapshot(path, entry.signature, records)
+
+
+def append_jsonl(path: Path, records: List[Dict]) -> None:
+    """
+    Kayıtları JSONL log'un sonuna ekler (tek write + tek fsync).
+
+    - Dosyanın tamamı yeniden yazılmaz; maliyet eklenen kayıt kadardır
+    - Crash'ten kalan yarım son satır varsa önce kesilir
+    - Cache'teki tablo da aynı kayıtlarla genişletilir (write-through)
+    - Açık transaction varsa append transaction sonuna ertelenir
+    """
+    entry = _load_entry(path)
+    with transaction():
+        _TX.stage_append(path, entry, records)
+
+
+def _append_log(path: Path, entry: _CacheEntry, records: List[Dict]) -> None:
+    """
+    PRIVATE: Kayıtları (cache'e zaten uygulanmış) log dosyasına ekler.
+    """
+    payload = _serialize(path, records, log=True)
+
+    torn = entry.signature is not None and entry.signature[1] != entry.offset
+    _append_bytes(path, payload, truncate_to=entry.offset if torn else None)
+
+    entry.offset += len(payload)
+    entry.signature = _file_signature(path)
 
 
-def get_next_id(items: list) -> int:
+def iter_jsonl(path: Path) -> Iterator[Dict]:
+    """
+    JSONL log'u satır satır okur (tüm listeyi memory'ye almadan).
+    Yarım kalmış son satır yok sayılır.
+    """
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            if line.strip():
+                yield _decode(line)
+
+
+def get_next_id(items: Iterable[Dict]) -> int:
     """
     Liste içindeki max id + 1 üretir.
     Liste boşsa 1 döndürür.
+
+    Not:
+    - create_* fonksiyonları bunun yerine counters.json sayaçlarını
+      kullanır (her insert'te tüm listeyi taramamak için).
     """
-    if not items:
-        return 1
-    return max(item["id"] for item in items) + 1
+    return max((item["id"] for item in items), default=0) + 1
 
 
+@_write_op
 def initialize_storage() -> None:
     """
     data/ klasörünü ve boş JSON dosyalarını oluşturur.
+    Eski reviews.json varsa tek seferlik olarak reviews.jsonl'e taşınır.
+
+    Not:
+    - Shard düzeninde sadece users.json oluşturulur; kullanıcı shard'ları
+      ilk yazımda oluşur.
     """
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    for file in [USERS_FILE, DECKS_FILE, CARDS_FILE, SRS_STATE_FILE, REVIEWS_FILE]:
+    migrate_reviews_to_log()
+
+    files = [USERS_FILE]
+    if not SHARDED_STORAGE:
+        files += [DECKS_FILE, CARDS_FILE, SRS_STATE_FILE, REVIEWS_LOG_FILE]
+
+    for file in files:
         if not file.exists():
             write_json(file, [])
 
+
+@_write_op
+def migrate_reviews_to_log() -> bool:
+    """
+    Eski reviews.json (tek JSON liste) dosyasını reviews.jsonl log'una taşır.
+
+    Akış:
+    1) Log zaten varsa hiçbir şey yapılmaz (migration bir kez çalışır)
+    2) Liste, log'a atomic olarak yazılır
+    3) Eski dosya reviews.json.migrated olarak saklanır (silinmez)
+
+    Returns:
+        bool: migration yapıldıysa True
+    """
+    if REVIEWS_LOG_FILE.exists() or not REVIEWS_FILE.exists():
+        return False
+
+    with open(REVIEWS_FILE, "rb") as f:
+        reviews = _decode(f.read())
+
+    write_json(REVIEWS_LOG_FILE, reviews)
+    os.replace(REVIEWS_FILE, REVIEWS_FILE.with_name(REVIEWS_FILE.name + ".migrated"))
+    return True
+
+# =====================================================
+# SHARDING (PER-USER LAYOUT)
+# =====================================================
+#
+# config.SHARDED_STORAGE = True iken:
+# - users.json global kalır
+# - deck / card / SRS state / review kayıtları sahibinin shard'ında tutulur:
+#   data/users/<user_id>/decks.json, cards.json, srs_state.json, reviews.jsonl
+#   (her shard'ın kendi journal'ı ve cache entry'leri vardır)
+# - Sadece id ile gelen çağrılar için (get_card_by_id, update_srs_state ...)
+#   data/routes/ altında id -> user_id route tabloları tutulur
+#   (decks.json, cards.json, srs_state.json)
+# - Kartın sahibi deck'inin sahibidir; SRS state ve review'lar kayıttaki
+#   user_id'nin shard'ına yazılır (review'ı sadece kart sahibi yapabilir)
+#
+# Sharding kapalıyken tüm router fonksiyonları global dosyaları döndürür.
+
+# id ile erişilen (route tablosu tutulan) tablolar
+_ROUTED = (DECKS_FILE, CARDS_FILE, SRS_STATE_FILE)
+
+
+def _shard_path(base: Path, user_id: int) -> Path:
+    """
+    PRIVATE: Tablonun user_id'ye ait shard dosyası.
+    """
+    return SHARDS_DIR / str(user_id) / base.name
+
+
+def _user_file(base: Path, user_id: int) -> Path:
+    """
+    PRIVATE: user_id'nin kayıtlarının bulunduğu dosya
+    (sharding kapalıysa global dosya).
+    """
+    if not SHARDED_STORAGE:
+        return base
+    return _shard_path(base, user_id)
+
+
+def _route_owner(route_base: Path, record_id: int) -> Optional[int]:
+    """
+    PRIVATE: Route tablosundan kaydın sahibini (user_id) bulur.
+    """
+    route = _load_entry(ROUTES_DIR / route_base.name).rows.get(record_id)
+    return None if route is None else route["user_id"]
+
+
+def _shard_of(base: Path, route_base: Path, record_id: int) -> Optional[Path]:
+    """
+    PRIVATE: route_base tablosundaki record_id'nin sahibinin, base tablosu
+    için dosyası. Örn. _shard_of(CARDS_FILE, DECKS_FILE, deck_id) ->
+    deck'in kartlarının bulunduğu dosya.
+
+    Route yoksa (kayıt yok) None döndürür.
+    """
+    if not SHARDED_STORAGE:
+        return base
+    owner = _route_owner(route_base, record_id)
+    return None if owner is None else _shard_path(base, owner)
+
+
+def _commit_route(base: Path, record_id: int, user_id: Optional[int]) -> None:
+    """
+    PRIVATE: Route ekler (user_id verilirse) veya siler (None).
+    Sharding kapalıyken hiçbir şey yapmaz.
+    """
+    if not SHARDED_STORAGE:
+        return
+    path = ROUTES_DIR / base.name
+    entry = _load_entry(path)
+    old = entry.rows.get(record_id)
+    new = None if user_id is None else {"id": record_id, "user_id": user_id}
+    if old is not None or new is not None:
+        _commit(path, entry, [(old, new)])
+
+
+def _drop_routes(base: Path, record_ids: List[int]) -> None:
+    """
+    PRIVATE: Birden fazla route'u tek commit'te siler.
+    Sharding kapalıyken hiçbir şey yapmaz.
+    """
+    if not SHARDED_STORAGE:
+        return
+    path = ROUTES_DIR / base.name
+    entry = _load_entry(path)
+    routes = [entry.rows[i] for i in record_ids if i in entry.rows]
+    _commit(path, entry, [(route, None) for route in routes])
+
+
+def _table_files(base: Path) -> List[Path]:
+    """
+    PRIVATE: Tablonun tüm dosyaları (global dosya veya user id sırasıyla shard'lar).
+    """
+    if not SHARDED_STORAGE:
+        return [base]
+    if not SHARDS_DIR.exists():
+        return []
+    shards = sorted(
+        (d for d in SHARDS_DIR.iterdir() if d.is_dir() and d.name.isdigit()),
+        key=lambda d: int(d.name),
+    )
+    return [d / base.name for d in shards]
+
+
+def _load_table(base: Path) -> List[Dict]:
+    """
+    PRIVATE: Tablonun tüm kayıtları (shard'lar birleştirilir).
+    """
+    return [record for path in _table_files(base) for record in read_json(path)]
+
+
+def _save_table(base: Path, records: list, owner_of) -> None:
+    """
+    PRIVATE: Tabloyu bütünüyle yazar (save_*).
+    Shard düzeninde kayıtlar sahiplerine göre dağıtılır, kaydı kalmayan
+    shard'lar boşaltılır ve route tablosu yeniden yazılır.
+    """
+    if not SHARDED_STORAGE:
+        write_json(base, records)
+        return
+
+    groups: Dict[int, List[Dict]] = {}
+    for record in records:
+        owner = owner_of(record)
+        if owner is None:
+            raise ValueError(f"Owner not found for {base.stem} record {record['id']}")
+        groups.setdefault(owner, []).append(record)
+
+    for path in _table_files(base):
+        if int(path.parent.name) not in groups and path.exists():
+            write_json(path, [])
+    for user_id, rows in groups.items():
+        write_json(_shard_path(base, user_id), rows)
+
+    if base in _ROUTED:
+        write_json(ROUTES_DIR / base.name, [
+            {"id": record["id"], "user_id": user_id}
+            for user_id, rows in groups.items()
+            for record in rows
+        ])
+
+
+@_write_op
+def migrate_to_shards() -> Dict[str, int]:
+    """
+    Global (tek dosyalı) düzeni per-user shard düzenine taşır.
+
+    Akış:
+    1) Bekleyen journal global snapshot'lara katlanır
+    2) Kayıtlar sahiplerine göre data/users/<id>/ altına, route'lar
+       data/routes/ altına yazılır (id'ler korunur)
+    3) Global dosyalar <ad>.migrated olarak saklanır (silinmez)
+
+    Sonrasında config.SHARDED_STORAGE = True yapılmalıdır.
+    Deck'i olmayan (orphan) kartlar taşınmaz; .migrated dosyasında kalır.
+
+    Returns:
+        dict: tablo adı -> taşınan kayıt sayısı (global düzen yoksa boş)
+    """
+    sources = (DECKS_FILE, CARDS_FILE, SRS_STATE_FILE, REVIEWS_LOG_FILE)
+
+    migrate_reviews_to_log()
+    if not any(path.exists() for path in sources):
+        return {}
+    compact_journal(DATA_DIR)
+
+    deck_owner = {deck["id"]: deck["user_id"] for deck in read_json(DECKS_FILE)}
+    owners = {
+        DECKS_FILE: lambda r: r["user_id"],
+        CARDS_FILE: lambda r: deck_owner.get(r["deck_id"]),
+        SRS_STATE_FILE: lambda r: r["user_id"],
+        REVIEWS_LOG_FILE: lambda r: r["user_id"],
+    }
+
+    counts: Dict[str, int] = {}
+    for base in sources:
+        groups: Dict[int, List[Dict]] = {}
+        for record in read_json(base):
+            owner = owners[base](record)
+            if owner is not None:
+                groups.setdefault(owner, []).append(record)
+
+        for user_id, rows in groups.items():
+            write_json(_shard_path(base, user_id), rows)
+        if base in _ROUTED:
+            write_json(ROUTES_DIR / base.name, [
+                {"id": record["id"], "user_id": user_id}
+                for user_id, rows in groups.items()
+                for record in rows
+            ])
+        counts[base.stem] = sum(len(rows) for rows in groups.values())
+
+    for base in sources:
+        if base.exists():
+            os.replace(base, base.with_name(base.name + ".migrated"))
+    return counts
+
+# =====================================================
+# RECORD VERSIONS (OPTIMISTIC CONCURRENCY)
+# =====================================================
+#
+# Deck / card / SRS state kayıtları "version" taşır (oluşturulunca 1,
+# her update'te +1). update_card / update_srs_state'e okunan kaydın
+# version'ı verilirse güncelleme sadece kayıt o arada değişmediyse yapılır:
+# aynı kartı güncelleyen iki oturumdan geç kalanı hemen hata alır.
+#
+# ❗ NOT:
+# Version, oturumun okuma + hesaplama adımlarını lock dışına taşır
+# (lost update yine olmaz). Yazımın kendisi (update_* dahil) hâlâ global
+# exclusive dosya lock'u altındadır: farklı kartları yazan process'ler de
+# kısa yazım süresince sırayla ilerler (journal append'i ve id sayaçları
+# tek dosya olduğu için).
+
+def _next_version(record: Dict, expected_version: Optional[int]) -> int:
+    """
+    PRIVATE: Version kontrolü yapar ve kaydın bir sonraki version'ını döndürür.
+    version alanı olmayan (eski) kayıtlar version 0 sayılır.
+    """
+    current = record.get("version", 0)
+    if expected_version is not None and expected_version != current:
+        raise RuntimeError("Version conflict")
+    return current + 1
+
+# =====================================================
+# PAGINATION
+# =====================================================
+
+def _page(
+    entry: _CacheEntry,
+    field: str,
+    value: int,
+    limit: int,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Dict]:
+    """
+    PRIVATE: field = value kayıtlarından (id sırasıyla) tek sayfa keser.
+    SORTED index'te cursor'a bisect ile atlanır; sadece sayfadaki kayıtlar
+    okunur (O(log n + limit), grup kopyalanmaz / taranmaz).
+
+    Args:
+        limit: Sayfadaki en fazla kayıt
+        offset: Atlanacak kayıt sayısı
+        after_id: Cursor; verilirse sadece id'si bundan büyük kayıtlar
+                  (önceki sayfanın son id'si verilir; araya eklenen /
+                  silinen kayıtlar sayfaları kaydırmaz)
+    """
+    if limit < 0 or offset < 0:
+        raise ValueError("limit and offset must be non-negative")
+
+    ids = _index(entry, _SORTED, field).get(value, [])
+    start = offset
+    if after_id is not None:
+        start += bisect.bisect_right(ids, after_id)
+    return [entry.rows[record_id] for record_id in ids[start:start + limit]]
+
 # =====================================================
 # USERS
 # =====================================================
@@ -129,13 +2195,14 @@ def save_users(users: list) -> None:
 
 
 def get_user_by_email(email: str) -> Optional[Dict]:
-    return next((u for u in load_users() if u["email"] == email), None)
+    return _index(_load_entry(USERS_FILE), _UNIQUE, "email").get(email)
 
 
 def get_user_by_id(user_id: int) -> Optional[Dict]:
-    return next((u for u in load_users() if u["id"] == user_id), None)
+    return _load_entry(USERS_FILE).rows.get(user_id)
 
 
+@_write_op
 def create_user(data: Dict) -> Dict:
     """
     Yeni user kaydı oluşturur.
@@ -144,13 +2211,13 @@ def create_user(data: Dict) -> Dict:
     - email, name
     - password_hash, password_salt
     """
-    users = load_users()
+    entry = _load_entry(USERS_FILE)
 
-    if get_user_by_email(data["email"]):
+    if _index(entry, _UNIQUE, "email").get(data["email"]):
         raise ValueError("Email already registered")
 
     user = {
-        "id": get_next_id(users),
+        "id": _allocate_id(USERS_FILE),
         "email": data["email"],
         "password_hash": data["password_hash"],
         "password_salt": data["password_salt"],
@@ -158,8 +2225,7 @@ def create_user(data: Dict) -> Dict:
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
-    users.append(user)
-    save_users(users)
+    _commit(USERS_FILE, entry, [(None, user)])
     return user
 
 # =====================================================
@@ -167,13 +2233,14 @@ def create_user(data: Dict) -> Dict:
 # =====================================================
 
 def load_decks() -> List[Dict]:
-    return read_json(DECKS_FILE)
+    return _load_table(DECKS_FILE)
 
 
 def save_decks(decks: list) -> None:
-    write_json(DECKS_FILE, decks)
+    _save_table(DECKS_FILE, decks, lambda d: d["user_id"])
 
 
+@_write_op
 def create_deck(data: Dict) -> Dict:
     """
     Yeni deck oluşturur.
@@ -181,48 +2248,73 @@ def create_deck(data: Dict) -> Dict:
     - name
     - user_id
     """
-    decks = load_decks()
+    path = _user_file(DECKS_FILE, data["user_id"])
+    entry = _load_entry(path)
 
     deck = {
-        "id": get_next_id(decks),
+        "id": _allocate_id(DECKS_FILE),
         "name": data["name"],
         "user_id": data["user_id"],
+        "version": 1,
     }
 
-    decks.append(deck)
-    save_decks(decks)
+    with transaction():
+        _commit(path, entry, [(None, deck)])
+        _commit_route(DECKS_FILE, deck["id"], deck["user_id"])
     return deck
 
 
 def get_decks_by_user(user_id: int) -> List[Dict]:
-    return [d for d in load_decks() if d["user_id"] == user_id]
+    entry = _load_entry(_user_file(DECKS_FILE, user_id))
+    group = _index(entry, _GROUP, "user_id").get(user_id, {})
+    return list(group.values())
+
+
+def get_decks_by_user_page(
+    user_id: int,
+    limit: int,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Kullanıcının deck'lerinden tek bir sayfa döndürür (bkz. _page).
+    """
+    return _page(_load_entry(_user_file(DECKS_FILE, user_id)), "user_id", user_id, limit, offset, after_id)
 
 
 def get_deck_by_id(deck_id: int) -> Optional[Dict]:
-    return next((d for d in load_decks() if d["id"] == deck_id), None)
+    path = _shard_of(DECKS_FILE, DECKS_FILE, deck_id)
+    if path is None:
+        return None
+    return _load_entry(path).rows.get(deck_id)
 
 
+@_write_op
 def delete_deck(deck_id: int) -> bool:
     """
     Deck siler.
 
     Cascade:
     - Deck'e bağlı kartlar da silinir
-    - Kart silme işlemi delete_card() üzerinden yapıldığı için
+    - Kartlar delete_cards() ile tek seferde silindiği için
       SRS state ve review kayıtları da temizlenir.
+    - Tüm cascade tek transaction'da commit edilir.
     """
-    decks = load_decks()
-    new_decks = [d for d in decks if d["id"] != deck_id]
-
-    if len(decks) == len(new_decks):
+    path = _shard_of(DECKS_FILE, DECKS_FILE, deck_id)
+    if path is None:
+        return False
+    entry = _load_entry(path)
+    deck = entry.rows.get(deck_id)
+    if deck is None:
         return False
 
-    save_decks(new_decks)
+    with transaction():
+        # Deck'e bağlı tüm kartları cascade ile sil
+        # (route silinmeden önce: kartlar deck route'u üzerinden bulunur)
+        delete_cards([c["id"] for c in get_cards_by_deck(deck_id)])
 
-    # Deck'e bağlı tüm kartları cascade ile sil
-    cards = get_cards_by_deck(deck_id)
-    for c in cards:
-        delete_card(c["id"])
+        _commit(path, entry, [(deck, None)])
+        _commit_route(DECKS_FILE, deck_id, None)
 
     return True
 
@@ -231,57 +2323,120 @@ def delete_deck(deck_id: int) -> bool:
 # =====================================================
 
 def load_cards() -> List[Dict]:
-    return read_json(CARDS_FILE)
+    return _load_table(CARDS_FILE)
 
 
 def save_cards(cards: list) -> None:
-    write_json(CARDS_FILE, cards)
+    _save_table(CARDS_FILE, cards, lambda c: _route_owner(DECKS_FILE, c["deck_id"]))
 
 
 def get_card_by_id(card_id: int) -> Optional[Dict]:
-    return next((c for c in load_cards() if c["id"] == card_id), None)
+    path = _shard_of(CARDS_FILE, CARDS_FILE, card_id)
+    if path is None:
+        return None
+    return _load_entry(path).rows.get(card_id)
 
 
 def get_cards_by_deck(deck_id: int) -> List[Dict]:
-    return [c for c in load_cards() if c["deck_id"] == deck_id]
+    path = _shard_of(CARDS_FILE, DECKS_FILE, deck_id)
+    if path is None:
+        return []
+    group = _index(_load_entry(path), _GROUP, "deck_id").get(deck_id, {})
+    return list(group.values())
+
+
+def get_cards_by_decks(deck_ids: Iterable[int]) -> List[Dict]:
+    """
+    Birden fazla deck'in kartlarını döndürür.
+    Kart tablosu (shard) bir kez yüklenir; deck başına sadece index lookup yapılır.
+    """
+    by_path: Dict[Path, List[int]] = {}
+    for deck_id in dict.fromkeys(deck_ids):
+        path = _shard_of(CARDS_FILE, DECKS_FILE, deck_id)
+        if path is not None:
+            by_path.setdefault(path, []).append(deck_id)
+
+    cards: List[Dict] = []
+    for path, ids in by_path.items():
+        groups = _index(_load_entry(path), _GROUP, "deck_id")
+        for deck_id in ids:
+            cards.extend(groups.get(deck_id, {}).values())
+    return cards
+
+
+def get_cards_by_deck_page(
+    deck_id: int,
+    limit: int,
+    offset: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Deck'in kartlarından tek bir sayfa döndürür (bkz. _page).
+    """
+    path = _shard_of(CARDS_FILE, DECKS_FILE, deck_id)
+    if path is None:
+        return []
+    return _page(_load_entry(path), "deck_id", deck_id, limit, offset, after_id)
 
 
+@_write_op
 def create_card(data: Dict) -> Dict:
     """
     Yeni card oluşturur.
     Beklenen alanlar:
     - deck_id
     - front, back
+
+    Shard düzeninde kart deck'in sahibinin shard'ına yazılır;
+    deck bulunamazsa ValueError fırlatır.
     """
-    cards = load_cards()
+    path = _shard_of(CARDS_FILE, DECKS_FILE, data["deck_id"])
+    if path is None:
+        raise ValueError("Deck not found")
+    entry = _load_entry(path)
 
     card = {
-        "id": get_next_id(cards),
+        "id": _allocate_id(CARDS_FILE),
         "deck_id": data["deck_id"],
         "front": data["front"],
         "back": data["back"],
         "created_at": datetime.now(timezone.utc).isoformat(),
+        "version": 1,
     }
 
-    cards.append(card)
-    save_cards(cards)
+    with transaction():
+        _commit(path, entry, [(None, card)])
+        if SHARDED_STORAGE:
+            _commit_route(CARDS_FILE, card["id"], _route_owner(DECKS_FILE, card["deck_id"]))
     return card
 
 
-def update_card(card_id: int, updates: Dict) -> Optional[Dict]:
+@_write_op
+def update_card(
+    card_id: int,
+    updates: Dict,
+    expected_version: Optional[int] = None,
+) -> Optional[Dict]:
     """
     Kartı günceller, güncellenen kartı döndürür.
     Bulunamazsa None döndürür.
+
+    expected_version verilirse kart hâlâ o version'daysa güncellenir,
+    değilse RuntimeError("Version conflict") fırlatılır.
     """
-    cards = load_cards()
+    path = _shard_of(CARDS_FILE, CARDS_FILE, card_id)
+    if path is None:
+        return None
+    entry = _load_entry(path)
 
-    for c in cards:
-        if c["id"] == card_id:
-            c.update(updates)
-            save_cards(cards)
-            return c
+    card = entry.rows.get(card_id)
+    if card is None:
+        return None
 
-    return None
+    # Copy-on-write: cache'ten dönen eski dict'ler değişmesin
+    updated = {**card, **updates, "version": _next_version(card, expected_version)}
+    _commit(path, entry, [(card, updated)])
+    return updated
 
 
 def delete_card(card_id: int) -> bool:
@@ -291,37 +2446,70 @@ def delete_card(card_id: int) -> bool:
     Cascade:
     - Karta bağlı SRS state silinir
     - Karta bağlı review kayıtları silinir
+    - Kart ve cascade silmeleri tek transaction'da commit edilir
     """
-    cards = load_cards()
-    new_cards = [c for c in cards if c["id"] != card_id]
+    return delete_cards([card_id]) == 1
 
-    if len(cards) == len(new_cards):
-        return False
 
-    save_cards(new_cards)
+@_write_op
+def delete_cards(card_ids: Iterable[int]) -> int:
+    """
+    Birden fazla kartı set tabanlı cascade ile siler.
 
-    # Cascade temizliği
-    _delete_srs_state_by_card_id(card_id)
-    _delete_reviews_by_card_id(card_id)
+    - Silinecek kartlar bir kez bulunur ve dosyalarına (shard) göre gruplanır
+    - cards / srs_state / reviews dosyalarının her biri için TEK değişiklik
+      listesi commit edilir (kart başına ayrı yükleme / yazım yok)
+    - Hepsi tek transaction'da commit edilir: review silmeleri dahil tek
+      journal satırı (review log compaction'da yeniden yazılır)
 
-    return True
+    Returns:
+        int: Silinen kart sayısı (bulunamayan id'ler yok sayılır)
+    """
+    groups: Dict[Path, List[Dict]] = {}
+    for card_id in dict.fromkeys(card_ids):
+        path = _shard_of(CARDS_FILE, CARDS_FILE, card_id)
+        card = _load_entry(path).rows.get(card_id) if path is not None else None
+        if card is not None:
+            groups.setdefault(path, []).append(card)
+
+    if not groups:
+        return 0
+
+    with transaction():
+        for path, cards in groups.items():
+            ids = {card["id"] for card in cards}
+
+            # Cascade (route'lar silinmeden önce: shard kart route'u ile bulunur)
+            first = cards[0]["id"]
+            states = _delete_by_card_ids(_shard_of(SRS_STATE_FILE, CARDS_FILE, first), ids)
+            _drop_routes(SRS_STATE_FILE, [state["id"] for state in states])
+            _delete_by_card_ids(_shard_of(REVIEWS_LOG_FILE, CARDS_FILE, first), ids)
+
+            _commit(path, _load_entry(path), [(card, None) for card in cards])
+            _drop_routes(CARDS_FILE, list(ids))
+
+    return sum(len(cards) for cards in groups.values())
 
 # =====================================================
 # SRS STATE
 # =====================================================
 
 def load_srs_states() -> List[Dict]:
-    return read_json(SRS_STATE_FILE)
+    return _load_table(SRS_STATE_FILE)
 
 
 def save_srs_states(states: list) -> None:
-    write_json(SRS_STATE_FILE, states)
+    _save_table(SRS_STATE_FILE, states, lambda s: s["user_id"])
 
 
 def get_srs_state_by_card(card_id: int) -> Optional[Dict]:
-    return next((s for s in load_srs_states() if s["card_id"] == card_id), None)
+    path = _shard_of(SRS_STATE_FILE, CARDS_FILE, card_id)
+    if path is None:
+        return None
+    return _first(_index(_load_entry(path), _GROUP, "card_id").get(card_id))
 
 
+@_write_op
 def create_srs_state(data: Dict) -> Dict:
     """
     Yeni SRS state oluşturur.
@@ -333,10 +2521,11 @@ def create_srs_state(data: Dict) -> Dict:
     - easiness_factor
     - due_date (ISO str)
     """
-    states = load_srs_states()
+    path = _user_file(SRS_STATE_FILE, data["user_id"])
+    entry = _load_entry(path)
 
     state = {
-        "id": get_next_id(states),
+        "id": _allocate_id(SRS_STATE_FILE),
         "user_id": data["user_id"],
         "card_id": data["card_id"],
         "repetition": data["repetition"],
@@ -344,51 +2533,94 @@ def create_srs_state(data: Dict) -> Dict:
         "easiness_factor": data["easiness_factor"],
         "due_date": data["due_date"],
         "created_at": datetime.now(timezone.utc).isoformat(),
+        "version": 1,
     }
 
-    states.append(state)
-    save_srs_states(states)
+    with transaction():
+        _commit(path, entry, [(None, state)])
+        _commit_route(SRS_STATE_FILE, state["id"], state["user_id"])
     return state
 
 
-def update_srs_state(state_id: int, new_data: Dict) -> None:
+@_write_op
+def update_srs_state(
+    state_id: int,
+    new_data: Dict,
+    expected_version: Optional[int] = None,
+) -> None:
     """
     Mevcut SRS state'i günceller.
     Bulunamazsa ValueError fırlatır.
+
+    expected_version verilirse state hâlâ o version'daysa güncellenir,
+    değilse RuntimeError("Version conflict") fırlatılır.
     """
-    states = load_srs_states()
+    path = _shard_of(SRS_STATE_FILE, SRS_STATE_FILE, state_id)
+    entry = _load_entry(path) if path is not None else None
+
+    state = entry.rows.get(state_id) if entry is not None else None
+    if state is None:
+        raise ValueError("SRS state not found")
+
+    # Copy-on-write: cache'ten dönen eski dict'ler değişmesin
+    updated = {
+        **state,
+        **new_data,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "version": _next_version(state, expected_version),
+    }
+    _commit(path, entry, [(state, updated)])
 
-    for s in states:
-        if s["id"] == state_id:
-            s.update(new_data)
-            s["updated_at"] = datetime.now(timezone.utc).isoformat()
-            save_srs_states(states)
-            return
 
-    raise ValueError("SRS state not found")
+def get_due_card_ids(user_id: int, today: date) -> set:
+    """
+    Kullanıcının due_date'i today veya öncesi olan kartlarının id'leri.
+    (Due heap index'i üzerinden; sadece due olan state'ler gezilir.)
+    """
+    entry = _load_entry(_user_file(SRS_STATE_FILE, user_id))
+    return _index(entry, _DUE, "due_date").card_ids(user_id, today.toordinal())
+
+
+def get_scheduled_card_ids(user_id: int) -> set:
+    """
+    Kullanıcının SRS state'i olan (en az bir kez çalışılmış) kart id'leri.
+    """
+    entry = _load_entry(_user_file(SRS_STATE_FILE, user_id))
+    states = _index(entry, _GROUP, "user_id").get(user_id, {})
+    return {state["card_id"] for state in states.values()}
 
 
-def _delete_srs_state_by_card_id(card_id: int) -> None:
+def _delete_by_card_ids(path: Path, card_ids: set) -> List[Dict]:
     """
-    PRIVATE: Kart silme sırasında SRS state cascade temizliği.
+    PRIVATE: Kart silme cascade'i: tablodaki card_id'si verilen kümede olan
+    tüm kayıtları tek commit'te siler (SRS state, review).
+
+    Returns:
+        list: Silinen kayıtlar
     """
-    states = load_srs_states()
-    new_states = [s for s in states if s["card_id"] != card_id]
-    if len(new_states) != len(states):
-        save_srs_states(new_states)
+    entry = _load_entry(path)
+    index = _index(entry, _GROUP, "card_id")
+    doomed = [
+        record
+        for card_id in card_ids
+        for record in index.get(card_id, {}).values()
+    ]
+    _commit(path, entry, [(record, None) for record in doomed])
+    return doomed
 
 # =====================================================
 # REVIEWS
 # =====================================================
 
 def load_reviews() -> List[Dict]:
-    return read_json(REVIEWS_FILE)
+    return _load_table(REVIEWS_LOG_FILE)
 
 
 def save_reviews(reviews: list) -> None:
-    write_json(REVIEWS_FILE, reviews)
+    _save_table(REVIEWS_LOG_FILE, reviews, lambda r: r["user_id"])
 
 
+@_write_op
 def create_review(data: Dict) -> Dict:
     """
     Yeni review kaydı oluşturur.
@@ -396,30 +2628,212 @@ def create_review(data: Dict) -> Dict:
     - user_id, card_id
     - quality (0-5)
     - reviewed_at (ISO str)
+
+    Not:
+    - Log'a tek satır eklenir; geçmiş review'lar yeniden yazılmaz.
     """
-    reviews = load_reviews()
+    path = _user_file(REVIEWS_LOG_FILE, data["user_id"])
 
     review = {
-        "id": get_next_id(reviews),
+        "id": _allocate_id(REVIEWS_LOG_FILE),
         "user_id": data["user_id"],
         "card_id": data["card_id"],
         "quality": data["quality"],
         "reviewed_at": data["reviewed_at"],
     }
 
-    reviews.append(review)
-    save_reviews(reviews)
+    append_jsonl(path, [review])
     return review
 
+# =====================================================
+# STREAMING READERS
+# =====================================================
+#
+# iter_* fonksiyonları kayıtları tek tek üretir; tablonun tamamı liste
+# olarak memory'ye alınmaz:
+# - Tablo cache'te güncelse kayıtlar cache'ten verilir (dosya okunmaz)
+# - Değilse snapshot parça parça parse edilir (journal'daki op'lar üzerine
+#   uygulanır) ve cache doldurulmaz
+# - Deck / kart filtreli varyantlar tabloyu taramaz: index üzerinden
+#   _STREAM_PAGE'lik cursor sayfalarıyla (bkz. _page) yürür
+# - Filtreli varyantlar shard düzeninde sadece ilgili shard'ları okur
+
+# Snapshot stream edilirken tek seferde okunan karakter sayısı
+_STREAM_CHUNK = 64 * 1024
+
+# Filtreli iter_* fonksiyonlarında tek seferde kesilen sayfa boyu
+_STREAM_PAGE = 500
+
+
+def _iter_json_array(path: Path) -> Iterator[Dict]:
+    """
+    PRIVATE: JSON liste dosyasını parça parça parse eder.
+    Memory kullanımı kayıt sayısına değil, en büyük kayda bağlıdır.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        while True:
+            # Kayıtlar arasındaki ayraçları atla: boşluk, "[", ","
+            while pos < len(buffer) and buffer[pos] in " \t\r\n[,":
+                pos += 1
+
+            if pos < len(buffer):
+                if buffer[pos] == "]":
+                    return
+                try:
+                    record, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield record
+                    continue
+            elif eof:
+                return
+
+            # Kayıt yarım kaldı (veya buffer bitti): bir parça daha oku
+            chunk = f.read(_STREAM_CHUNK)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def _journal_overlay(path: Path) -> Tuple[Dict[int, Dict], set]:
+    """
+    PRIVATE: Journal'daki bu tabloya ait op'ların net etkisi.
+
+    Returns:
+        (id -> son put edilen kayıt, silinen id'ler)
+    """
+    puts: Dict[int, Dict] = {}
+    deleted: set = set()
+    for commit in iter_jsonl(_journal_path(path.parent)):
+        for op in commit["ops"]:
+            if op["t"] != path.name:
+                continue
+            if op["op"] == "put":
+                puts[op["r"]["id"]] = op["r"]
+                deleted.discard(op["r"]["id"])
+            else:
+                puts.pop(op["id"], None)
+                deleted.add(op["id"])
+    return puts, deleted
+
+
+def _fresh_entry(path: Path) -> Optional[_CacheEntry]:
+    """
+    PRIVATE: Tablonun cache entry'si güncelse onu, değilse None döndürür
+    (dosya parse edilmez).
+    """
+    if _TX is not None and path in _TX.entries:
+        return _TX.entries[path]
+
+    entry = _CACHE.get(path)
+    if entry is None or entry.signature != _file_signature(path):
+        return None
+    if entry.journal != _journal_signature(_journal_path(path.parent)):
+        return None
+    return entry
+
+
+def _iter_table(path: Path) -> Iterator[Dict]:
+    """
+    PRIVATE: Tek bir tablo dosyasının kayıtlarını stream eder.
+    """
+    entry = _fresh_entry(path)
+    if entry is not None:
+        # Sadece referans kopyası: iterasyon sırasında yazım yapılabilir
+        yield from list(entry.rows.values())
+        return
+
+    puts, deleted = _journal_overlay(path)
+    if path.exists():
+        records = iter_jsonl(path) if _is_log(path) else _iter_json_array(path)
+        for record in records:
+            if record["id"] in deleted:
+                continue
+            # Journal'da güncellenen kayıt, snapshot'taki pozisyonunda verilir
+            yield puts.pop(record["id"], record)
+    # Snapshot'ta olmayan (journal'da oluşturulan) kayıtlar
+    yield from puts.values()
+
+
+def _iter_pages(fetch_page) -> Iterator[Dict]:
+    """
+    PRIVATE: fetch_page(limit, after_id) sayfalarını cursor ile sırayla gezer.
+    Aynı anda memory'de en fazla bir sayfa (kayıt referansları) tutulur.
+    """
+    after_id = None
+    while True:
+        page = fetch_page(_STREAM_PAGE, after_id)
+        yield from page
+        if len(page) < _STREAM_PAGE:
+            return
+        after_id = page[-1]["id"]
+
+
+def _iter_files(paths: Iterable[Optional[Path]]) -> Iterator[Dict]:
+    """
+    PRIVATE: Birden fazla dosyayı sırayla stream eder (None / tekrarlar atlanır).
+    """
+    for path in dict.fromkeys(p for p in paths if p is not None):
+        yield from _iter_table(path)
+
+
+def iter_decks(user_id: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Deck'leri stream eder. user_id verilirse sadece o kullanıcının deck'leri.
+    """
+    if user_id is None:
+        yield from _iter_files(_table_files(DECKS_FILE))
+        return
+    yield from _iter_pages(
+        lambda limit, after_id: get_decks_by_user_page(user_id, limit, after_id=after_id)
+    )
+
+
+def iter_cards(deck_ids: Optional[Iterable[int]] = None) -> Iterator[Dict]:
+    """
+    Kartları stream eder. deck_ids verilirse sadece bu deck'lerin kartları
+    (deck sırasıyla, deck içinde id sırasıyla; deck_id index'i üzerinden).
+    """
+    if deck_ids is None:
+        yield from _iter_files(_table_files(CARDS_FILE))
+        return
+    for deck_id in dict.fromkeys(deck_ids):
+        yield from _iter_pages(
+            lambda limit, after_id: get_cards_by_deck_page(deck_id, limit, after_id=after_id)
+        )
+
+
+def iter_srs_states(card_ids: Optional[Iterable[int]] = None) -> Iterator[Dict]:
+    """
+    SRS state'leri stream eder. card_ids verilirse sadece bu kartların state'leri.
+    """
+    if card_ids is None:
+        yield from _iter_files(_table_files(SRS_STATE_FILE))
+        return
+    card_ids = set(card_ids)
+    paths = [_shard_of(SRS_STATE_FILE, CARDS_FILE, card_id) for card_id in card_ids]
+    for state in _iter_files(paths):
+        if state["card_id"] in card_ids:
+            yield state
 
-def _delete_reviews_by_card_id(card_id: int) -> None:
+
+def iter_reviews(user_id: Optional[int] = None) -> Iterator[Dict]:
     """
-    PRIVATE: Kart silme sırasında review cascade temizliği.
+    Review log'unu stream eder (büyük geçmişte memory'yi şişirmez).
+    user_id verilirse sadece o kullanıcının review'ları.
     """
-    reviews = load_reviews()
-    new_reviews = [r for r in reviews if r["card_id"] != card_id]
-    if len(new_reviews) != len(reviews):
-        save_reviews(new_reviews)
+    if user_id is None:
+        yield from _iter_files(_table_files(REVIEWS_LOG_FILE))
+        return
+    for review in _iter_table(_user_file(REVIEWS_LOG_FILE, user_id)):
+        if review["user_id"] == user_id:
+            yield review
 
 # =====================================================
 # READ-ONLY HELPERS (SERVICE LAYER)
@@ -438,3 +2852,89 @@ def get_all_decks() -> list:
 def get_reviews() -> list:
     """Tüm review kayıtlarını döndürür (read-only helper)."""
     return load_reviews()
+
+# =====================================================
+# DEBUG EXPORT
+# =====================================================
+
+def export_pretty(target_dir: Path) -> List[Path]:
+    """
+    Tüm tabloların insan okuyabilir (indent=2) kopyasını target_dir'e yazar.
+
+    - Journal'da bekleyen değişiklikler dahil güncel hal yazılır
+    - Veri dosyalarına dokunulmaz (debug / inceleme amaçlıdır)
+
+    Returns:
+        list: Yazılan dosyaların path'leri
+    """
+    tables = {
+        USERS_FILE.name: load_users,
+        DECKS_FILE.name: load_decks,
+        CARDS_FILE.name: load_cards,
+        SRS_STATE_FILE.name: load_srs_states,
+        REVIEWS_FILE.name: load_reviews,
+    }
+
+    written = []
+    for name, load in tables.items():
+        path = Path(target_dir) / name
+        atomic_write(path, load(), pretty=True)
+        written.append(path)
+    return written
+
+# =====================================================
+# BACKEND SELECTION
+# =====================================================
+# STORAGE_BACKEND = "sqlite" ise tablo API'si SQLite implementasyonuyla
+# değiştirilir. Servisler `from storage import ...` kullandığı için
+# hiçbir değişiklik gerekmez. (atomic_write / read_json gibi dosya
+# yardımcıları JSON olarak kalır; backup ve migration onları kullanır.)
+
+if STORAGE_BACKEND == "sqlite":
+    from sqlite_storage import (  # noqa: E402,F811
+        _reset_storage_cache,
+        initialize_storage,
+        transaction,
+        write_back,
+        flush,
+        sync_pending_writes,
+        load_users,
+        save_users,
+        get_user_by_email,
+        get_user_by_id,
+        create_user,
+        load_decks,
+        save_decks,
+        create_deck,
+        get_decks_by_user,
+        get_decks_by_user_page,
+        get_deck_by_id,
+        delete_deck,
+        load_cards,
+        save_cards,
+        get_card_by_id,
+        get_cards_by_deck,
+        get_cards_by_decks,
+        get_cards_by_deck_page,
+        create_card,
+        update_card,
+        delete_card,
+        delete_cards,
+        load_srs_states,
+        save_srs_states,
+        get_srs_state_by_card,
+        create_srs_state,
+        update_srs_state,
+        get_due_card_ids,
+        get_scheduled_card_ids,
+        load_reviews,
+        save_reviews,
+        iter_decks,
+        iter_cards,
+        iter_srs_states,
+        iter_reviews,
+        create_review,
+        get_all_cards,
+        get_all_decks,
+        get_reviews,
+    )
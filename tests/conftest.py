@@ -13,10 +13,13 @@ Not:
 - Bu yüzden testlerde doğrudan create_user yerine auth.register kullanmak en temiz çözümdür.
 """
 
+import shutil
+
 import pytest
 
+import storage
 from auth import _reset_auth_state, register
-from storage import initialize_storage
+from storage import initialize_storage, _reset_storage_cache
 from config import DATA_DIR
 
 
@@ -25,17 +28,25 @@ from config import DATA_DIR
 # =================================================
 
 @pytest.fixture
-def clean_storage():
+def clean_storage(monkeypatch):
     """
     Her testten önce:
-    - data klasöründeki json dosyalarını temizler
+    - data klasöründeki veri dosyalarını (json / jsonl log) ve
+      shard / route klasörlerini temizler
     - storage dosyalarını yeniden oluşturur
-    - auth (login) state'ini sıfırlar
+    - storage cache'ini ve auth (login) state'ini sıfırlar
+    - fsync'i kapatır (test verisi geçicidir; durability ayrıca test edilir)
     """
+    monkeypatch.setattr(storage, "DURABILITY", "none")
+
     if DATA_DIR.exists():
-        for file in DATA_DIR.glob("*.json"):
-            file.unlink()
+        for file in DATA_DIR.iterdir():
+            if file.is_file():
+                file.unlink()
+            elif file.is_dir():
+                shutil.rmtree(file)
 
+    _reset_storage_cache()
     initialize_storage()
     _reset_auth_state()
 
@@ -0,0 +1,29 @@
+"""
+StudyBuddy - Benchmark Veri Üretici Testleri
+
+Bu testler:
+- benchmarks/generate_data.py'nin ürettiği veri setinin storage API'leriyle
+  tutarlı olduğunu doğrular (sayılar, login, due sorgusu, yeni id'ler)
+"""
+
+from auth import login
+from storage import load_cards, load_reviews, load_srs_states, create_card
+from srs_service import get_due_cards_for_current_user
+
+from benchmarks.generate_data import DEFAULT_PASSWORD, generate_dataset, user_email
+
+
+def test_generated_dataset_is_usable_through_services(clean_storage):
+    counts = generate_dataset(users=2, decks_per_user=2, cards_per_deck=5,
+                              review_years=0.1, reviews_per_day=3)
+
+    assert counts["cards"] == len(load_cards()) == 20
+    assert counts["srs_states"] == len(load_srs_states())
+    assert counts["reviews"] == len(load_reviews()) == 2 * 36 * 3
+
+    login(user_email(1), DEFAULT_PASSWORD)
+    assert get_due_cards_for_current_user()
+
+    # Sequence sayaçları toplu yazımla senkron: yeni id'ler çakışmaz
+    card = create_card({"deck_id": 1, "front": "f", "back": "b"})
+    assert card["id"] == 21
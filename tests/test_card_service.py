@@ -15,9 +15,13 @@ Not:
 
 import pytest
 
-from storage import create_deck, create_card
+from storage import create_deck, create_card, delete_card
 from auth import register, login, logout
-from card_service import get_card_for_current_user
+from card_service import (
+    get_card_for_current_user,
+    get_cards_page_for_current_user_by_deck,
+    iter_cards_for_current_user_by_deck,
+)
 
 
 # ============================================
@@ -147,3 +151,43 @@ def test_get_card_fails_if_deck_not_found(
 
     with pytest.raises(ValueError):
         get_card_for_current_user(card["id"])
+
+
+# ============================================
+# CARD SERVICE – PAGINATION TESTS
+# ============================================
+
+def test_cards_are_listed_in_pages_and_as_generator(
+    clean_storage,
+    sample_user_data,
+    sample_deck_data
+):
+    """
+    - limit / offset ve after_id (cursor) ile sayfalar sırayla gelmeli
+    - Cursor'dan önceki kart silinse de sonraki sayfa kaymamalı
+    - Generator tüm kartları vermeli, ownership kontrolü çağrı anında yapılmalı
+    """
+    user = register(
+        email=sample_user_data["email"],
+        password=sample_user_data["password"],
+        name=sample_user_data["name"]
+    )
+    login(email=sample_user_data["email"], password=sample_user_data["password"])
+
+    deck = create_deck({**sample_deck_data, "user_id": user["id"]})
+    ids = [create_card({"deck_id": deck["id"], "front": f"f{i}", "back": "b"})["id"] for i in range(7)]
+
+    first = get_cards_page_for_current_user_by_deck(deck["id"], 3)
+    assert [c["id"] for c in first] == ids[:3]
+    assert [c["id"] for c in get_cards_page_for_current_user_by_deck(deck["id"], 3, offset=3)] == ids[3:6]
+
+    delete_card(ids[1])
+    second = get_cards_page_for_current_user_by_deck(deck["id"], 3, after_id=first[-1]["id"])
+    assert [c["id"] for c in second] == ids[3:6]
+
+    cards = iter_cards_for_current_user_by_deck(deck["id"])
+    assert [c["id"] for c in cards] == [i for i in ids if i != ids[1]]
+
+    logout()
+    with pytest.raises(RuntimeError):
+        iter_cards_for_current_user_by_deck(deck["id"])
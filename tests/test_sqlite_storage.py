@@ -0,0 +1,206 @@
+"""
+============================================
+StudyBuddy - SQLite Storage Backend Tests
+============================================
+
+Bu testler:
+- sqlite_storage'ın storage.py ile aynı davranışı verdiğini doğrular
+  (id atama, email unique, update, cascade silme)
+- JSON -> SQLite migration'ının kayıtları id'leriyle taşıdığını test eder
+
+Not:
+- Veritabanı tmp_path altında açılır; data/ klasörüne dokunulmaz.
+"""
+
+import pytest
+
+import sqlite_storage
+import storage
+
+
+# ============================================
+# FIXTURES
+# ============================================
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """
+    Her test için boş bir SQLite veritabanı.
+    """
+    sqlite_storage._reset_storage_cache()
+    monkeypatch.setattr(sqlite_storage, "SQLITE_FILE", tmp_path / "test.db")
+    sqlite_storage.initialize_storage()
+    yield sqlite_storage
+    sqlite_storage._reset_storage_cache()
+
+
+def _user(email: str = "sql@mail.com") -> dict:
+    return {
+        "email": email,
+        "name": "Sql User",
+        "password_hash": "hash",
+        "password_salt": "salt",
+    }
+
+
+# ============================================
+# TESTS
+# ============================================
+
+def test_sqlite_crud_and_cascade_match_json_backend(sqlite_db):
+    """
+    - İlk kayıtların id'si 1 olmalı
+    - Aynı email ikinci kez kaydedilememeli
+    - Deck silinince kart, SRS state ve review'lar da silinmeli
+    """
+    user = sqlite_db.create_user(_user())
+    assert user["id"] == 1
+    with pytest.raises(ValueError):
+        sqlite_db.create_user(_user())
+
+    deck = sqlite_db.create_deck({"name": "Deck", "user_id": user["id"]})
+    card = sqlite_db.create_card({"deck_id": deck["id"], "front": "Q", "back": "A"})
+    assert sqlite_db.update_card(card["id"], {"front": "Q2"})["front"] == "Q2"
+
+    state = sqlite_db.create_srs_state({
+        "user_id": user["id"],
+        "card_id": card["id"],
+        "repetition": 1,
+        "interval_days": 1,
+        "easiness_factor": 2.5,
+        "due_date": "2026-01-01",
+    })
+    sqlite_db.update_srs_state(state["id"], {"interval_days": 6})
+    assert sqlite_db.get_srs_state_by_card(card["id"])["interval_days"] == 6
+
+    sqlite_db.create_review({
+        "user_id": user["id"],
+        "card_id": card["id"],
+        "quality": 4,
+        "reviewed_at": "2026-01-01",
+    })
+
+    assert sqlite_db.delete_deck(deck["id"]) is True
+    assert sqlite_db.get_cards_by_deck(deck["id"]) == []
+    assert sqlite_db.get_srs_state_by_card(card["id"]) is None
+    assert sqlite_db.get_reviews() == []
+
+
+def test_migrate_json_to_sqlite_keeps_ids(clean_storage, sqlite_db):
+    """
+    JSON backend'deki kayıtlar SQLite'a aynı id'lerle taşınmalıdır.
+    """
+    user = storage.create_user(_user("json@mail.com"))
+    deck = storage.create_deck({"name": "Json Deck", "user_id": user["id"]})
+    card = storage.create_card({"deck_id": deck["id"], "front": "F", "back": "B"})
+    storage.create_review({
+        "user_id": user["id"],
+        "card_id": card["id"],
+        "quality": 5,
+        "reviewed_at": "2026-01-02",
+    })
+
+    counts = sqlite_db.migrate_json_to_sqlite()
+
+    assert counts["users"] == 1 and counts["reviews"] == 1
+    assert sqlite_db.get_user_by_email("json@mail.com")["id"] == user["id"]
+    assert sqlite_db.get_cards_by_deck(deck["id"])[0]["front"] == "F"
+
+
+def test_migrate_sharded_json_to_sqlite_keeps_users(clean_storage, sqlite_db, monkeypatch):
+    """
+    Shard düzeninde users.json global kalır; migration kullanıcıları da taşımalıdır.
+    """
+    monkeypatch.setattr(storage, "SHARDED_STORAGE", True)
+    user = storage.create_user(_user("shard@mail.com"))
+    deck = storage.create_deck({"name": "Shard Deck", "user_id": user["id"]})
+    storage.create_card({"deck_id": deck["id"], "front": "F", "back": "B"})
+
+    counts = sqlite_db.migrate_json_to_sqlite()
+
+    assert (counts["users"], counts["decks"], counts["cards"]) == (1, 1, 1)
+    assert sqlite_db.get_user_by_email("shard@mail.com")["id"] == user["id"]
+
+
+def test_sqlite_transaction_rolls_back_on_error(sqlite_db):
+    """
+    Transaction içindeki yazımlar exception'da geri alınmalıdır.
+    """
+    with pytest.raises(RuntimeError):
+        with sqlite_db.transaction():
+            sqlite_db.create_deck({"name": "Tmp", "user_id": 1})
+            assert len(sqlite_db.load_decks()) == 1
+            raise RuntimeError("abort")
+
+    assert sqlite_db.load_decks() == []
+
+
+def test_sqlite_delete_cards_cascades(sqlite_db):
+    """
+    delete_cards, kartları ve bağlı review'ları tek seferde silmelidir.
+    """
+    cards = [sqlite_db.create_card({"deck_id": 1, "front": "f", "back": "b"}) for _ in range(3)]
+    for card in cards:
+        sqlite_db.create_review({"user_id": 1, "card_id": card["id"], "quality": 3, "reviewed_at": "2026-01-01"})
+
+    assert sqlite_db.delete_cards([cards[0]["id"], cards[1]["id"], 999]) == 2
+    assert [c["id"] for c in sqlite_db.load_cards()] == [cards[2]["id"]]
+    assert [r["card_id"] for r in sqlite_db.get_reviews()] == [cards[2]["id"]]
+
+
+def test_sqlite_update_checks_expected_version(tmp_path, monkeypatch):
+    """
+    - Yeni kayıtlar version 1 ile başlamalı, her update version'ı artırmalı
+    - Eski version ile update RuntimeError vermeli ve kaydı değiştirmemeli
+    - version kolonu olmayan eski veritabanına kolon eklenmeli
+    """
+    import sqlite3
+
+    db_file = tmp_path / "old.db"
+    old = sqlite3.connect(str(db_file))
+    old.execute(
+        "CREATE TABLE cards (id INTEGER PRIMARY KEY, deck_id INTEGER NOT NULL, "
+        "front TEXT NOT NULL, back TEXT NOT NULL, created_at TEXT)"
+    )
+    old.execute("INSERT INTO cards VALUES (1, 1, 'eski', 'b', NULL)")
+    old.commit()
+    old.close()
+
+    sqlite_storage._reset_storage_cache()
+    monkeypatch.setattr(sqlite_storage, "SQLITE_FILE", db_file)
+    try:
+        assert "version" not in sqlite_storage.get_card_by_id(1)
+        assert sqlite_storage.update_card(1, {"front": "x"}, expected_version=0)["version"] == 1
+
+        card = sqlite_storage.create_card({"deck_id": 1, "front": "f", "back": "b"})
+        assert card["version"] == 1
+        assert sqlite_storage.update_card(card["id"], {"front": "f2"}, expected_version=1)["version"] == 2
+
+        with pytest.raises(RuntimeError):
+            sqlite_storage.update_card(card["id"], {"front": "stale"}, expected_version=1)
+        assert sqlite_storage.get_card_by_id(card["id"])["front"] == "f2"
+    finally:
+        sqlite_storage._reset_storage_cache()
+
+
+def test_sqlite_card_pages_follow_id_cursor(sqlite_db):
+    """
+    - limit / offset / after_id, JSON backend'iyle aynı sayfaları vermeli
+    """
+    ids = [sqlite_db.create_card({"deck_id": 1, "front": str(i), "back": "b"})["id"] for i in range(5)]
+    sqlite_db.create_card({"deck_id": 2, "front": "other", "back": "b"})
+
+    assert [c["id"] for c in sqlite_db.get_cards_by_deck_page(1, 2)] == ids[:2]
+    assert [c["id"] for c in sqlite_db.get_cards_by_deck_page(1, 2, offset=2)] == ids[2:4]
+    assert [c["id"] for c in sqlite_db.get_cards_by_deck_page(1, 10, after_id=ids[3])] == ids[4:]
+
+
+def test_sqlite_cards_by_decks_returns_cards_of_given_decks(sqlite_db):
+    """
+    - get_cards_by_decks, verilen deck'lerin kartlarını tek sorguda döndürmeli
+    """
+    for deck_id in (1, 2, 3):
+        sqlite_db.create_card({"deck_id": deck_id, "front": str(deck_id), "back": "b"})
+
+    assert sorted(c["deck_id"] for c in sqlite_db.get_cards_by_decks([3, 1, 1])) == [1, 3]
+    assert sqlite_db.get_cards_by_decks([]) == []
@@ -0,0 +1,134 @@
+"""
+============================================
+StudyBuddy - SRS Engine Tests
+============================================
+
+Bu testler:
+- sm2_batch'in skaler sm2_step ile bit bit aynı sonuç verdiğini
+  (int kesmesi ve MIN_EF clamp'i dahil) doğrular
+- NumPy yoksa skaler yola düşüldüğünü test eder
+
+Not:
+- NumPy kurulu değilse vektörel karşılaştırma testi atlanır.
+"""
+
+import random
+
+import pytest
+
+import srs_engine
+from config import INITIAL_EF, MIN_EF
+from srs_engine import sm2_batch, sm2_step
+
+
+# ============================================
+# TEST HELPERS
+# ============================================
+
+def _random_states(count: int, seed: int = 3) -> tuple:
+    """Uç durumları da içeren rastgele state / quality dizileri üretir."""
+    rng = random.Random(seed)
+    reps = [rng.randint(0, 12) for _ in range(count)]
+    intervals = [rng.choice((0, 1, 6, rng.randint(1, 3650))) for _ in range(count)]
+    efs = [rng.choice((MIN_EF, INITIAL_EF, 1.3000000000000003, rng.uniform(1.3, 3.0))) for _ in range(count)]
+    qualities = [rng.randint(0, 5) for _ in range(count)]
+    new = [rng.random() < 0.1 for _ in range(count)]
+    return reps, intervals, efs, qualities, new
+
+
+def _expected(reps, intervals, efs, qualities, new) -> tuple:
+    steps = [sm2_step(*row) for row in zip(reps, intervals, efs, qualities, new)]
+    return tuple(list(column) for column in zip(*steps))
+
+
+# ============================================
+# TESTS
+# ============================================
+
+def test_scalar_batch_matches_sm2_step_and_validates_lengths(monkeypatch):
+    columns = _random_states(2000)
+    assert sm2_batch(*columns, use_numpy=False) == _expected(*columns)
+    assert sm2_batch([], [], [], [], use_numpy=False) == ([], [], [])
+
+    with pytest.raises(ValueError):
+        sm2_batch([1], [1], [2.5], [3, 4])
+
+    monkeypatch.setattr(srs_engine, "np", None)
+    assert sm2_batch(*columns) == _expected(*columns)
+    with pytest.raises(RuntimeError):
+        sm2_batch(*columns, use_numpy=True)
+
+
+def test_numpy_batch_is_bit_identical_to_scalar_path():
+    pytest.importorskip("numpy")
+    columns = _random_states(20000)
+
+    reps, intervals, efs = sm2_batch(*columns, use_numpy=True)
+    exp_reps, exp_intervals, exp_efs = _expected(*columns)
+
+    assert reps == exp_reps
+    assert intervals == exp_intervals
+    assert [ef.hex() for ef in efs] == [ef.hex() for ef in exp_efs]
+    assert all(type(v) is int for v in reps + intervals)
+
+
+def test_both_services_share_the_configured_algorithm(clean_storage, monkeypatch):
+    """
+    srs_service ve review_service aynı scheduling çekirdeğini kullanmalı:
+    - ikinci başarılı review'da ikisi de SECOND_INTERVAL vermeli
+    - register edilen algoritma SRS_ALGORITHM ile ikisinde de aktif olmalı
+    """
+    from config import SECOND_INTERVAL
+    from auth import register, login
+    from storage import create_deck, create_card, get_srs_state_by_card
+    from review_service import review_card
+    from srs_service import process_review_for_card
+
+    user = register("engine@mail.com", "123456", "Engine")
+    login("engine@mail.com", "123456")
+    deck = create_deck({"user_id": user["id"], "name": "D"})
+    cards = [create_card({"deck_id": deck["id"], "front": str(i), "back": "b"})["id"] for i in range(4)]
+
+    for review in (review_card, process_review_for_card):
+        card_id = cards.pop()
+        review(card_id, 4)
+        review(card_id, 4)
+        assert get_srs_state_by_card(card_id)["interval_days"] == SECOND_INTERVAL
+
+    # Global kayıt test sonunda geri alınsın
+    monkeypatch.setitem(
+        srs_engine._ALGORITHMS, "fixed", (lambda rep, interval, ef, quality, new: (rep + 1, 42, ef), None)
+    )
+    monkeypatch.setattr(srs_engine, "SRS_ALGORITHM", "fixed")
+    for review in (review_card, process_review_for_card):
+        card_id = cards.pop()
+        review(card_id, 5)
+        assert get_srs_state_by_card(card_id)["interval_days"] == 42
+
+    with pytest.raises(ValueError):
+        srs_engine.get_algorithm("missing")
+
+
+def test_default_review_day_is_local_today(clean_storage, monkeypatch):
+    """
+    reviewed_at verilmezse due_date yerel date.today()'den hesaplanmalı
+    (UTC günü değil); zaman damgası UTC kalmalı.
+    """
+    from datetime import date, timedelta
+    from storage import create_deck, create_card
+
+    fixed_today = date(2024, 12, 31)
+
+    class _FixedDate(date):
+        @classmethod
+        def today(cls):
+            return fixed_today
+
+    monkeypatch.setattr(srs_engine, "date", _FixedDate)
+
+    deck = create_deck({"user_id": 1, "name": "D"})
+    card_id = create_card({"deck_id": deck["id"], "front": "f", "back": "b"})["id"]
+    states, reviews = srs_engine.apply_reviews(1, [(card_id, 5, None)])
+
+    assert states[0]["due_date"] == (fixed_today + timedelta(days=states[0]["interval_days"])).isoformat()
+    assert reviews[0]["reviewed_at"].endswith("+00:00")
@@ -127,3 +127,71 @@ def test_second_review_updates_existing_srs_state(
     # Güncellenmiş olmalı
     assert second_state["repetition"] >= first_state["repetition"]
     assert second_state["interval_days"] >= first_state["interval_days"]
+
+
+def test_due_cards_join_covers_all_decks_and_unreviewed_cards(clean_storage):
+    """
+    Set tabanlı due sorgusu:
+    - kullanıcının TÜM deck'lerindeki kartları kapsamalı
+    - hiç çalışılmamış kartlar ve due_date'i gelmiş kartlar due sayılmalı,
+      ileri tarihli kartlar ve başka kullanıcının kartları sayılmamalı
+    """
+    from datetime import date, timedelta
+    from storage import update_srs_state
+    from srs_service import get_due_cards_for_current_user
+
+    user = _create_user_and_login("Join", _unique_email("join"), "123456")
+    other = create_deck({"user_id": user["id"] + 1, "name": "Other"})
+    create_card({"deck_id": other["id"], "front": "x", "back": "y"})
+
+    decks = [create_deck({"user_id": user["id"], "name": f"D{i}"}) for i in range(2)]
+    new_card, due_card, future_card = (
+        create_card({"deck_id": decks[i % 2]["id"], "front": str(i), "back": "b"})
+        for i in range(3)
+    )
+
+    process_review_for_card(due_card["id"], 5)
+    process_review_for_card(future_card["id"], 5)
+    update_srs_state(get_srs_state_by_card(due_card["id"])["id"], {"due_date": date.today().isoformat()})
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    assert get_srs_state_by_card(future_card["id"])["due_date"] >= tomorrow
+
+    due_ids = {c["id"] for c in get_due_cards_for_current_user()}
+    assert due_ids == {new_card["id"], due_card["id"]}
+
+
+def test_review_cards_batch_matches_single_reviews_and_is_atomic(clean_storage):
+    """
+    review_cards_batch:
+    - tek tek review ile aynı state'leri üretmeli (aynı kart birden fazla kez dahil)
+    - sahip olunmayan bir kart varsa HİÇBİR şey yazmamalı
+    """
+    import pytest
+    from datetime import date
+    from storage import get_reviews
+    from srs_service import review_cards_batch
+
+    def setup(name):
+        user = _create_user_and_login(name, _unique_email(name), "123456")
+        deck = create_deck({"user_id": user["id"], "name": name})
+        return [create_card({"deck_id": deck["id"], "front": str(i), "back": "b"})["id"] for i in range(2)]
+
+    single = setup("single")
+    for card_id, quality in ((single[0], 5), (single[0], 4), (single[1], 2), (single[0], 5)):
+        process_review_for_card(card_id, quality)
+    expected = [get_srs_state_by_card(card_id) for card_id in single]
+
+    batch = setup("batch")
+    today = date.today()
+    states = review_cards_batch([
+        (batch[0], 5, today), (batch[0], 4, today), (batch[1], 2, today), (batch[0], 5, today.isoformat()),
+    ])
+
+    fields = ("repetition", "interval_days", "easiness_factor", "due_date")
+    assert [[s[f] for f in fields] for s in states] == [[s[f] for f in fields] for s in expected]
+    assert len(get_reviews()) == 8
+
+    with pytest.raises(PermissionError):
+        review_cards_batch([(batch[0], 3, today), (single[0], 3, today)])
+    assert len(get_reviews()) == 8
+    assert get_srs_state_by_card(batch[0])["version"] == states[0]["version"]
@@ -180,3 +180,882 @@ def test_create_review(clean_storage):
     reviews = get_reviews()
     assert len(reviews) == 1
     assert reviews[0]["quality"] == 4
+
+
+# =================================================
+# CACHE TESTS
+# =================================================
+
+def test_read_json_cache_reloads_when_file_changes_on_disk(clean_storage):
+    """
+    read_json cache'i:
+    - Aynı dosyayı tekrar parse etmemeli (write-through)
+    - Dosya dışarıdan (başka process gibi) değişirse yeni içeriği okumalı
+    """
+    import json
+    from config import DECKS_FILE
+    from storage import load_decks, compact_journal
+
+    create_deck({"name": "Cached", "user_id": 1})
+    assert [d["name"] for d in load_decks()] == ["Cached"]
+    compact_journal()
+
+    # Başka bir process'in yazımını taklit et
+    DECKS_FILE.write_text(
+        json.dumps([{"id": 7, "name": "External", "user_id": 1}]),
+        encoding="utf-8",
+    )
+
+    assert [d["name"] for d in load_decks()] == ["External"]
+    assert get_deck_by_id(7)["name"] == "External"
+
+
+# =================================================
+# INDEX TESTS
+# =================================================
+
+def test_indexes_follow_create_update_and_delete(clean_storage, unique_user_data):
+    """
+    Index'ler (email, deck_id, card_id) create/update/delete sonrası
+    tabloyla tutarlı kalmalı; grup sırası korunmalıdır.
+    """
+    from storage import get_cards_by_deck, get_decks_by_user
+
+    user = create_user(unique_user_data)
+    assert get_user_by_email(unique_user_data["email"])["id"] == user["id"]
+
+    deck = create_deck({"name": "Deck", "user_id": user["id"]})
+    c1 = create_card({"deck_id": deck["id"], "front": "1", "back": "1"})
+    c2 = create_card({"deck_id": deck["id"], "front": "2", "back": "2"})
+
+    update_card(c1["id"], {"front": "1b"})
+    assert [c["front"] for c in get_cards_by_deck(deck["id"])] == ["1b", "2"]
+
+    state = create_srs_state({
+        "user_id": user["id"],
+        "card_id": c2["id"],
+        "repetition": 1,
+        "interval_days": 1,
+        "easiness_factor": 2.5,
+        "due_date": "2026-01-01",
+    })
+    update_srs_state(state["id"], {"repetition": 2})
+    assert get_srs_state_by_card(c2["id"])["repetition"] == 2
+
+    delete_card(c2["id"])
+    assert [c["id"] for c in get_cards_by_deck(deck["id"])] == [c1["id"]]
+    assert get_srs_state_by_card(c2["id"]) is None
+
+    delete_deck(deck["id"])
+    assert get_decks_by_user(user["id"]) == []
+    assert get_card_by_id(c1["id"]) is None
+
+
+# =================================================
+# REVIEW LOG TESTS
+# =================================================
+
+def test_review_log_appends_lines_and_ignores_torn_tail(clean_storage):
+    """
+    Review log'u:
+    - Her review için tek satır eklemeli (dosya yeniden yazılmaz)
+    - Crash'ten kalan yarım son satırı yok saymalı ve sonraki append'te kesmeli
+    """
+    from config import REVIEWS_LOG_FILE
+    from storage import iter_reviews
+
+    create_review({"user_id": 1, "card_id": 1, "quality": 4, "reviewed_at": "2026-01-10"})
+    create_review({"user_id": 1, "card_id": 2, "quality": 3, "reviewed_at": "2026-01-11"})
+    assert len(REVIEWS_LOG_FILE.read_text(encoding="utf-8").splitlines()) == 2
+
+    # Yarım kalmış append (newline yok)
+    with open(REVIEWS_LOG_FILE, "a", encoding="utf-8") as f:
+        f.write('{"id": 3, "user_id"')
+
+    assert [r["id"] for r in get_reviews()] == [1, 2]
+    assert [r["id"] for r in iter_reviews()] == [1, 2]
+
+    review = create_review({"user_id": 1, "card_id": 3, "quality": 5, "reviewed_at": "2026-01-12"})
+    assert review["id"] == 3
+    assert [r["id"] for r in iter_reviews()] == [1, 2, 3]
+
+
+def test_legacy_reviews_json_is_migrated_once(clean_storage):
+    """
+    Eski reviews.json varsa initialize_storage onu reviews.jsonl'e taşımalı.
+    """
+    import json
+    from config import REVIEWS_FILE, REVIEWS_LOG_FILE
+    from storage import initialize_storage
+
+    REVIEWS_LOG_FILE.unlink()
+    REVIEWS_FILE.write_text(
+        json.dumps([{"id": 1, "user_id": 1, "card_id": 1, "quality": 2, "reviewed_at": "2026-01-01"}]),
+        encoding="utf-8",
+    )
+
+    initialize_storage()
+
+    assert not REVIEWS_FILE.exists()
+    assert [r["quality"] for r in get_reviews()] == [2]
+
+
+# =================================================
+# JOURNAL TESTS
+# =================================================
+
+def test_journal_defers_snapshot_writes_until_compaction(clean_storage):
+    """
+    Journal:
+    - create/update snapshot dosyasını yeniden yazmamalı
+    - Cache temizlense bile (yeni process gibi) snapshot + journal okunmalı
+    - Compaction değişiklikleri snapshot'a katlayıp journal'ı boşaltmalı
+    - Compaction yarıda kalsa (eski journal geri gelse) sonuç değişmemeli
+    """
+    from config import CARDS_FILE, JOURNAL_FILE
+    from storage import compact_journal, load_cards, _reset_storage_cache
+
+    snapshot_before = CARDS_FILE.read_bytes()
+    c1 = create_card({"deck_id": 1, "front": "a", "back": "a"})
+    c2 = create_card({"deck_id": 1, "front": "b", "back": "b"})
+    update_card(c1["id"], {"front": "a2"})
+    delete_card(c2["id"])
+
+    assert CARDS_FILE.read_bytes() == snapshot_before
+    _reset_storage_cache()
+    assert [c["front"] for c in load_cards()] == ["a2"]
+
+    journal_before = JOURNAL_FILE.read_bytes()
+    assert compact_journal() is True
+    assert JOURNAL_FILE.read_bytes() == b""
+
+    # Crash simülasyonu: snapshot yazıldı ama journal kesilemedi
+    JOURNAL_FILE.write_bytes(journal_before)
+    _reset_storage_cache()
+    assert [c["front"] for c in load_cards()] == ["a2"]
+
+
+# =================================================
+# TRANSACTION TESTS
+# =================================================
+
+def test_transaction_commits_tables_together_or_not_at_all(clean_storage):
+    """
+    transaction():
+    - Blok içindeki yazımlar tek journal satırı olarak commit edilmeli
+    - Blok içindeki okumalar bekleyen değişiklikleri görmeli
+    - Exception'da hiçbir değişiklik kalıcı olmamalı
+    """
+    import pytest
+    from config import JOURNAL_FILE
+    from storage import transaction, _reset_storage_cache
+
+    with transaction():
+        card = create_card({"deck_id": 1, "front": "Q", "back": "A"})
+        create_srs_state({
+            "user_id": 1,
+            "card_id": card["id"],
+            "repetition": 1,
+            "interval_days": 1,
+            "easiness_factor": 2.5,
+            "due_date": "2026-01-01",
+        })
+        assert get_srs_state_by_card(card["id"]) is not None
+        create_review({"user_id": 1, "card_id": card["id"], "quality": 4, "reviewed_at": "2026-01-01"})
+
+    assert JOURNAL_FILE.read_bytes().count(b"\n") == 1
+
+    with pytest.raises(RuntimeError):
+        with transaction():
+            delete_card(card["id"])
+            assert get_card_by_id(card["id"]) is None
+            raise RuntimeError("abort")
+
+    assert get_card_by_id(card["id"]) is not None
+    _reset_storage_cache()
+    assert get_card_by_id(card["id"]) is not None
+    assert get_srs_state_by_card(card["id"]) is not None
+    assert len(get_reviews()) == 1
+
+
+def test_transaction_commits_srs_state_and_review_log_together(clean_storage, monkeypatch):
+    """
+    update_srs_state + create_review tek transaction'da:
+    - Review log append'i commit'ten sonra yarıda kalsa da review kaybolmamalı
+      (journal'dan okunmalı, compaction log'a bir kez eklemeli)
+    - Journal satırı yazılamazsa ne state ne review kalıcı olmalı
+    """
+    import pytest
+    import storage
+    from config import REVIEWS_LOG_FILE
+    from storage import transaction, compact_journal, iter_jsonl, _reset_storage_cache
+
+    state = create_srs_state({
+        "user_id": 1,
+        "card_id": 7,
+        "repetition": 1,
+        "interval_days": 1,
+        "easiness_factor": 2.5,
+        "due_date": "2026-01-01",
+    })
+    compact_journal()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(storage, "_append_log", fail)
+        with pytest.raises(OSError):
+            with transaction():
+                update_srs_state(state["id"], {"repetition": 2}, expected_version=1)
+                create_review({"user_id": 1, "card_id": 7, "quality": 4, "reviewed_at": "2026-01-02"})
+
+    assert REVIEWS_LOG_FILE.read_bytes() == b""
+    _reset_storage_cache()
+    assert get_srs_state_by_card(7)["repetition"] == 2
+    assert [r["quality"] for r in get_reviews()] == [4]
+    assert [r["quality"] for r in storage.iter_reviews()] == [4]
+
+    # Compaction eksik kaydı log'a ekler (ikinci kez eklemez)
+    compact_journal()
+    create_review({"user_id": 1, "card_id": 7, "quality": 5, "reviewed_at": "2026-01-03"})
+    compact_journal()
+    assert [r["quality"] for r in iter_jsonl(REVIEWS_LOG_FILE)] == [4, 5]
+
+    with monkeypatch.context() as m:
+        m.setattr(storage, "_journal_append", fail)
+        with pytest.raises(OSError):
+            with transaction():
+                update_srs_state(state["id"], {"repetition": 3})
+                create_review({"user_id": 1, "card_id": 7, "quality": 1, "reviewed_at": "2026-01-04"})
+
+    _reset_storage_cache()
+    assert get_srs_state_by_card(7)["repetition"] == 2
+    assert [r["quality"] for r in get_reviews()] == [4, 5]
+
+
+# =================================================
+# ID SEQUENCE TESTS
+# =================================================
+
+def test_ids_are_allocated_from_counter_blocks(clean_storage):
+    """
+    counters.json:
+    - İlk create bir blok rezerve etmeli, blok içindeki create'ler dosyayı yazmamalı
+    - Silinen son kartın id'si tekrar verilmemeli
+    - Yeni process (cache reset) rezerve edilmiş bloğun sonrasından devam etmeli
+    """
+    import json
+    from config import COUNTERS_FILE, ID_BLOCK_SIZE
+    from storage import _reset_storage_cache
+
+    c1 = create_card({"deck_id": 1, "front": "a", "back": "a"})
+    inode = COUNTERS_FILE.stat().st_ino
+    c2 = create_card({"deck_id": 1, "front": "b", "back": "b"})
+
+    assert (c1["id"], c2["id"]) == (1, 2)
+    assert COUNTERS_FILE.stat().st_ino == inode
+    assert json.loads(COUNTERS_FILE.read_text(encoding="utf-8")) == {"cards.json": ID_BLOCK_SIZE}
+
+    delete_card(c2["id"])
+    assert create_card({"deck_id": 1, "front": "c", "back": "c"})["id"] == 3
+
+    _reset_storage_cache()
+    assert create_card({"deck_id": 1, "front": "d", "back": "d"})["id"] == ID_BLOCK_SIZE + 1
+
+
+# =================================================
+# DURABILITY TESTS
+# =================================================
+
+def test_batched_durability_groups_fsyncs_until_flush(clean_storage, monkeypatch):
+    """
+    batched:
+    - Journal append'leri fsync edilmeden yazılmalı, sync_pending_writes()
+      ile tek seferde fsync edilmeli
+    - transaction(durability="strict") commit'i hemen fsync etmeli
+    """
+    import os
+    import pytest
+    import storage
+
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    monkeypatch.setattr(storage, "DURABILITY", "batched")
+    monkeypatch.setattr(storage, "DURABILITY_BATCH_MS", 60_000)
+    monkeypatch.setattr(storage, "DURABILITY_BATCH_WRITES", 1_000)
+
+    create_card({"deck_id": 1, "front": "a", "back": "a"})   # + counters (atomic, fsync)
+    create_card({"deck_id": 1, "front": "b", "back": "b"})
+    assert len(synced) == 1
+
+    storage.sync_pending_writes()
+    assert len(synced) == 2
+
+    with storage.transaction(durability="strict"):
+        create_card({"deck_id": 1, "front": "c", "back": "c"})
+    assert len(synced) == 3
+
+    with pytest.raises(ValueError):
+        with storage.transaction(durability="sometimes"):
+            pass
+
+
+# =================================================
+# CODEC TESTS
+# =================================================
+
+def test_data_files_are_compact_and_pretty_export_is_readable(clean_storage, tmp_path):
+    """
+    - Snapshot dosyaları kompakt JSON olmalı (indent / newline yok)
+    - export_pretty okunabilir ve aynı içerikte kopya üretmeli
+    """
+    import json
+    from config import CARDS_FILE
+    from storage import compact_journal, export_pretty, load_cards
+
+    create_card({"deck_id": 1, "front": "Ö", "back": "A"})
+    compact_journal()
+
+    raw = CARDS_FILE.read_bytes()
+    assert b"\n" not in raw and b'": ' not in raw
+
+    written = export_pretty(tmp_path)
+    pretty = (tmp_path / CARDS_FILE.name).read_text(encoding="utf-8")
+    assert len(written) == 5
+    assert "\n  " in pretty and "Ö" in pretty
+    assert json.loads(pretty) == load_cards()
+
+
+# =================================================
+# SHARDING TESTS
+# =================================================
+
+def _shard_sample(user_id: int) -> dict:
+    """
+    Verilen kullanıcı için deck + kart + SRS state + review oluşturur.
+    """
+    deck = create_deck({"name": f"Deck {user_id}", "user_id": user_id})
+    card = create_card({"deck_id": deck["id"], "front": "Q", "back": "A"})
+    state = create_srs_state({
+        "user_id": user_id,
+        "card_id": card["id"],
+        "repetition": 1,
+        "interval_days": 1,
+        "easiness_factor": 2.5,
+        "due_date": "2026-01-01",
+    })
+    create_review({"user_id": user_id, "card_id": card["id"], "quality": 4, "reviewed_at": "2026-01-01"})
+    return {"deck": deck, "card": card, "state": state}
+
+
+def test_sharded_layout_keeps_each_user_in_own_files(clean_storage, monkeypatch):
+    """
+    SHARDED_STORAGE:
+    - Kullanıcının kayıtları sadece kendi shard klasörüne yazılmalı
+    - id ile yapılan erişimler route tablosu üzerinden doğru shard'ı bulmalı
+    - Cascade silme route'ları da temizlemeli, diğer kullanıcıya dokunmamalı
+    """
+    import storage
+    from config import SHARDS_DIR, CARDS_FILE
+
+    monkeypatch.setattr(storage, "SHARDED_STORAGE", True)
+
+    a = _shard_sample(1)
+    shard_b = SHARDS_DIR / "2"
+    assert not shard_b.exists()
+
+    b = _shard_sample(2)
+    journal_b = (shard_b / "journal.wal").read_bytes()
+
+    assert get_card_by_id(a["card"]["id"])["deck_id"] == a["deck"]["id"]
+    update_srs_state(a["state"]["id"], {"interval_days": 6})
+    assert get_srs_state_by_card(a["card"]["id"])["interval_days"] == 6
+    assert len(storage.load_cards()) == 2 and len(get_reviews()) == 2
+
+    assert delete_deck(a["deck"]["id"]) is True
+    assert get_card_by_id(a["card"]["id"]) is None
+    assert get_srs_state_by_card(a["card"]["id"]) is None
+    assert [r["user_id"] for r in get_reviews()] == [2]
+
+    assert (shard_b / "journal.wal").read_bytes() == journal_b
+    assert get_card_by_id(b["card"]["id"]) is not None
+    assert storage.read_json(CARDS_FILE) == []
+
+
+def test_migrate_to_shards_moves_global_tables(clean_storage, monkeypatch):
+    """
+    Global düzendeki veriler shard'lara id'leriyle taşınmalı;
+    global dosyalar .migrated olarak saklanmalı.
+    """
+    import storage
+    from config import DECKS_FILE, ID_BLOCK_SIZE
+
+    a = _shard_sample(1)
+    b = _shard_sample(2)
+
+    counts = storage.migrate_to_shards()
+    assert counts == {"decks": 2, "cards": 2, "srs_state": 2, "reviews": 2}
+    assert not DECKS_FILE.exists()
+    assert DECKS_FILE.with_name("decks.json.migrated").exists()
+
+    monkeypatch.setattr(storage, "SHARDED_STORAGE", True)
+    storage._reset_storage_cache()
+
+    assert storage.get_decks_by_user(2) == [b["deck"]]
+    assert get_srs_state_by_card(a["card"]["id"])["id"] == a["state"]["id"]
+    new_card = create_card({"deck_id": b["deck"]["id"], "front": "x", "back": "y"})
+    assert new_card["id"] == ID_BLOCK_SIZE + 1
+    assert storage.get_cards_by_deck(b["deck"]["id"])[-1] == new_card
+
+
+# =================================================
+# BULK DELETE TESTS
+# =================================================
+
+def test_delete_cards_cascades_in_one_commit(clean_storage):
+    """
+    delete_cards:
+    - Verilen kartları, SRS state'lerini ve review'larını silmeli
+    - Bilinmeyen id'leri yok saymalı, diğer kartlara dokunmamalı
+    - Tüm değişiklikleri (review silmeleri dahil) tek journal satırında commit etmeli
+    """
+    from config import JOURNAL_FILE, REVIEWS_LOG_FILE
+    from storage import delete_cards, compact_journal, iter_jsonl, iter_reviews, _reset_storage_cache
+
+    cards = [create_card({"deck_id": 1, "front": str(i), "back": "b"}) for i in range(4)]
+    for card in cards:
+        create_srs_state({
+            "user_id": 1,
+            "card_id": card["id"],
+            "repetition": 1,
+            "interval_days": 1,
+            "easiness_factor": 2.5,
+            "due_date": "2026-01-01",
+        })
+        create_review({"user_id": 1, "card_id": card["id"], "quality": 3, "reviewed_at": "2026-01-01"})
+    compact_journal()
+
+    doomed = [cards[0]["id"], cards[2]["id"], 999]
+    assert delete_cards(doomed) == 2
+
+    assert JOURNAL_FILE.read_bytes().count(b"\n") == 1
+    assert get_card_by_id(cards[0]["id"]) is None
+    assert get_srs_state_by_card(cards[2]["id"]) is None
+    assert sorted(r["card_id"] for r in get_reviews()) == [cards[1]["id"], cards[3]["id"]]
+    assert get_srs_state_by_card(cards[3]["id"]) is not None
+
+    # Review silmeleri journal'dadır; compaction log'u yeniden yazar
+    _reset_storage_cache()
+    assert sorted(r["card_id"] for r in iter_reviews()) == [cards[1]["id"], cards[3]["id"]]
+    compact_journal()
+    assert sorted(r["card_id"] for r in iter_jsonl(REVIEWS_LOG_FILE)) == [cards[1]["id"], cards[3]["id"]]
+
+
+# =================================================
+# STREAMING TESTS
+# =================================================
+
+def test_iter_cards_streams_snapshot_with_journal_overlay(clean_storage, monkeypatch):
+    """
+    iter_cards:
+    - Cache boşken snapshot'ı parça parça okuyup journal'ı üzerine uygulamalı
+      (sonuç load_cards ile aynı olmalı, cache doldurulmamalı)
+    - deck_ids filtresi sadece ilgili kartları vermeli
+    """
+    import storage
+    from config import CARDS_FILE
+
+    monkeypatch.setattr(storage, "_STREAM_CHUNK", 7)
+
+    cards = [create_card({"deck_id": i % 2, "front": f"ç{i}", "back": "b"}) for i in range(5)]
+    storage.compact_journal()
+    update_card(cards[1]["id"], {"front": "updated"})
+    delete_card(cards[2]["id"])
+    create_card({"deck_id": 1, "front": "new", "back": "b"})
+
+    storage._reset_storage_cache()
+    streamed = list(storage.iter_cards())
+    assert CARDS_FILE not in storage._CACHE
+
+    assert streamed == storage.load_cards()
+    assert [c["front"] for c in storage.iter_cards([1])] == ["updated", "ç3", "new"]
+
+
+def test_deck_pages_and_filtered_iter_cards_walk_the_id_index(clean_storage, monkeypatch):
+    """
+    get_cards_by_deck_page / iter_cards(deck_ids):
+    - Sayfalar dosya sırasından bağımsız olarak id sırasıyla gelmeli
+    - after_id cursor'ı güncellemeler / silmelerden sonra da doğru olmalı
+    - Filtreli iter_cards tabloyu taramamalı, sayfa sayfa ilerlemeli
+    """
+    import storage
+    from storage import get_cards_by_deck_page, iter_cards, save_cards, compact_journal
+
+    # Dosya sırası id sırasından farklı
+    save_cards([
+        {"id": card_id, "deck_id": 1 if card_id % 3 else 2, "front": str(card_id), "back": "b"}
+        for card_id in (9, 3, 7, 1, 5, 2, 8, 4, 6)
+    ])
+    deck_ids = [1, 2, 4, 5, 7, 8]
+
+    assert [c["id"] for c in get_cards_by_deck_page(1, 4)] == deck_ids[:4]
+    assert [c["id"] for c in get_cards_by_deck_page(1, 4, after_id=2)] == deck_ids[2:]
+    assert [c["id"] for c in get_cards_by_deck_page(1, 2, offset=1, after_id=4)] == [7, 8]
+
+    update_card(5, {"deck_id": 2})
+    delete_card(7)
+    new = create_card({"deck_id": 1, "front": "n", "back": "b"})
+    compact_journal()
+    assert [c["id"] for c in get_cards_by_deck_page(1, 10, after_id=2)] == [4, 8, new["id"]]
+    assert [c["id"] for c in get_cards_by_deck_page(2, 10)] == [3, 5, 6, 9]
+
+    def no_scan(path):
+        raise AssertionError("filtered iter_cards must not scan the table")
+
+    monkeypatch.setattr(storage, "_iter_table", no_scan)
+    monkeypatch.setattr(storage, "_STREAM_PAGE", 2)
+    assert [c["id"] for c in iter_cards([2, 1])] == [3, 5, 6, 9, 1, 2, 4, 8, new["id"]]
+
+
+# =================================================
+# SRS DUE / SCHEDULED LOOKUP TESTS
+# =================================================
+
+def test_srs_lookups_follow_changes_and_filter_due_cards(clean_storage):
+    """
+    get_due_card_ids / get_scheduled_card_ids:
+    - create / update / delete sonrası state listesiyle tutarlı kalmalı
+    - dict'ler üzerinden yapılan due kontrolüyle aynı sonucu vermeli
+    """
+    from datetime import date, timedelta
+    import storage
+    from storage import get_due_card_ids, get_scheduled_card_ids
+
+    today = date(2024, 3, 10)
+    for i in range(6):
+        create_srs_state({
+            "user_id": 1 + i % 2,
+            "card_id": 100 + i,
+            "repetition": 0,
+            "interval_days": 1,
+            "easiness_factor": 2.5,
+            "due_date": (today + timedelta(days=i - 3)).isoformat(),
+        })
+
+    assert get_due_card_ids(1, today) == {100, 102}
+
+    moved = get_srs_state_by_card(102)
+    update_srs_state(moved["id"], {"due_date": (today + timedelta(days=5)).isoformat()})
+    storage._delete_by_card_ids(storage.SRS_STATE_FILE, {100})
+    create_srs_state({
+        "user_id": 1, "card_id": 106, "repetition": 1,
+        "interval_days": 6, "easiness_factor": 2.6, "due_date": today.isoformat(),
+    })
+
+    states = storage.load_srs_states()
+    for user_id in (1, 2):
+        expected_due = {
+            s["card_id"] for s in states
+            if s["user_id"] == user_id and s["due_date"] <= today.isoformat()
+        }
+        assert get_due_card_ids(user_id, today) == expected_due
+        assert get_scheduled_card_ids(user_id) == {
+            s["card_id"] for s in states if s["user_id"] == user_id
+        }
+
+
+# =================================================
+# DUE HEAP INDEX TESTS
+# =================================================
+
+def test_due_heap_skips_stale_entries_and_rebuilds(clean_storage):
+    """
+    Due heap index'i:
+    - güncellenen / silinen state'lerin eski elemanlarını sonuçlara katmamalı
+      (aynı due_date'e geri dönen state dahil)
+    - bayat elemanlar birikince kullanıcının heap'ini yeniden kurmalı
+    """
+    import random
+    from datetime import date, timedelta
+    import storage
+    from storage import get_due_card_ids
+
+    rng = random.Random(7)
+    today = date(2024, 3, 10)
+
+    def due(offset):
+        return (today + timedelta(days=offset)).isoformat()
+
+    for i in range(40):
+        create_srs_state({
+            "user_id": 1 + i % 2, "card_id": 100 + i, "repetition": 0,
+            "interval_days": 1, "easiness_factor": 2.5, "due_date": due(rng.randint(-5, 5)),
+        })
+
+    assert get_due_card_ids(1, today)   # index kuruldu, bundan sonrası incremental
+    for _ in range(300):
+        state = get_srs_state_by_card(100 + rng.randrange(40))
+        update_srs_state(state["id"], {"due_date": due(rng.randint(-5, 5))})
+    storage._delete_by_card_ids(storage.SRS_STATE_FILE, {100, 101})
+
+    states = storage.load_srs_states()
+    for user_id in (1, 2):
+        expected = {
+            s["card_id"] for s in states
+            if s["user_id"] == user_id and s["due_date"] <= today.isoformat()
+        }
+        assert get_due_card_ids(user_id, today) == expected
+
+    heaps = storage._index(storage._load_entry(storage.SRS_STATE_FILE), storage._DUE, "due_date")
+    assert sum(len(h) for h in heaps.heaps.values()) < 40 + 300
+
+
+# =================================================
+# BINARY SNAPSHOT TESTS
+# =================================================
+
+def test_cold_start_loads_binary_snapshot_and_rejects_stale_ones(clean_storage, monkeypatch):
+    """
+    Binary snapshot:
+    - Compaction / log okuması sonrası tablonun yanına .snap yazılmalı
+    - Cache boşken geçerli snapshot'tan yüklenmeli (JSON parse edilmemeli)
+    - Bozuk snapshot yok sayılıp JSON'a dönülmeli
+    - Log büyüdükten sonra snapshot + sadece yeni satırlar okunmalı
+    """
+    import storage
+    from config import CARDS_FILE, REVIEWS_LOG_FILE
+
+    monkeypatch.setattr(storage, "SNAPSHOT_MIN_BYTES", 0)
+
+    for i in range(3):
+        create_card({"deck_id": 1, "front": f"ön{i}", "back": "arka"})
+        create_review({"user_id": 1, "card_id": i, "quality": 4, "reviewed_at": "2024-01-01"})
+    storage.compact_journal()
+    expected_cards = storage.load_cards()
+
+    storage._reset_storage_cache()
+    storage.load_reviews()
+    card_snap = storage._snapshot_path(CARDS_FILE)
+    assert card_snap.exists() and storage._snapshot_path(REVIEWS_LOG_FILE).exists()
+
+    real_decode = storage._decode
+
+    def no_decode(payload):
+        raise AssertionError("JSON parse edilmemeli")
+
+    storage._reset_storage_cache()
+    monkeypatch.setattr(storage, "_decode", no_decode)
+    assert storage.load_cards() == expected_cards
+    assert [r["card_id"] for r in storage.load_reviews()] == [0, 1, 2]
+    monkeypatch.setattr(storage, "_decode", real_decode)
+
+    # Log dışarıdan büyüdü: snapshot geçerli, yeni satır parse edilir
+    storage.append_jsonl(REVIEWS_LOG_FILE, [{"id": 99, "user_id": 1, "card_id": 7, "quality": 2, "reviewed_at": "2024-01-02"}])
+    storage._reset_storage_cache()
+    assert [r["card_id"] for r in storage.load_reviews()] == [0, 1, 2, 7]
+
+    # Bozuk payload (CRC tutmaz) -> JSON'dan okunur
+    blob = bytearray(card_snap.read_bytes())
+    blob[-1] ^= 0xFF
+    card_snap.write_bytes(bytes(blob))
+    storage._reset_storage_cache()
+    assert storage.load_cards() == expected_cards
+
+
+# =================================================
+# FILE LOCK TESTS
+# =================================================
+
+def _create_cards_in_child(start, prefix: str, count: int) -> None:
+    import storage
+
+    storage._reset_storage_cache()
+    storage.DURABILITY = "none"
+    start.wait(5)
+    for i in range(count):
+        storage.create_card({"deck_id": 1, "front": f"{prefix}{i}", "back": "b"})
+
+
+def _hold_exclusive_lock(ready, seconds: float) -> None:
+    import time
+    import storage
+
+    storage._reset_storage_cache()
+    with storage._file_lock(exclusive=True):
+        ready.set()
+        time.sleep(seconds)
+
+
+def test_concurrent_processes_do_not_lose_writes(clean_storage):
+    """
+    İki process aynı anda kart eklerken:
+    - Hiçbir yazım kaybolmamalı, id'ler tekrar etmemeli
+    """
+    import multiprocessing
+    import storage
+
+    ctx = multiprocessing.get_context("fork")
+    start = ctx.Event()
+    workers = [ctx.Process(target=_create_cards_in_child, args=(start, p, 150)) for p in "ab"]
+    for worker in workers:
+        worker.start()
+    start.set()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+
+    storage._reset_storage_cache()
+    cards = storage.load_cards()
+    assert len(cards) == 300
+    assert len({c["id"] for c in cards}) == 300
+
+
+def test_reader_waits_for_writer_and_records_wait_time(clean_storage):
+    """
+    Başka process exclusive lock tutarken diskten okuma beklemeli ve
+    bekleme shared lock metriklerine yazılmalı.
+    """
+    import multiprocessing
+    import storage
+
+    before = storage.get_lock_stats()["shared"]
+
+    ctx = multiprocessing.get_context("fork")
+    ready = ctx.Event()
+    holder = ctx.Process(target=_hold_exclusive_lock, args=(ready, 0.3))
+    holder.start()
+    assert ready.wait(5)
+
+    storage._reset_storage_cache()
+    storage.load_cards()
+    holder.join()
+
+    after = storage.get_lock_stats()["shared"]
+    assert after["contended"] == before["contended"] + 1
+    assert after["wait_seconds"] - before["wait_seconds"] >= 0.1
+
+
+# =================================================
+# RECORD VERSION TESTS
+# =================================================
+
+def test_updates_bump_version_and_reject_stale_expected_version(clean_storage):
+    """
+    Optimistic concurrency:
+    - Yeni kart / state version 1 ile oluşmalı, her update version'ı artırmalı
+    - Eski version ile yapılan update RuntimeError vermeli ve kaydı değiştirmemeli
+    - expected_version verilmeyen update koşulsuz yapılmalı
+    """
+    import pytest
+
+    card = create_card({"deck_id": 1, "front": "f", "back": "b"})
+    assert card["version"] == 1
+
+    # İki oturum aynı version'ı okudu; ilk yazan kazanır
+    assert update_card(card["id"], {"front": "a"}, expected_version=1)["version"] == 2
+    with pytest.raises(RuntimeError):
+        update_card(card["id"], {"front": "b"}, expected_version=1)
+    assert get_card_by_id(card["id"])["front"] == "a"
+
+    state = create_srs_state({
+        "user_id": 1, "card_id": card["id"], "repetition": 0,
+        "interval_days": 1, "easiness_factor": 2.5, "due_date": "2024-01-01",
+    })
+    update_srs_state(state["id"], {"repetition": 1})
+    with pytest.raises(RuntimeError):
+        update_srs_state(state["id"], {"repetition": 9}, expected_version=state["version"])
+
+    current = get_srs_state_by_card(card["id"])
+    assert (current["repetition"], current["version"]) == (1, 2)
+
+
+# =================================================
+# WRITE-BACK TESTS
+# =================================================
+
+def test_write_back_buffers_changes_until_flush(clean_storage, monkeypatch):
+    """
+    Write-back:
+    - Blok içindeki yazımlar diske gitmemeli, okumalar yine de görmeli
+    - Blok sonunda her dirty tablo bir kez yazılmalı (journal'a satır eklenmemeli)
+    - Exception ile biten blokta değişiklikler atılmalı
+    - config.WRITE_BACK modunda flush() elle çağrılınca yazılmalı
+    """
+    import pytest
+    import storage
+    from config import CARDS_FILE, JOURNAL_FILE
+
+    writes = []
+    real_write = storage._atomic_write_bytes
+    monkeypatch.setattr(
+        storage, "_atomic_write_bytes",
+        lambda path, payload: (writes.append(path), real_write(path, payload)),
+    )
+    before = storage._file_signature(CARDS_FILE)
+
+    with storage.write_back():
+        cards = [create_card({"deck_id": 1, "front": f"f{i}", "back": "b"}) for i in range(50)]
+        update_card(cards[0]["id"], {"front": "changed"})
+        create_review({"user_id": 1, "card_id": cards[0]["id"], "quality": 5, "reviewed_at": "2024-01-01"})
+        assert storage._file_signature(CARDS_FILE) == before
+        assert get_card_by_id(cards[0]["id"])["front"] == "changed"
+
+    assert writes.count(CARDS_FILE) == 1
+    assert not JOURNAL_FILE.exists() or JOURNAL_FILE.stat().st_size == 0
+    storage._reset_storage_cache()
+    assert len(storage.load_cards()) == 50
+    assert len(get_reviews()) == 1
+
+    with pytest.raises(RuntimeError):
+        with storage.write_back():
+            create_card({"deck_id": 1, "front": "lost", "back": "b"})
+            raise RuntimeError("import failed")
+    assert len(storage.load_cards()) == 50
+
+    monkeypatch.setattr(storage, "WRITE_BACK", True)
+    create_card({"deck_id": 1, "front": "late", "back": "b"})
+    assert storage.flush() == 1
+    storage._reset_storage_cache()
+    assert storage.load_cards()[-1]["front"] == "late"
+
+
+# =================================================
+# METRICS TESTS
+# =================================================
+
+def test_metrics_count_io_per_table_and_export(clean_storage, tmp_path):
+    """
+    Metrikler:
+    - Yazım / okuma sayıları ve byte'lar tablo bazında toplanmalı
+    - Parse / serialize süreleri histograma düşmeli
+    - Prometheus ve JSON export'u aynı değerleri içermeli
+    """
+    import json
+    import storage
+    from config import CARDS_FILE
+
+    storage.reset_metrics()
+    create_card({"deck_id": 1, "front": "f", "back": "b"})
+    storage.compact_journal()
+    storage._reset_storage_cache()
+    storage.load_cards()
+
+    metrics = storage.get_metrics()
+    counters = metrics["counters"]
+    assert counters["appends"]["journal.wal"] == 1
+    assert counters["writes"]["cards.json"] == 1
+    assert counters["bytes_written"]["cards.json"] == CARDS_FILE.stat().st_size
+    assert counters["disk_reads"]["cards.json"] == 1
+    assert counters["bytes_read"]["cards.json"] == CARDS_FILE.stat().st_size
+    parse = metrics["histograms"]["parse_seconds"]["cards.json"]
+    assert parse["count"] == 1 and parse["buckets"]["+Inf"] == 1
+
+    prom = storage.export_metrics(tmp_path / "storage.prom").read_text()
+    assert 'studybuddy_storage_writes_total{table="cards.json"} 1' in prom
+    assert 'studybuddy_storage_parse_seconds_count{table="cards.json"} 1' in prom
+    assert "# TYPE studybuddy_storage_lock_wait_seconds_total counter" in prom
+
+    exported = json.loads(storage.export_metrics(tmp_path / "storage.json").read_text())
+    assert exported["counters"]["writes"]["cards.json"] == 1